@@ -0,0 +1,73 @@
+import time
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from game import Game
+
+TICK_SECONDS: float = 3
+DIVIDEND_TICK: int = 100
+
+
+def advance_market(game: "Game", ticks: int) -> None:
+    if game.shared_market is not None:
+        return
+    for _ in range(ticks):
+        game.update_market()
+
+
+def catch_up(game: "Game", ticks: int) -> None:
+    if ticks <= 0:
+        return
+
+    rate = game.balance_rate()
+    balance = int(game.balance)
+    dividend_offset = DIVIDEND_TICK - game.add_dividend_interval
+    if 1 <= dividend_offset <= ticks:
+        advance_market(game, dividend_offset)
+        balance = (balance + rate * (dividend_offset - 1)) + game.add_dividends(rate)
+        remaining = ticks - dividend_offset
+        if remaining:
+            balance = int(balance) + rate * remaining
+            advance_market(game, remaining)
+    else:
+        balance += rate * ticks
+        advance_market(game, ticks)
+
+    game.balance = balance
+    game.add_dividend_interval += ticks
+    if game.journal is not None:
+        game.journal.tick(game.add_dividend_interval, game.balance, game.quotes())
+
+
+class LazyAccrual:
+    def __init__(self, tick_seconds: float = TICK_SECONDS,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.tick_seconds: float = tick_seconds
+        self.clock: Callable[[], float] = clock
+        self.epoch: float = clock()
+        self.settled_tick: int = 0
+        self.rate: int = 0
+
+    def start(self, game: "Game") -> None:
+        self.epoch = self.clock()
+        self.settled_tick = 0
+        self.rate = game.balance_rate()
+
+    def current_tick(self) -> int:
+        return int((self.clock() - self.epoch) / self.tick_seconds)
+
+    def settle(self, game: "Game") -> int:
+        tick = self.current_tick()
+        ticks = tick - self.settled_tick
+        if ticks > 0:
+            catch_up(game, ticks)
+            self.settled_tick = tick
+            game.update_high_scores()
+        self.rate = game.balance_rate()
+        return ticks
+
+    def credit_offline(self, game: "Game", seconds: float) -> int:
+        ticks = int(seconds / self.tick_seconds)
+        catch_up(game, ticks)
+        self.rate = game.balance_rate()
+        return ticks
@@ -0,0 +1,150 @@
+import operator
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, List, Sequence, Tuple, Union
+
+if TYPE_CHECKING:
+    from game import Game
+
+DERIVED_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "vehicles": ("taxis", "buses", "trains"),
+    "loans": ("cf_loans", "cs_loans", "gl_loans")
+}
+
+DERIVED_BY_SOURCE: Dict[str, Tuple[str, ...]] = {
+    source: tuple(name for name, sources in DERIVED_FIELDS.items() if source in sources)
+    for sources in DERIVED_FIELDS.values() for source in sources
+}
+
+OPERATORS: Dict[str, Callable[[float, float], bool]] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "<": operator.lt,
+    "<=": operator.le,
+    "multiple_of": lambda value, target: value % target == 0
+}
+
+
+@dataclass(frozen=True)
+class AchievementRule:
+    title: str
+    passkey: str
+    slot: int
+    field: str
+    op: str
+    target: Union[int, str]
+    reward: Tuple[str, str, int]
+
+    @property
+    def dependencies(self) -> Tuple[str, ...]:
+        fields = [self.field] + ([self.target] if isinstance(self.target, str) else [])
+        return tuple(source for field in fields for source in DERIVED_FIELDS.get(field, (field,)))
+
+    def holds(self, game: "Game") -> bool:
+        target = field_value(game, self.target) if isinstance(self.target, str) else self.target
+        return OPERATORS[self.op](field_value(game, self.field), target)
+
+
+ACHIEVEMENTS: List[AchievementRule] = [
+    AchievementRule("Beaten high score!", "t5m7pk8", 1, "balance", ">", "high_score", ("2 trains", "trains", 2)),
+    AchievementRule("$2500 earned!", "ut6gp9s", 2, "balance", "multiple_of", 2500, ("$500", "balance", 500)),
+    AchievementRule("First grand loan!", "po31u5b", 3, "gl_loans", "==", 1, ("$250", "balance", 250)),
+    AchievementRule("20 vehicles!", "5rop05b", 4, "vehicles", "==", 20, ("10 buses", "buses", 10))
+]
+
+
+def field_value(game: "Game", field: str) -> float:
+    sources = DERIVED_FIELDS.get(field)
+    if sources is None:
+        return getattr(game, field)
+    return sum(getattr(game, source) for source in sources)
+
+
+def redeemable_slots(rules: Sequence[AchievementRule]) -> int:
+    return max((rule.slot for rule in rules), default=0) + 1
+
+
+class AchievementIndex:
+    def __init__(self, rules: Tuple[AchievementRule, ...]) -> None:
+        self.rules: Tuple[AchievementRule, ...] = rules
+        self.by_passkey: Dict[str, AchievementRule] = {rule.passkey: rule for rule in rules}
+        self.by_field: Dict[str, List[AchievementRule]] = {}
+        self.thresholds: Dict[Tuple[str, str], List[Tuple[int, int]]] = {}
+        self.equals: Dict[str, Dict[int, List[AchievementRule]]] = {}
+        self.generic: Dict[str, List[AchievementRule]] = {}
+        for index, rule in enumerate(rules):
+            for field in rule.dependencies:
+                self.by_field.setdefault(field, []).append(rule)
+            constant = not isinstance(rule.target, str)
+            if constant and rule.op == "==":
+                self.equals.setdefault(rule.field, {}).setdefault(rule.target, []).append(rule)
+            elif constant and rule.op in (">", ">=") and rule.field not in DERIVED_FIELDS:
+                insort(self.thresholds.setdefault((rule.field, rule.op), []), (rule.target, index))
+            else:
+                for field in rule.dependencies:
+                    self.generic.setdefault(field, []).append(rule)
+
+
+_indexes: Dict[Tuple[AchievementRule, ...], AchievementIndex] = {}
+
+
+def get_index(rules: Sequence[AchievementRule]) -> AchievementIndex:
+    key = tuple(rules)
+    if key not in _indexes:
+        _indexes[key] = AchievementIndex(key)
+    return _indexes[key]
+
+
+class AchievementTracker:
+    __slots__ = ("index", "by_field", "by_passkey", "crossed", "unlocked", "listeners")
+
+    def __init__(self, rules: Sequence[AchievementRule] = ACHIEVEMENTS) -> None:
+        self.index: AchievementIndex = get_index(rules)
+        self.by_field: Dict[str, List[AchievementRule]] = self.index.by_field
+        self.by_passkey: Dict[str, AchievementRule] = self.index.by_passkey
+        self.crossed: Dict[Tuple[str, str], int] = {}
+        self.unlocked: Dict[str, AchievementRule] = {}
+        self.listeners: List[Callable[[AchievementRule], None]] = []
+
+    def reset(self) -> None:
+        self.crossed = {}
+        self.unlocked = {}
+
+    def field_changed(self, game: "Game", field: str) -> None:
+        index = self.index
+        value = field_value(game, field)
+        for op, find in ((">", bisect_left), (">=", bisect_right)):
+            pending = index.thresholds.get((field, op))
+            if pending:
+                start = self.crossed.get((field, op), 0)
+                end = find(pending, (value, -1) if op == ">" else (value, len(index.rules)), start)
+                if end > start:
+                    for _, position in pending[start:end]:
+                        self._unlock(game, index.rules[position])
+                    self.crossed[(field, op)] = end
+
+        for name in (field, *DERIVED_BY_SOURCE.get(field, ())):
+            equal = index.equals.get(name)
+            if equal:
+                for rule in equal.get(field_value(game, name), ()):
+                    self._unlock(game, rule)
+
+        for rule in index.generic.get(field, ()):
+            if rule.passkey not in self.unlocked and rule.holds(game):
+                self._unlock(game, rule)
+
+    def evaluate(self, game: "Game") -> None:
+        self.reset()
+        for field in self.by_field:
+            self.field_changed(game, field)
+
+    def _unlock(self, game: "Game", rule: AchievementRule) -> None:
+        if rule.passkey in self.unlocked or not game.redeemable[rule.slot]:
+            return
+        self.unlocked[rule.passkey] = rule
+        for listener in self.listeners:
+            listener(rule)
+
+    def pending(self, game: "Game") -> List[AchievementRule]:
+        return [rule for rule in self.unlocked.values() if game.redeemable[rule.slot]]
@@ -0,0 +1,255 @@
+import atexit
+import mmap
+import os
+import queue
+import struct
+import sys
+import threading
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+ARCHIVE_MAGIC: bytes = b"TEA1"
+ARCHIVE_VERSION: int = 1
+BUCKET_TICKS: int = 1024
+FIELDS: Tuple[str, ...] = ("price", "value", "dividend_yield")
+
+ARCHIVE_HEADER = struct.Struct("<4sHHIBxxx")
+TICK = struct.Struct("=q")
+KEY_WIDTH: int = 8
+
+
+class ArchiveError(ValueError):
+    pass
+
+
+class PriceArchive:
+    def __init__(self, path: str, keys: Sequence[str], bucket_ticks: int = BUCKET_TICKS) -> None:
+        self.path: str = path
+        self.index_path: str = path + ".idx"
+        self.keys: Tuple[str, ...] = tuple(keys)
+        self.column: Dict[str, int] = {key: index for index, key in enumerate(self.keys)}
+        self.width: int = len(self.keys)
+        self.bucket_ticks: int = bucket_ticks
+        self.header_size: int = ARCHIVE_HEADER.size + KEY_WIDTH * self.width
+        self.record_words: int = 1 + len(FIELDS) * self.width
+        self.record_size: int = 8 * self.record_words
+        self.lock: threading.Lock = threading.Lock()
+        self.pending: "queue.SimpleQueue[object]" = queue.SimpleQueue()
+        self.read_lock: threading.Lock = threading.Lock()
+        self.data_map: Optional[mmap.mmap] = None
+        self.index_map: Optional[mmap.mmap] = None
+        self.closed: bool = False
+
+        self.file = open(path, "r+b" if os.path.exists(path) else "w+b")
+        self.index_file = open(self.index_path, "r+b" if os.path.exists(self.index_path) else "w+b")
+        self._open_header()
+        self.records: int = (os.fstat(self.file.fileno()).st_size - self.header_size) // self.record_size
+        self.file.truncate(self.header_size + self.records * self.record_size)
+        self.buckets: int = os.fstat(self.index_file.fileno()).st_size // 8
+        self.last_tick: int = -1
+        if self.records:
+            self.file.seek(self.header_size + (self.records - 1) * self.record_size)
+            self.last_tick = array("q", self.file.read(8))[0]
+        self.next_tick: int = self.last_tick + 1
+        if not self._index_matches():
+            self._rebuild_index()
+
+        self.writer: threading.Thread = threading.Thread(target=self._write_loop, name="price-archive",
+                                                         daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
+
+    def _open_header(self) -> None:
+        header = self.file.read(self.header_size)
+        byteorder = 0 if sys.byteorder == "little" else 1
+        if not header:
+            keys = b"".join(key.encode("ascii").ljust(KEY_WIDTH, b"\0")[:KEY_WIDTH] for key in self.keys)
+            self.file.write(ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, self.width, self.bucket_ticks,
+                                                byteorder) + keys)
+            self.file.flush()
+            return
+        if len(header) < ARCHIVE_HEADER.size:
+            raise ArchiveError("Price archive header is truncated.")
+        magic, version, width, bucket_ticks, stored_order = ARCHIVE_HEADER.unpack_from(header)
+        if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION:
+            raise ArchiveError("Not a price archive.")
+        if width != self.width or stored_order != byteorder:
+            raise ArchiveError("Price archive does not match these shares.")
+        self.bucket_ticks = bucket_ticks
+
+    def _tick_at(self, data: mmap.mmap, record: int) -> int:
+        return TICK.unpack_from(data, self.header_size + record * self.record_size)[0]
+
+    def _data_map(self) -> mmap.mmap:
+        return mmap.mmap(self.file.fileno(), self.header_size + self.records * self.record_size,
+                         access=mmap.ACCESS_READ)
+
+    def _index_matches(self) -> bool:
+        expected = self.last_tick // self.bucket_ticks + 1 if self.records else 0
+        if self.buckets != expected:
+            return False
+        if not expected:
+            return True
+        self.index_file.seek((expected - 1) * 8)
+        position = array("q", self.index_file.read(8))[0]
+        if not 0 <= position < self.records:
+            return False
+        data = self._data_map()
+        try:
+            start = (expected - 1) * self.bucket_ticks
+            return (self._tick_at(data, position) >= start and
+                    (position == 0 or self._tick_at(data, position - 1) < start))
+        finally:
+            data.close()
+
+    def _rebuild_index(self) -> None:
+        index = array("q")
+        if self.records:
+            data = self._data_map()
+            try:
+                for record in range(self.records):
+                    bucket = self._tick_at(data, record) // self.bucket_ticks
+                    while len(index) <= bucket:
+                        index.append(record)
+            finally:
+                data.close()
+        self.index_file.seek(0)
+        self.index_file.truncate()
+        self.index_file.write(index.tobytes())
+        self.index_file.flush()
+        self.buckets = len(index)
+
+    def append(self, values: Sequence[int], prices: Sequence[int], yields: Sequence[float]) -> int:
+        with self.lock:
+            tick = self.next_tick
+            self.next_tick += 1
+        self.pending.put((tick, values, prices, yields))
+        return tick
+
+    def _write_loop(self) -> None:
+        while True:
+            batch = [self.pending.get()]
+            while True:
+                try:
+                    batch.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+            self._write([entry for entry in batch if isinstance(entry, tuple)])
+            for entry in batch:
+                if isinstance(entry, threading.Event):
+                    entry.set()
+            if None in batch:
+                return
+
+    def _write(self, batch: List[Tuple[int, Sequence[int], Sequence[int], Sequence[float]]]) -> None:
+        data = bytearray()
+        index = array("q")
+        records, buckets, last_tick = self.records, self.buckets, self.last_tick
+        for tick, values, prices, yields in batch:
+            if tick <= last_tick:
+                continue
+            data += array("q", [tick, *prices, *values]).tobytes()
+            data += array("d", yields).tobytes()
+            bucket = tick // self.bucket_ticks
+            while buckets <= bucket:
+                index.append(records)
+                buckets += 1
+            records += 1
+            last_tick = tick
+        if not data:
+            return
+
+        self.file.seek(self.header_size + self.records * self.record_size)
+        self.file.write(data)
+        self.file.flush()
+        if index:
+            self.index_file.seek(self.buckets * 8)
+            self.index_file.write(index.tobytes())
+            self.index_file.flush()
+        with self.lock:
+            self.records, self.buckets, self.last_tick = records, buckets, last_tick
+
+    def flush(self) -> None:
+        done = threading.Event()
+        self.pending.put(done)
+        if self.writer.is_alive():
+            done.wait()
+
+    def _maps(self) -> Tuple[mmap.mmap, Optional[mmap.mmap], int, int]:
+        with self.lock:
+            records, buckets = self.records, self.buckets
+        size = self.header_size + records * self.record_size
+        if self.data_map is None or len(self.data_map) < size:
+            if self.data_map is not None:
+                self.data_map.close()
+            self.data_map = mmap.mmap(self.file.fileno(), size, access=mmap.ACCESS_READ)
+        if buckets and (self.index_map is None or len(self.index_map) < buckets * 8):
+            if self.index_map is not None:
+                self.index_map.close()
+            self.index_map = mmap.mmap(self.index_file.fileno(), buckets * 8, access=mmap.ACCESS_READ)
+        return self.data_map, self.index_map, records, buckets
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.records
+
+    def _first_record(self, tick: int, data: mmap.mmap, index: Optional[mmap.mmap],
+                      records: int, buckets: int) -> int:
+        bucket = max(0, tick // self.bucket_ticks)
+        positions = memoryview(index).cast("q") if index is not None else None
+        if positions is None:
+            low, high = 0, records
+        elif bucket < buckets:
+            low = positions[bucket]
+            high = positions[bucket + 1] if bucket + 1 < buckets else records
+        else:
+            low, high = positions[buckets - 1], records
+        if positions is not None:
+            positions.release()
+        while low < high:
+            middle = (low + high) // 2
+            if TICK.unpack_from(data, self.header_size + middle * self.record_size)[0] < tick:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def query(self, share: str, start_tick: int = 0, end_tick: Optional[int] = None,
+              field: str = "price") -> Tuple[List[int], List[float]]:
+        if share not in self.column:
+            raise ArchiveError(f"Unknown share '{share}'.")
+        if field not in FIELDS:
+            raise ArchiveError(f"Unknown field '{field}'.")
+
+        with self.read_lock:
+            data, index, records, buckets = self._maps()
+            first = self._first_record(start_tick, data, index, records, buckets)
+            last = records if end_tick is None else self._first_record(end_tick, data, index, records, buckets)
+            if first >= last:
+                return [], []
+
+            view = memoryview(data)[self.header_size + first * self.record_size:
+                                    self.header_size + last * self.record_size]
+            offset = 1 + FIELDS.index(field) * self.width + self.column[share]
+            ticks = view.cast("q")[::self.record_words].tolist()
+            samples = view.cast("d" if field == "dividend_yield" else "q")[offset::self.record_words].tolist()
+            view.release()
+        return ticks, samples
+
+    def last(self, share: str, ticks: int, field: str = "price") -> Tuple[List[int], List[float]]:
+        with self.lock:
+            last_tick = self.last_tick
+        return self.query(share, last_tick - ticks + 1, None, field)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self.pending.put(None)
+        self.writer.join()
+        with self.read_lock:
+            for handle in (self.data_map, self.index_map):
+                if handle is not None:
+                    handle.close()
+        self.file.close()
+        self.index_file.close()
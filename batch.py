@@ -0,0 +1,127 @@
+import json
+import math
+import time
+from typing import IO, Any, Dict, List, Optional, Tuple
+from commands import CommandProcessor
+from game import Game
+
+DIRECTIVES: Tuple[str, ...] = ("tick", "wait", "at")
+FLUSH_RECORDS: int = 1024
+
+
+class BatchError(Exception):
+    pass
+
+
+class BatchRunner:
+    def __init__(self, game: Game, output: IO[str], command_seconds: float = 0.0) -> None:
+        self.game: Game = game
+        self.processor: CommandProcessor = CommandProcessor(game)
+        self.output: IO[str] = output
+        self.command_seconds: float = command_seconds
+        self.clock: float = 0.0
+        self.ticks: int = 0
+        self.commands: int = 0
+        self.errors: int = 0
+        self.pending: List[str] = []
+
+    def advance(self, ticks: int) -> None:
+        if ticks < 0:
+            raise BatchError("Cannot tick backwards.")
+        for _ in range(ticks):
+            self.game.tick()
+        self.ticks += ticks
+        if self.game.tick_seconds > 0:
+            self.clock = max(self.clock, float(self.ticks * self.game.tick_seconds))
+
+    def advance_to(self, clock: float) -> None:
+        if clock < self.clock:
+            raise BatchError(f"Time {clock:g} is before the current time {self.clock:g}.")
+        if self.game.tick_seconds > 0:
+            self.advance(math.floor(clock / self.game.tick_seconds) - self.ticks)
+        self.clock = clock
+
+    def _seconds(self, value: Any) -> float:
+        try:
+            seconds = float(value)
+        except (TypeError, ValueError):
+            raise BatchError(f"Invalid time '{value}'.") from None
+        if seconds < 0 or math.isnan(seconds):
+            raise BatchError(f"Invalid time '{value}'.")
+        return seconds
+
+    def _count(self, value: Any) -> int:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise BatchError(f"Invalid tick count '{value}'.") from None
+
+    def parse(self, line: str) -> Dict[str, Any]:
+        if line.startswith("{"):
+            try:
+                action = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise BatchError(f"Invalid JSON: {e}") from None
+            if not isinstance(action, dict):
+                raise BatchError("Invalid JSON action.")
+            return action
+        words = line.split(None, 1)
+        if words[0].lower() in DIRECTIVES:
+            return {words[0].lower(): words[1] if len(words) > 1 else 1}
+        return {"command": line}
+
+    def execute(self, action: Dict[str, Any]) -> Optional[str]:
+        if "at" in action:
+            self.advance_to(self._seconds(action["at"]))
+        if "wait" in action:
+            self.advance_to(self.clock + self._seconds(action["wait"]))
+        if "tick" in action:
+            self.advance(self._count(action["tick"]))
+        command = action.get("command")
+        if command is None:
+            return None
+        output = self.processor.execute(str(command))
+        self.commands += 1
+        if self.command_seconds:
+            self.advance_to(self.clock + self.command_seconds)
+        return output
+
+    def emit(self, record: Dict[str, Any]) -> None:
+        self.pending.append(json.dumps(record))
+        if len(self.pending) >= FLUSH_RECORDS:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.pending:
+            self.output.write("\n".join(self.pending) + "\n")
+            self.pending = []
+
+    def run(self, source: IO[str]) -> bool:
+        started = time.perf_counter()
+        for number, line in enumerate(source, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                action = self.parse(line)
+                output = self.execute(action)
+            except BatchError as e:
+                self.errors += 1
+                self.emit({"line": number, "error": str(e)})
+                continue
+            if output is not None:
+                self.emit({"line": number, "time": self.clock, "tick": self.ticks,
+                           "command": action["command"], "output": output})
+            if self.processor.closed:
+                break
+        self.emit({"summary": {
+            "commands": self.commands, "ticks": self.ticks, "time": self.clock, "errors": self.errors,
+            "balance": self.game.balance, "elapsed": time.perf_counter() - started
+        }})
+        self.flush()
+        self.output.flush()
+        return not self.errors
+
+
+def run_batch(game: Game, source: IO[str], output: IO[str], command_seconds: float = 0.0) -> bool:
+    return BatchRunner(game, output, command_seconds).run(source)
@@ -0,0 +1,704 @@
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from game import Game
+from leaderboard import Leaderboard
+from persistence import GameInfoStore
+
+SUITE_REPEAT: int = 5
+STATION_SIZES: Sequence[int] = (10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+SAVE_SIZES: Sequence[int] = (10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5)
+INFO_STORE: GameInfoStore = GameInfoStore(None)
+LEADERBOARD: Leaderboard = Leaderboard(None)
+
+
+def timed(function: Callable[[], object], repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return time.perf_counter() - start
+
+
+def new_game(**kwargs: Any) -> Game:
+    return Game(info_store=INFO_STORE, leaderboard=LEADERBOARD, **kwargs)
+
+
+def make_games(count: int) -> List[Game]:
+    games: List[Game] = []
+    for index in range(count):
+        game = new_game()
+        game.taxis, game.buses, game.trains = index % 50, index % 20, index % 5
+        for station_type in ("Taxi", "Taxi", "Bus", "Train"):
+            game.stations.create(station_type, game.tools.generate_place())
+        game.cf_loans = index % 2
+        for share in game.shares.values():
+            share["amount"] = index % 100
+        games.append(game)
+    return games
+
+
+def bench_vectorized_tick() -> None:
+    from simulator import EmpireArrays
+
+    ticks = 20
+    for empires in (1_000, 10_000, 100_000):
+        games = make_games(min(empires, 10_000))
+
+        def object_tick() -> None:
+            for game in games:
+                game.update_share_values()
+                game.update_share_prices()
+                game.update_share_dividend_yield()
+                game.update_balance()
+
+        object_rate = ticks * len(games) / timed(object_tick, ticks)
+        arrays = EmpireArrays.from_games(games * (empires // len(games)), seed=0)
+        vector_rate = ticks * arrays.size / timed(arrays.tick, ticks)
+        print(f"{empires:>7} empires: per-object {object_rate:>12,.0f} empire-ticks/s, "
+              f"vectorized {vector_rate:>14,.0f} empire-ticks/s ({vector_rate / object_rate:.0f}x)")
+
+
+def bench_save_load() -> None:
+    for stations in (100, 10_000, 100_000):
+        game = make_games(1)[0]
+        for _ in range(stations):
+            game.stations.create("Taxi", game.tools.generate_place())
+        for label, binary in (("json", False), ("binary", True)):
+            key = game.saveload.generate_key(binary=binary)
+            save = timed(lambda: game.saveload.generate_key(binary=binary), 5) / 5
+            load = timed(lambda: new_game().saveload.load_variables(key), 5) / 5
+            print(f"{stations:>7} stations {label:>6}: key {len(key):>10,} chars, "
+                  f"save {save * 1000:8.2f} ms, load {load * 1000:8.2f} ms")
+        game.saveload.generate_key()
+        game.stations.create("Taxi", "Golden Oasis")
+        delta = game.saveload.generate_delta_key()
+        print(f"{stations:>7} stations  delta: key {len(delta):>10,} chars")
+
+
+def bench_stations() -> None:
+    from stations import StationRegistry
+    from tools import Tools
+
+    tools = Tools()
+    for count in (10_000, 100_000, 1_000_000):
+        places = [tools.generate_place() for _ in range(count)]
+        registry = StationRegistry()
+        elapsed = timed(lambda: [registry.create("Taxi", place) for place in places])
+        print(f"{count:>9} stations: registry {count / elapsed:>12,.0f} creates/s, "
+              f"lookup {'Hidden Lake Taxi Station' in registry}, taxi count {registry.count('Taxi'):,}")
+
+    for count in (1_000, 10_000):
+        places = [tools.generate_place() for _ in range(count)]
+        names: List[str] = []
+
+        def list_create() -> None:
+            for place in places:
+                name, extra = place, 1
+                while name in names:
+                    name = f"{name} {extra}"
+                    extra += 1
+                names.append(name)
+
+        elapsed = timed(list_create)
+        print(f"{count:>9} stations: plain list {count / elapsed:>10,.0f} creates/s")
+
+
+def bench_bulk_orders() -> None:
+    from engine import Order
+
+    for count in (1_000, 10_000, 100_000):
+        game = new_game()
+        game.balance = 10 ** 12
+        single = timed(lambda: [game.engine.create_station("a") for _ in range(count)])
+        bulk = timed(lambda: game.engine.create_stations("a", count))
+        print(f"{count:>7} stations: single {count / single:>11,.0f}/s, bulk {count / bulk:>11,.0f}/s")
+
+        orders = [Order("vehicle", "taxi", 1) if index % 2 else Order("buy_shares", "a", 1)
+                  for index in range(count)]
+        single = timed(lambda: [game.engine.buy_vehicle("taxi", 1) for _ in range(count)])
+        bulk = timed(lambda: game.engine.place_orders(orders))
+        print(f"{count:>7} orders:   single {count / single:>11,.0f}/s, bulk {count / bulk:>11,.0f}/s")
+
+
+def bench_market_rng() -> None:
+    import random
+    from market import BLOCK_TICKS
+
+    ticks = 100_000
+    shares = new_game().shares
+
+    def scalar_tick() -> None:
+        for share in shares:
+            shares[share]["value"] = random.randint(-500, 500)
+        for share in shares:
+            shares[share]["price"] = shares[share]["value"] + random.randint(-250, 250)
+            if shares[share]["price"] < 1:
+                shares[share]["price"] = random.randint(0, abs(shares[share]["price"]))
+        for share in shares:
+            shares[share]["dividend_yield"] = round(random.uniform(0, 0.05), 3)
+
+    scalar = timed(scalar_tick, ticks) / ticks
+    print(f"scalar global random:  {scalar * 1e6:7.2f} us/tick")
+
+    for block_ticks in (1, 16, 64, 256):
+        game = new_game(seed=1)
+        game.market.block_ticks = block_ticks
+        batched = timed(game.update_market, ticks) / ticks
+        default = " (default)" if block_ticks == BLOCK_TICKS else ""
+        print(f"batched block {block_ticks:>4}:    {batched * 1e6:7.2f} us/tick ({scalar / batched:.1f}x){default}")
+
+    first, second = new_game(seed=7), new_game(seed=7)
+    for game in (first, second):
+        game.engine.advance(1_000)
+    print(f"seed 7 reproducible: {first.shares == second.shares and first.balance == second.balance}")
+
+
+def bench_shared_market() -> None:
+    from market import SharedMarket
+
+    ticks = 20
+    for players in (100, 1_000, 10_000):
+        games = make_games(players)
+        own = timed(lambda: [game.update_market() for game in games], ticks) / ticks
+
+        market = SharedMarket(games[0].shares, seed=0)
+        for game in games:
+            game.join_market(market)
+        shared = timed(lambda: [market.publish()] + [game.update_market() for game in games], ticks) / ticks
+        dividends = timed(lambda: [game.add_dividends(0) for game in games], ticks) / ticks
+        print(f"{players:>6} players: own markets {own * 1000:8.2f} ms/tick, shared market {shared * 1000:6.3f} ms/tick, "
+              f"dividend step {dividends * 1000:7.2f} ms/tick")
+
+
+def bench_price_history() -> None:
+    from history import PriceHistory
+
+    game = new_game(seed=3)
+    market = game.market
+    for ticks in (1_000, 100_000):
+        history = PriceHistory(game.shares)
+
+        def record() -> None:
+            history.record(market.advance(), market.current_prices(), market.current_yields())
+
+        elapsed = timed(record, ticks) / ticks
+        memory = sum(buffer.itemsize * len(buffer) for buffer in (history.prices, history.values, history.yields))
+        print(f"{ticks:>7} ticks: record {elapsed * 1e6:6.2f} us/tick, indicators "
+              f"{timed(lambda: history.indicators('a'), 1000) * 1000:5.2f} us, buffers {memory:,} bytes")
+
+
+def bench_price_archive() -> None:
+    import os
+    import tempfile
+    from archive import PriceArchive
+
+    game = new_game(seed=4)
+    market = game.market
+    rows = [(market.advance(), market.current_prices(), market.current_yields()) for _ in range(1_000)]
+    with tempfile.TemporaryDirectory() as directory:
+        for ticks in (10_000, 200_000):
+            path = os.path.join(directory, f"prices-{ticks}.arc")
+            archive = PriceArchive(path, game.shares)
+            append = timed(lambda: [archive.append(*rows[tick % len(rows)]) for tick in range(ticks)]) / ticks
+            written = timed(archive.flush)
+            archive.close()
+
+            opened: List[PriceArchive] = []
+            open_time = timed(lambda: opened.append(PriceArchive(path, game.shares)))
+            archive = opened[0]
+            query = timed(lambda: archive.last("d", 10_000), 10) / 10
+            print(f"{ticks:>7} ticks ({os.path.getsize(path):>11,} bytes): append {append * 1e6:5.2f} us/tick, "
+                  f"drain {written * 1000:7.1f} ms, open {open_time * 1000:5.2f} ms, "
+                  f"last 10k ticks {query * 1000:5.2f} ms")
+            archive.close()
+
+
+def bench_order_book() -> None:
+    import random
+    from exchange import Exchange
+
+    rng = random.Random(5)
+    depth = 100_000
+    traders = [new_game(seed=index) for index in range(10)]
+    exchange = Exchange(traders[0].shares)
+    for trader in traders:
+        trader.balance = 10 ** 15
+        trader.shares["a"]["amount"] = 10 ** 9
+
+    for index in range(depth):
+        trader = traders[index % len(traders)]
+        if index % 2:
+            exchange.submit(trader, "a", "buy", rng.randint(1, 100), rng.randint(1, 500))
+        else:
+            exchange.submit(trader, "a", "sell", rng.randint(1, 100), rng.randint(501, 1000))
+    exchange.match()
+    print(f"resting orders: {sum(exchange.books['a'].depth()):,}")
+
+    for batch in (10_000, 100_000):
+        fills: List[object] = []
+
+        def trade() -> None:
+            for index in range(batch):
+                trader = traders[index % len(traders)]
+                kind = index % 10
+                if kind < 4:
+                    side = "buy" if index % 2 else "sell"
+                    price = rng.randint(1, 500) if side == "buy" else rng.randint(501, 1000)
+                    exchange.submit(trader, "a", side, rng.randint(1, 100), price)
+                elif kind < 7:
+                    side = "buy" if index % 2 else "sell"
+                    exchange.submit(trader, "a", side, rng.randint(1, 100), rng.randint(400, 600))
+                elif kind < 9:
+                    open_orders = exchange.by_game.get(id(trader))
+                    if open_orders:
+                        exchange.cancel(trader, next(iter(open_orders)))
+                else:
+                    exchange.submit(trader, "a", "buy" if index % 2 else "sell", rng.randint(1, 100))
+            fills.extend(exchange.match())
+
+        elapsed = timed(trade)
+        print(f"{batch:>7} orders at depth {sum(exchange.books['a'].depth()):>7,}: "
+              f"{batch / elapsed:>10,.0f} orders/s, {len(fills):,} fills")
+
+
+def bench_leaderboard() -> None:
+    import os
+    import random
+    import tempfile
+
+    rng = random.Random(6)
+    empires = [f"Empire {index}" for index in range(1_000_000)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "leaderboard.log")
+        board = Leaderboard(path, flush_interval=0)
+        insert = timed(lambda: [board.update(empire, rng.randint(0, 10 ** 9)) for empire in empires])
+        print(f"{len(board):,} empires: insert {len(empires) / insert:>10,.0f}/s")
+
+        sample = rng.sample(empires, 100_000)
+        update = timed(lambda: [board.update(empire, rng.randint(0, 10 ** 9)) for empire in sample])
+        rank = timed(lambda: [board.rank(empire) for empire in sample])
+        around = timed(lambda: [board.around(empire, 5) for empire in sample[:10_000]])
+        top = timed(lambda: board.top(100), 1_000) / 1_000
+        print(f"update {len(sample) / update:>10,.0f}/s, rank {len(sample) / rank:>10,.0f}/s, "
+              f"around {10_000 / around:>8,.0f}/s, top 100 {top * 1e6:.0f} us")
+
+        scores = dict(board.scores)
+        resort = timed(lambda: sorted(scores, key=scores.__getitem__, reverse=True).index(sample[0]))
+        print(f"re-sort for one rank: {resort * 1000:.0f} ms")
+
+        flush = timed(board.flush)
+        board.update(sample[0], 10 ** 10)
+        incremental = timed(board.flush)
+        reload = timed(lambda: Leaderboard(path, flush_interval=0))
+        print(f"flush {flush * 1000:.0f} ms, incremental flush {incremental * 1000:.2f} ms, "
+              f"reload {reload * 1000:.0f} ms")
+
+
+def bench_achievements() -> None:
+    from achievements import ACHIEVEMENTS, AchievementRule, AchievementTracker
+
+    fields = ("balance", "taxis", "buses", "trains", "gl_loans")
+    rules = list(ACHIEVEMENTS)
+    for index in range(500):
+        field = fields[index % len(fields)]
+        op = (">=", ">", "==")[index % 3]
+        target = 10 ** (index % 7) if field == "balance" else index % 50
+        rules.append(AchievementRule(f"Rule {index}", f"rule{index}", 5 + index, field, op, target,
+                                     ("$1", "balance", 1)))
+
+    ticks = 20_000
+    for label, tracker in (("no rules", None), ("4 rules", AchievementTracker()),
+                           (f"{len(rules)} rules", AchievementTracker(rules))):
+        game = new_game(seed=8)
+        game.redeemable = [True] * (len(rules) + 5)
+        game.taxis, game.buses = 10, 5
+        game.stations.create_many("Taxi", ["Golden Oasis"] * 5)
+        if tracker is None:
+            game.achievements = None
+        else:
+            game.achievements = tracker
+            tracker.evaluate(game)
+        elapsed = timed(game.tick, ticks) / ticks
+        unlocked = 0 if tracker is None else len(tracker.unlocked)
+        print(f"{label:>10}: {elapsed * 1e6:6.2f} us/tick, {unlocked} unlocked")
+
+
+def bench_journal() -> None:
+    import os
+    import tempfile
+    from journal import list_segments, load_state, recover
+
+    events = 1_000_000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "journal")
+        game = recover(path, new_game(seed=9))
+        journal = game.journal
+        journal.flush_interval = 0
+        journal.compact_events = events * 2
+        quotes = game.quotes()
+
+        def append() -> None:
+            for index in range(events // 4):
+                journal.tick(index, 250 + index, quotes)
+                journal.trade("a", 1, -10)
+                journal.purchase("taxis", 1, 40)
+                journal.loan("cf_loans", index & 1, 500 if index & 1 else -500)
+            journal.flush()
+
+        appended = timed(append)
+        size = sum(os.path.getsize(f"{path}.{segment:08d}") for segment in list_segments(path))
+        replayed = timed(lambda: load_state(path))
+        print(f"{events:,} events ({size:,} bytes): append {events / appended:>12,.0f}/s, "
+              f"replay {events / replayed:>12,.0f}/s")
+
+        journal.compact_events = events // 4
+        journal.tick(0, 250, quotes)
+        compact = timed(lambda: (journal.flush(), journal.compactor.join()))
+        reopen = timed(lambda: recover(path, new_game()))
+        print(f"background compaction {compact * 1000:.0f} ms, recover from snapshot {reopen * 1000:.1f} ms, "
+              f"segments left {list_segments(path)}")
+
+
+def bench_transactions() -> bool:
+    import threading
+    from engine import InsufficientFunds, InvalidAmount
+
+    duration = 3.0
+    game = new_game(seed=10)
+    game.balance = 1_000_000
+    game.add_dividend_interval = 101
+    game.engine.create_stations("a", 5)
+    game.engine.purchase_shares("a", 1_000)
+    start_balance = game.balance
+    stop = threading.Event()
+    counts = {"ticks": 0, "commands": 0, "snapshots": 0, "torn": 0}
+    ledger = {"income": 0, "spent": 0}
+
+    def ticker() -> None:
+        while not stop.is_set():
+            with game.transaction():
+                ledger["income"] += game.balance_rate()
+                game.tick()
+            counts["ticks"] += 1
+
+    def commands() -> None:
+        while not stop.is_set():
+            try:
+                with game.transaction():
+                    sold = game.engine.sell_shares("a", 1)
+                    bought = game.engine.purchase_shares("b", 1)
+                    ledger["spent"] += bought.total - sold.total
+                with game.transaction():
+                    sold = game.engine.sell_shares("b", 1)
+                    bought = game.engine.purchase_shares("a", 1)
+                    ledger["spent"] += bought.total - sold.total
+                    if sum(game.snapshot().share_amounts[:2]) != 1_000:
+                        counts["torn"] += 1
+                ledger["spent"] += game.engine.buy_vehicle("taxi", 1).cost
+            except (InsufficientFunds, InvalidAmount):
+                pass
+            counts["commands"] += 1
+
+    def reader() -> None:
+        last_taxis = 0
+        while not stop.is_set():
+            snapshot = game.snapshot()
+            if snapshot.share_amounts[0] + snapshot.share_amounts[1] != 1_000 or snapshot.taxis < last_taxis:
+                counts["torn"] += 1
+            last_taxis = snapshot.taxis
+            game.empire_info_text()
+            counts["snapshots"] += 1
+
+    threads = [threading.Thread(target=target) for target in (ticker, commands, reader)]
+    for thread in threads:
+        thread.start()
+    stop.wait(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    lost = start_balance + ledger["income"] - ledger["spent"] - game.balance
+    print(f"{counts['ticks'] / duration:>9,.0f} ticks/s, {counts['commands'] / duration:>9,.0f} commands/s, "
+          f"{counts['snapshots'] / duration:>9,.0f} snapshots/s")
+    print(f"lost balance updates: {lost}, torn snapshots: {counts['torn']}")
+    if abs(lost) > 1e-6 or counts["torn"]:
+        print("FAILED: transactions lost updates or readers saw torn snapshots.")
+        return False
+    return True
+
+
+def bench_evaluator() -> bool:
+    import os
+    from evaluator import STRATEGIES, evaluate, seed_sensitive
+
+    seeds, ticks = 64, 500
+    cores = os.cpu_count() or 1
+    serial = evaluate("shares_first", seeds, ticks, workers=1)
+    print(f"1 worker: {serial.elapsed:6.2f} s, {seeds * ticks / serial.elapsed:>10,.0f} ticks/s")
+    for workers in sorted({2, cores} - {1}):
+        report = evaluate("shares_first", seeds, ticks, workers=workers)
+        same = report.final_balance == serial.final_balance
+        print(f"{workers} workers: {report.elapsed:6.2f} s, {seeds * ticks / report.elapsed:>10,.0f} ticks/s "
+              f"({serial.elapsed / report.elapsed:.1f}x on {cores} cores), same results: {same}")
+
+    fixed = [name for name in STRATEGIES if name != "idle" and not seed_sensitive(name)]
+    if fixed:
+        print(f"FAILED: same outcome for every seed: {', '.join(fixed)}")
+        return False
+    print("every strategy except idle varies with the seed")
+    return True
+
+
+def bench_metrics() -> None:
+    import random
+    from commands import CommandProcessor
+    from metrics import Histogram, disable_metrics, enable_metrics
+
+    ticks, repeats = 20_000, 5
+    game = new_game(seed=12)
+    processor = CommandProcessor(game)
+
+    def tick_cost() -> float:
+        return min(timed(game.tick, ticks) for _ in range(repeats)) / ticks
+
+    def command_cost() -> float:
+        return min(timed(lambda: processor.execute("/quoteshares a 10"), ticks) for _ in range(repeats)) / ticks
+
+    disable_metrics()
+    base_tick, base_command = tick_cost(), command_cost()
+    print(f"disabled: tick {base_tick * 1e6:6.2f} us, command {base_command * 1e6:6.2f} us")
+    for sample in (32, 1):
+        disable_metrics()
+        enable_metrics(tick_sample=sample)
+        tick, command = tick_cost(), command_cost()
+        print(f"enabled (1 in {sample:>2} ticks timed): tick {tick * 1e6:6.2f} us ({tick / base_tick - 1:+.1%}), "
+              f"command {command * 1e6:6.2f} us ({command / base_command - 1:+.1%})")
+    disable_metrics()
+
+    rng = random.Random(12)
+    values = sorted(int(rng.lognormvariate(10, 2)) for _ in range(100_000))
+    histogram = Histogram()
+    recorded = timed(lambda: [histogram.record(value) for value in values])
+    errors = [abs(histogram.percentile(quantile) - values[int(quantile * len(values)) - 1]) /
+              max(1, values[int(quantile * len(values)) - 1]) for quantile in (0.5, 0.9, 0.99, 0.999)]
+    print(f"histogram: {len(values) / recorded:>12,.0f} records/s, worst quantile error {max(errors):.2%}")
+
+
+def bench_rendering() -> None:
+    import io
+    import os
+    from render import write_chunked
+
+    game = new_game(seed=13)
+    game.balance = 10 ** 12
+    game.engine.create_stations("a", 100_000)
+    with open(os.devnull, "w", buffering=1) as devnull:
+        def per_line() -> None:
+            print("Stations:", file=devnull)
+            for station in game.stations:
+                print(station, file=devnull)
+
+        unbuffered = timed(per_line)
+        chunked = timed(lambda: write_chunked(["Stations:", *game.stations], devnull))
+    print(f"100,000 stations: print per line {unbuffered * 1000:7.1f} ms, chunked {chunked * 1000:7.1f} ms "
+          f"({unbuffered / chunked:.1f}x)")
+    page = timed(lambda: game.stations_text(2_000), 1_000) / 1_000
+    game.stations_text(1, None, "Golden")
+    filtered = timed(lambda: game.stations_text(1, None, "Golden"), 100) / 100
+    game.engine.create_station("a")
+    fresh = timed(lambda: game.stations_text(1, None, "Golden"))
+    print(f"/stations page: cached {page * 1e6:6.2f} us, prefix filter cached {filtered * 1e6:6.2f} us, "
+          f"after a change {fresh * 1000:6.2f} ms")
+
+    views = 10_000
+    for name, render, build in (("empire info", game.empire_info_text, game.render_empire_info),
+                                ("share market", game.share_market_text, game.render_share_market)):
+        cached = timed(render, views) / views
+        rebuilt = timed(build, views) / views
+        print(f"{name:>12}: cached {cached * 1e6:6.2f} us, rebuilt {rebuilt * 1e6:6.2f} us ({rebuilt / cached:.0f}x)")
+    output = io.StringIO()
+    write_chunked(["Stations:", *game.stations], output)
+    print(f"same output: {output.getvalue() == chr(10).join(['Stations:', *game.stations]) + chr(10)}")
+
+
+def bench_empire_memory() -> None:
+    import gc
+    import tracemalloc
+
+    new_game().tick()
+    count = 1_000
+    for label, ticks in (("fresh", 0), ("ticked", 1), ("ticked x200", 200)):
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        games = [new_game() for _ in range(count)]
+        for game in games:
+            for _ in range(ticks):
+                game.tick()
+        used = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        print(f"{label:>12}: {used / count / 1024:7.2f} KiB/empire")
+        del games
+
+
+BENCHMARKS: Dict[str, Callable[[], Optional[bool]]] = {
+    "vectorized_tick": bench_vectorized_tick,
+    "save_load": bench_save_load,
+    "stations": bench_stations,
+    "bulk_orders": bench_bulk_orders,
+    "market_rng": bench_market_rng,
+    "shared_market": bench_shared_market,
+    "price_history": bench_price_history,
+    "price_archive": bench_price_archive,
+    "order_book": bench_order_book,
+    "leaderboard": bench_leaderboard,
+    "achievements": bench_achievements,
+    "journal": bench_journal,
+    "transactions": bench_transactions,
+    "evaluator": bench_evaluator,
+    "metrics": bench_metrics,
+    "rendering": bench_rendering,
+    "empire_memory": bench_empire_memory
+}
+
+
+
+def per_operation(function: Callable[[], object], operations: int, repeat: int = SUITE_REPEAT) -> float:
+    return min(timed(function, operations) for _ in range(repeat)) / operations
+
+
+def suite_tick() -> Dict[str, float]:
+    game = make_games(50)[-1]
+    ticks = 10_000
+    return {
+        "update_balance": per_operation(game.update_balance, ticks),
+        "tick": per_operation(game.tick, ticks)
+    }
+
+
+def suite_stations() -> Dict[str, float]:
+    import random
+    from tools import Tools
+
+    tools = Tools(random.Random(23))
+    game = new_game(seed=23)
+    game.balance = 10 ** 12
+    results: Dict[str, float] = {}
+    for size in STATION_SIZES:
+        game.stations.create_many("Taxi", [tools.generate_place() for _ in range(size - len(game.stations))])
+        results[f"create_station[{size}]"] = per_operation(lambda: game.engine.create_station("a"), 1_000)
+        results[f"unique_place[{size}]"] = per_operation(
+            lambda: game.stations.unique_place(game.tools.generate_place(), "Taxi"), 1_000)
+    return results
+
+
+def suite_save_load() -> Dict[str, float]:
+    results: Dict[str, float] = {}
+    target = new_game()
+    for size in SAVE_SIZES:
+        game = make_games(50)[-1]
+        game.stations.create_many("Taxi", [game.tools.generate_place() for _ in range(size)])
+        key = game.saveload.generate_key()
+        results[f"generate_key[{size}]"] = per_operation(game.saveload.generate_key, 1)
+        results[f"load_variables[{size}]"] = per_operation(lambda: target.saveload.load_variables(key), 1)
+    return results
+
+
+def suite_shares() -> Dict[str, float]:
+    from catalogs import SHARE_INDEX
+
+    game = new_game(seed=23)
+    game.balance = 10 ** 15
+    game.shares.price[SHARE_INDEX["a"]] = game.shares.value[SHARE_INDEX["a"]] = 10
+    trades = 10_000
+    return {
+        "purchase_shares": per_operation(lambda: game.engine.purchase_shares("a", 1), trades),
+        "sell_shares": per_operation(lambda: game.engine.sell_shares("a", 1), trades)
+    }
+
+
+def suite_construct() -> Dict[str, float]:
+    return {"Game()": per_operation(new_game, 200)}
+
+
+SUITE: Dict[str, Callable[[], Dict[str, float]]] = {
+    "tick": suite_tick,
+    "stations": suite_stations,
+    "save_load": suite_save_load,
+    "shares": suite_shares,
+    "construct": suite_construct
+}
+
+
+def run_suite(names: Sequence[str]) -> Dict[str, Any]:
+    results: Dict[str, float] = {}
+    for name in names:
+        for case, seconds in SUITE[name]().items():
+            results[f"{name}.{case}"] = seconds
+            print(f"{name + '.' + case:<46} {seconds * 1e6:>14,.2f} us")
+    return {
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results
+    }
+
+
+def compare(current: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    regressions: List[str] = []
+    print(f"{'case':<46} {'baseline us':>14} {'current us':>14} {'change':>8}")
+    for case, seconds in current.items():
+        before = baseline.get(case)
+        if before is None:
+            print(f"{case:<46} {'-':>14} {seconds * 1e6:>14,.2f} {'new':>8}")
+            continue
+        change = seconds / before - 1 if before else 0.0
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"{case:<46} {before * 1e6:>14,.2f} {seconds * 1e6:>14,.2f} {change:>+8.1%}{flag}")
+        if flag:
+            regressions.append(case)
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the TextEmpire hot paths")
+    parser.add_argument("names", nargs="*",
+                        help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)}; "
+                             f"with --suite: {', '.join(SUITE)})")
+    parser.add_argument("--suite", action="store_true",
+                        help="run the regression suite instead and report seconds per operation")
+    parser.add_argument("--json", default=None, help="write the suite results to this file")
+    parser.add_argument("--compare", default=None,
+                        help="compare the suite results against a baseline written with --json")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="slowdown that counts as a regression (default: 0.1 for 10%%)")
+    args = parser.parse_args()
+
+    if not (args.suite or args.json or args.compare):
+        failed = []
+        for name in args.names or list(BENCHMARKS):
+            print(f"[{name}]")
+            if BENCHMARKS[name]() is False:
+                failed.append(name)
+        if failed:
+            print(f"Failed: {', '.join(failed)}")
+        sys.exit(1 if failed else 0)
+
+    unknown = [name for name in args.names if name not in SUITE]
+    if unknown:
+        parser.error(f"unknown suite benchmarks: {', '.join(unknown)}")
+    report = run_suite(args.names or list(SUITE))
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
+    if args.compare:
+        with open(args.compare, "r") as file:
+            baseline = json.load(file)
+        regressions = compare(report["results"], baseline["results"], args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print("No regressions.")
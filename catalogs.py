@@ -0,0 +1,108 @@
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple, Union
+
+Catalog = Mapping[str, Mapping[str, Union[int, str]]]
+
+
+def _freeze(table: Dict[str, Dict[str, Union[int, str]]]) -> Catalog:
+    return MappingProxyType({key: MappingProxyType(entry) for key, entry in table.items()})
+
+
+LOAN_TYPES: Catalog = _freeze({
+    "a": {
+        "amount": 500,
+        "flag": "cf_loans",
+        "message": "Community Fund"
+    },
+    "b": {
+        "amount": 1000,
+        "flag": "cs_loans",
+        "message": "City Support"
+    },
+    "c": {
+        "amount": 2500,
+        "flag": "gl_loans",
+        "message": "Grand Loan"
+    }
+})
+
+VEHICLE_COSTS: Catalog = _freeze({
+    "a": {
+        "cost": 100,
+        "station": "bus_stations",
+        "type": "Bus"
+    },
+    "b": {
+        "cost": 40,
+        "station": "taxi_stations",
+        "type": "Taxi"
+    },
+    "c": {
+        "cost": 200,
+        "station": "train_stations",
+        "type": "Train"
+    }
+})
+
+STATION_COSTS: Catalog = _freeze({
+    "a": {
+        "cost": 10,
+        "type": "Taxi"
+    },
+    "b": {
+        "cost": 25,
+        "type": "Bus"
+    },
+    "c": {
+        "cost": 50,
+        "type": "Train"
+    }
+})
+
+SHARE_NAMES: Mapping[str, str] = MappingProxyType({
+    "a": "Horizon Industries",
+    "b": "Summit Securities",
+    "c": "Crestline Holdings",
+    "d": "Cascade Ventures",
+    "e": "Panorama Industries",
+    "f": "Vanguard Corporation",
+    "g": "Apex Dynamics",
+    "h": "Zenith Ventures",
+    "i": "Crestview Holdings",
+    "j": "Brick Corporation"
+})
+
+SHARE_KEYS: Tuple[str, ...] = tuple(SHARE_NAMES)
+SHARE_INDEX: Mapping[str, int] = MappingProxyType({key: index for index, key in enumerate(SHARE_KEYS)})
+SHARE_FIELDS: Tuple[str, ...] = ("name", "price", "value", "dividend_yield", "amount")
+
+FIRST_NAMES: Tuple[str, ...] = (
+    "Emma", "Olivia", "Ava", "Isabella", "Sophia",
+    "Liam", "Noah", "William", "James", "Logan"
+)
+LAST_NAMES: Tuple[str, ...] = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones",
+    "Garcia", "Miller", "Davis", "Rodriguez", "Martinez"
+)
+PLACE_ADJECTIVES: Tuple[str, ...] = (
+    'Mystic', 'Forgotten', 'Enchanted', 'Lost', 'Ancient',
+    'Whispering', 'Ethereal', 'Silent', 'Celestial', 'Hidden',
+    'Glowing', 'Secret', 'Twilight', 'Emerald', 'Frozen',
+    'Divine', 'Moonlit', 'Golden', 'Sapphire', 'Starlit'
+)
+PLACE_NOUNS: Tuple[str, ...] = (
+    'Valley', 'Forest', 'Island', 'Mountains', 'Canyon',
+    'Labyrinth', 'Cave', 'Grove', 'Lake', 'Ruins',
+    'Waterfall', 'Citadel', 'Garden', 'Desert', 'Oasis',
+    'Temple', 'Castle', 'Peak', 'Spires', 'Meadow'
+)
+EMPIRE_PREFIXES: Tuple[str, ...] = (
+    "Galactic", "Celestial", "Stellar", "Cosmic",
+    "Universal", "Interstellar"
+)
+EMPIRE_SUFFIXES: Tuple[str, ...] = (
+    "Empire", "Dominion", "Federation", "Union",
+    "Consortium", "Alliance"
+)
+
+SEPARATOR: str = '-' * 30
@@ -0,0 +1,223 @@
+import shlex
+import time
+from typing import Callable, Dict, List
+from engine import EngineError, OrderTicket
+from game import Game
+from metrics import get_metrics
+from render import parse_station_filter
+from savestore import get_save_store
+from snapshot import SnapshotError
+
+HELP: str = """/empireinfo - View empire info
+/editempire <name> [monarch] - Edit empire name and monarch
+/savegame [key|delta|file|db] - Save your game
+/buyvehicle <bus|taxi|train> <amount> - Purchase vehicles
+/getloan <a|b|c> | /getloan d <amount> - Get a loan
+/payloan <a|b|c|d> - Pay a loan
+/buyshares <share> <amount> - Purchase shares
+/quoteshares <share> <amount> - Calculate the price of shares
+/sellshares <share> <amount> - Sell your shares
+/sharemarket - View the share market
+/sharehistory <share> [count] - View recent prices and indicators of a share
+/order <buy|sell> <share> <amount> [price] - Place a market or limit order with other empires
+/cancelorder <id> - Cancel an open order
+/orders - View your open orders
+/createstation <a|b|c> [count] - Create new stations
+/stations [taxi|bus|train] [prefix] [page] - View stations, a page at a time
+/renamestation <old name> <new name> - Rename a station
+/achievements - View achievements and rewards
+/leaderboard [count] - View the top empires and your rank
+/redeem <passkey> - Redeem a passkey
+/stats - View tick and command timings
+/exit - End the session"""
+
+
+class CommandError(Exception):
+    pass
+
+
+class CommandProcessor:
+    def __init__(self, game: Game) -> None:
+        self.game: Game = game
+        self.closed: bool = False
+        self.handlers: Dict[str, Callable[[List[str]], str]] = {
+            "/help": lambda args: HELP,
+            "/empireinfo": lambda args: self.game.empire_info_text(),
+            "/editempire": self.edit_empire,
+            "/savegame": self.save_game,
+            "/buyvehicle": self.buy_vehicle,
+            "/getloan": self.get_loan,
+            "/payloan": self.pay_loan,
+            "/buyshares": self.buy_shares,
+            "/quoteshares": self.quote_shares,
+            "/sellshares": self.sell_shares,
+            "/sharemarket": lambda args: self.game.share_market_text(),
+            "/sharehistory": self.share_history,
+            "/order": self.order,
+            "/cancelorder": self.cancel_order,
+            "/orders": self.orders,
+            "/createstation": self.create_station,
+            "/stations": self.list_stations,
+            "/renamestation": self.rename_station,
+            "/achievements": lambda args: self.game.achievements_text(),
+            "/leaderboard": lambda args: self.game.leaderboard_text(self._number(args[0]) if args else 10),
+            "/redeem": self.redeem,
+            "/stats": lambda args: self.game.stats_text(),
+            "/exit": self.exit
+        }
+
+    def execute(self, line: str) -> str:
+        try:
+            words = shlex.split(line)
+        except ValueError as e:
+            return f"Invalid command: {e}"
+        if not words:
+            return ""
+
+        command = words[0].lower()
+        handler = self.handlers.get(command)
+        metrics = get_metrics()
+        if handler is None:
+            if metrics is not None:
+                metrics.count("unknown_commands_total")
+            return "Unknown command."
+        started = time.perf_counter_ns() if metrics is not None else 0
+        failed = False
+        try:
+            return handler(words[1:])
+        except (EngineError, CommandError) as e:
+            failed = True
+            return str(e)
+        finally:
+            if metrics is not None:
+                metrics.record_command(command, time.perf_counter_ns() - started, failed)
+
+    def _args(self, args: List[str], count: int, usage: str) -> List[str]:
+        if len(args) < count:
+            raise CommandError(f"Usage: {usage}")
+        return args
+
+    def _number(self, text: str) -> int:
+        try:
+            return int(text)
+        except ValueError:
+            raise CommandError("Invalid number.") from None
+
+    def edit_empire(self, args: List[str]) -> str:
+        self._args(args, 1, "/editempire <name> [monarch]")
+        info = self.game.engine.edit_empire(args[0], args[1] if len(args) > 1 else "")
+        return f"Empire Name: {info['name']}\nEmpire Monarch: {info['monarch']}"
+
+    def save_game(self, args: List[str]) -> str:
+        mode = args[0].lower() if args else "key"
+        if mode == "key":
+            return f"Game Key: {self.game.saveload.generate_key()}. Save it securely."
+        if mode == "delta":
+            return f"Game Key: {self.game.saveload.generate_delta_key()}. Save it securely."
+        if mode == "file":
+            self.game.write_game_key()
+            return "Game saved in file."
+        if mode == "db":
+            try:
+                return f"Game saved in database (save #{self.game.saveload.save_to_store(get_save_store())})."
+            except SnapshotError as e:
+                return f"Error saving game: {e}"
+        return "Not a valid option."
+
+    def buy_vehicle(self, args: List[str]) -> str:
+        self._args(args, 2, "/buyvehicle <bus|taxi|train> <amount>")
+        purchase = self.game.engine.buy_vehicle(args[0], self._number(args[1]))
+        return f"Successfully bought {purchase.amount} {purchase.vehicle_type}(s)."
+
+    def get_loan(self, args: List[str]) -> str:
+        self._args(args, 1, "/getloan <a|b|c> | /getloan d <amount>")
+        if args[0].lower() == "d":
+            self._args(args, 2, "/getloan d <amount>")
+            result = self.game.engine.request_special_loan(self._number(args[1]))
+            if result.accepted:
+                return f"The bank is interested in your offer. It has been accepted. You have received a loan of ${result.amount}."
+            return "The bank is not available. Your offer has been declined."
+        self.game.engine.take_loan(args[0].lower())
+        return "Loan received successfully."
+
+    def pay_loan(self, args: List[str]) -> str:
+        self._args(args, 1, "/payloan <a|b|c|d>")
+        if args[0].lower() == "d":
+            self.game.engine.pay_special_loan()
+        else:
+            self.game.engine.pay_loan(args[0].lower())
+        return "Loan paid off successfully."
+
+    def buy_shares(self, args: List[str]) -> str:
+        self._args(args, 2, "/buyshares <share> <amount>")
+        trade = self.game.engine.purchase_shares(args[0].lower(), self._number(args[1]))
+        return f"Sucessfully bought {trade.amount} shares in {trade.name}."
+
+    def quote_shares(self, args: List[str]) -> str:
+        self._args(args, 2, "/quoteshares <share> <amount>")
+        quote = self.game.engine.quote_shares(args[0].lower(), self._number(args[1]))
+        return f"The price of {quote.amount} shares in {quote.name} is ${quote.total}."
+
+    def sell_shares(self, args: List[str]) -> str:
+        self._args(args, 2, "/sellshares <share> <amount>")
+        trade = self.game.engine.sell_shares(args[0].lower(), self._number(args[1]))
+        return f"Sucessfully sold {trade.amount} shares in {trade.name} for ${trade.total}."
+
+    def share_history(self, args: List[str]) -> str:
+        self._args(args, 1, "/sharehistory <share> [count]")
+        share = args[0].lower()
+        prices = self.game.engine.share_history(share, "price", self._number(args[1]) if len(args) > 1 else 20)
+        indicators = self.game.engine.share_indicators(share)
+        if indicators is None:
+            return "No price history yet."
+        return (f"Prices of {self.game.shares[share]['name']}: {', '.join(str(price) for price in prices)}\n"
+                f"Average ${indicators.average:.2f}, EMA ${indicators.ema:.2f}, low ${indicators.low}, "
+                f"high ${indicators.high}, volatility {indicators.volatility:.2f}")
+
+    def _describe(self, ticket: OrderTicket) -> str:
+        price = "market" if ticket.price is None else f"${ticket.price}"
+        return (f"#{ticket.order_id} {ticket.side} {ticket.remaining}/{ticket.amount} "
+                f"{self.game.shares[ticket.share]['name']} at {price} ({ticket.status})")
+
+    def order(self, args: List[str]) -> str:
+        self._args(args, 3, "/order <buy|sell> <share> <amount> [price]")
+        price = self._number(args[3]) if len(args) > 3 else None
+        ticket = self.game.engine.submit_order(args[0].lower(), args[1].lower(), self._number(args[2]), price)
+        return f"Order placed: {self._describe(ticket)}"
+
+    def cancel_order(self, args: List[str]) -> str:
+        self._args(args, 1, "/cancelorder <id>")
+        ticket = self.game.engine.cancel_order(self._number(args[0].lstrip("#")))
+        return f"Order cancelled: {self._describe(ticket)}"
+
+    def orders(self, args: List[str]) -> str:
+        tickets = self.game.engine.open_orders()
+        if not tickets:
+            return "You have no open orders."
+        return "\n".join(["Open orders:", *(self._describe(ticket) for ticket in tickets)])
+
+    def create_station(self, args: List[str]) -> str:
+        self._args(args, 1, "/createstation <a|b|c> [count]")
+        count = self._number(args[1]) if len(args) > 1 else 1
+        created = self.game.engine.create_stations(args[0].lower(), count)
+        if count == 1:
+            return f"{created.station_type} station created successfully!"
+        return f"{count} {created.station_type} stations created successfully!"
+
+    def list_stations(self, args: List[str]) -> str:
+        station_type, prefix, page = parse_station_filter(args)
+        return self.game.stations_text(page, station_type, prefix)
+
+    def rename_station(self, args: List[str]) -> str:
+        self._args(args, 2, "/renamestation <old name> <new name>")
+        renamed = self.game.engine.rename_station(args[0], args[1])
+        return f"Station renamed from '{renamed.old_name}' to '{renamed.new_name}'."
+
+    def redeem(self, args: List[str]) -> str:
+        self._args(args, 1, "/redeem <passkey>")
+        reward = self.game.engine.redeem_passkey(args[0])
+        return f"Redeemed prize of {reward.description}."
+
+    def exit(self, args: List[str]) -> str:
+        self.closed = True
+        return "Exiting game..."
@@ -0,0 +1,519 @@
+from dataclasses import dataclass
+from functools import wraps
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, cast
+from history import ShareIndicators
+from leaderboard import Standing
+
+if TYPE_CHECKING:
+    from game import Game
+    from exchange import BookOrder, Exchange
+
+VEHICLE_KEYS: Dict[str, str] = {
+    "bus": "a",
+    "taxi": "b",
+    "train": "c"
+}
+
+VEHICLE_ATTRS: Dict[str, str] = {
+    "bus": "buses",
+    "taxi": "taxis",
+    "train": "trains"
+}
+
+MAX_SPECIAL_LOAN: int = 1_000_000_000
+
+Method = TypeVar("Method", bound=Callable[..., Any])
+
+
+class EngineError(Exception):
+    message: str = "Action failed."
+
+    def __init__(self, message: Optional[str] = None) -> None:
+        super().__init__(message or self.message)
+
+
+class InvalidAmount(EngineError):
+    message = "Negative numbers and zero are not allowed."
+
+
+class InvalidChoice(EngineError):
+    message = "Invalid option!"
+
+
+class InsufficientFunds(EngineError):
+    message = "You do not have enough money!"
+
+
+class NoStationAvailable(EngineError):
+    message = "No station available."
+
+
+class LoanAlreadyProcessed(EngineError):
+    message = "Loan already processed."
+
+
+class LoanOutstanding(EngineError):
+    message = "You already have a customized loan with the bank. You can request a new one once you pay the customized loan back."
+
+
+class StationNotFound(EngineError):
+    message = "Station not found."
+
+
+class InvalidPasskey(EngineError):
+    message = "Invalid passkey."
+
+
+class OrderNotFound(EngineError):
+    message = "Order not found."
+
+
+class TradingUnavailable(EngineError):
+    message = "Share trading between empires is only available in multiplayer."
+
+
+@dataclass(frozen=True)
+class VehiclePurchase:
+    vehicle_type: str
+    amount: int
+    cost: int
+
+
+@dataclass(frozen=True)
+class LoanResult:
+    loan_type: str
+    name: str
+    amount: int
+    taken: bool
+
+
+@dataclass(frozen=True)
+class SpecialLoanResult:
+    amount: int
+    accepted: bool
+
+
+@dataclass(frozen=True)
+class ShareTrade:
+    share: str
+    name: str
+    amount: int
+    total: int
+
+
+@dataclass(frozen=True)
+class OrderTicket:
+    order_id: int
+    side: str
+    share: str
+    amount: int
+    price: Optional[int]
+    remaining: int
+    status: str
+
+
+@dataclass(frozen=True)
+class StationCreated:
+    name: str
+    station_type: str
+    cost: int
+
+
+@dataclass(frozen=True)
+class StationsCreated:
+    station_type: str
+    names: List[str]
+    cost: int
+
+
+@dataclass(frozen=True)
+class Order:
+    kind: str
+    item: str
+    amount: int
+
+
+@dataclass(frozen=True)
+class OrderBatch:
+    orders: List[Order]
+    cost: int
+    proceeds: int
+
+
+@dataclass(frozen=True)
+class StationRenamed:
+    old_name: str
+    new_name: str
+
+
+@dataclass(frozen=True)
+class Achievement:
+    title: str
+    passkey: str
+    index: int
+
+
+@dataclass(frozen=True)
+class Reward:
+    passkey: str
+    description: str
+
+
+@dataclass(frozen=True)
+class EmpireSnapshot:
+    version: int
+    name: str
+    monarch: str
+    balance: float
+    taxis: int
+    buses: int
+    trains: int
+    cf_loans: int
+    cs_loans: int
+    gl_loans: int
+    special_loan_amount: int
+    taxi_stations: int
+    bus_stations: int
+    train_stations: int
+    share_amounts: Tuple[int, ...]
+    share_prices: Tuple[int, ...]
+    share_values: Tuple[int, ...]
+    share_yields: Tuple[float, ...]
+
+
+def transactional(method: Method) -> Method:
+    @wraps(method)
+    def wrapper(self: "GameEngine", *args: Any, **kwargs: Any) -> Any:
+        with self.game.transaction():
+            return method(self, *args, **kwargs)
+    return cast(Method, wrapper)
+
+
+class GameEngine:
+    def __init__(self, game: "Game") -> None:
+        self.game: "Game" = game
+
+    @transactional
+    def edit_empire(self, name: str = "", monarch: str = "") -> Dict[str, str]:
+        journal = self.game.journal
+        if name:
+            self.game.empire_info["name"] = name
+            if journal is not None:
+                journal.rename("name", name)
+        if monarch:
+            self.game.empire_info["monarch"] = monarch
+            if journal is not None:
+                journal.rename("monarch", monarch)
+        self.game.leaderboard.rename(self.game.empire_id, self.game.leaderboard_name)
+        return self.game.empire_info
+
+    @transactional
+    def buy_vehicle(self, vehicle_type: str, number_needed: int) -> VehiclePurchase:
+        game = self.game
+        game.settle()
+        if number_needed < 1:
+            raise InvalidAmount()
+
+        vehicle_type = vehicle_type.strip().lower()
+        key = VEHICLE_KEYS.get(vehicle_type)
+        if not key:
+            raise InvalidChoice("Invalid vehicle type! Please choose from 'bus', 'taxi', or 'train'.")
+
+        cost_info = game.vehicle_costs[key]
+        if getattr(game, cost_info["station"]) <= 0:
+            raise NoStationAvailable(f"No {cost_info['type']} station available.")
+
+        price = cost_info["cost"] * number_needed
+        if game.balance < price:
+            raise InsufficientFunds()
+
+        vehicle_attr = VEHICLE_ATTRS[vehicle_type]
+        setattr(game, vehicle_attr, getattr(game, vehicle_attr) + number_needed)
+        game.balance -= price
+        if game.journal is not None:
+            game.journal.purchase(vehicle_attr, number_needed, price)
+        return VehiclePurchase(vehicle_type, number_needed, price)
+
+    def take_loan(self, loan_type: str) -> LoanResult:
+        return self._standard_loan(loan_type, 0)
+
+    def pay_loan(self, loan_type: str) -> LoanResult:
+        return self._standard_loan(loan_type, 1)
+
+    @transactional
+    def _standard_loan(self, loan_type: str, action: int) -> LoanResult:
+        game = self.game
+        game.settle()
+        loan_info = game.loan_types.get(loan_type)
+        if loan_info is None:
+            raise InvalidChoice("Invalid loan type!")
+        if getattr(game, loan_info["flag"]) != action:
+            raise LoanAlreadyProcessed()
+
+        amount = loan_info["amount"]
+        if action == 0:
+            game.balance += amount
+        else:
+            if game.balance < amount:
+                raise InsufficientFunds("Not enough money!")
+            game.balance -= amount
+        setattr(game, loan_info["flag"], action ^ 1)
+        if game.journal is not None:
+            game.journal.loan(loan_info["flag"], action ^ 1, amount if action == 0 else -amount)
+        return LoanResult(loan_type, loan_info["message"], amount, action == 0)
+
+    @transactional
+    def request_special_loan(self, amount: int) -> SpecialLoanResult:
+        game = self.game
+        game.settle()
+        if game.special_loan_amount != 0:
+            raise LoanOutstanding()
+        if amount < 1:
+            raise InvalidAmount()
+        if amount > MAX_SPECIAL_LOAN:
+            raise InvalidAmount(f"Special loans are limited to ${MAX_SPECIAL_LOAN:,}.")
+
+        accepted = bool(game.rng.randint(0, 1))
+        if accepted:
+            game.special_loan_amount = amount
+            game.balance += amount
+            if game.journal is not None:
+                game.journal.loan("special_loan_amount", amount, amount)
+        return SpecialLoanResult(amount, accepted)
+
+    @transactional
+    def pay_special_loan(self) -> int:
+        game = self.game
+        game.settle()
+        amount = game.special_loan_amount
+        if game.balance < amount:
+            raise InsufficientFunds("Not enough money!")
+        game.balance -= amount
+        game.special_loan_amount = 0
+        if game.journal is not None:
+            game.journal.loan("special_loan_amount", 0, -amount)
+        return amount
+
+    def _share(self, share: str) -> Dict[str, int]:
+        self.game.settle()
+        info = self.game.shares.get(share)
+        if info is None:
+            raise InvalidChoice("Invalid share!")
+        return info
+
+    def quote_shares(self, share: str, amount: int) -> ShareTrade:
+        info = self._share(share)
+        if amount < 1:
+            raise InvalidAmount()
+        return ShareTrade(share, info["name"], amount, amount * self.game.share_price(share))
+
+    @transactional
+    def purchase_shares(self, share: str, amount: int) -> ShareTrade:
+        quote = self.quote_shares(share, amount)
+        if self.game.balance < quote.total:
+            raise InsufficientFunds("Not enough money!")
+        self.game.balance -= quote.total
+        self.game.shares[share]["amount"] += amount
+        if self.game.journal is not None:
+            self.game.journal.trade(share, amount, -quote.total)
+        return quote
+
+    @transactional
+    def sell_shares(self, share: str, amount: int) -> ShareTrade:
+        info = self._share(share)
+        if info["amount"] <= 0:
+            raise InvalidAmount(f"You do not own any shares in {info['name']}.")
+        if amount < 1:
+            raise InvalidAmount()
+        if amount > info["amount"]:
+            raise InvalidAmount(f"You only own {info['amount']} shares in {info['name']}.")
+        total = amount * self.game.share_value(share)
+        info["amount"] -= amount
+        self.game.balance += total
+        if self.game.journal is not None:
+            self.game.journal.trade(share, -amount, total)
+        return ShareTrade(share, info["name"], amount, total)
+
+    def _exchange(self) -> "Exchange":
+        if self.game.exchange is None:
+            raise TradingUnavailable()
+        self.game.settle()
+        return self.game.exchange
+
+    def _ticket(self, order: "BookOrder") -> OrderTicket:
+        return OrderTicket(order.order_id, order.side, order.share, order.amount, order.price,
+                           order.remaining, order.status)
+
+    def submit_order(self, side: str, share: str, amount: int, price: Optional[int] = None) -> OrderTicket:
+        return self._ticket(self._exchange().submit(self.game, share, side, amount, price))
+
+    def cancel_order(self, order_id: int) -> OrderTicket:
+        return self._ticket(self._exchange().cancel(self.game, order_id))
+
+    def open_orders(self) -> List[OrderTicket]:
+        return [self._ticket(order) for order in self._exchange().open_orders(self.game)]
+
+    @transactional
+    def create_station(self, station_type: str) -> StationCreated:
+        game = self.game
+        game.settle()
+        cost_info = game.station_costs.get(station_type)
+        if cost_info is None:
+            raise InvalidChoice("Invalid station type!")
+        if game.balance < cost_info["cost"]:
+            raise InsufficientFunds("Not enough money!")
+
+        game.balance -= cost_info["cost"]
+        station = game.stations.create(cost_info["type"], game.tools.generate_place())
+        if game.journal is not None:
+            game.journal.station(cost_info["type"], station.name, cost_info["cost"])
+        return StationCreated(station.name, cost_info["type"], cost_info["cost"])
+
+    @transactional
+    def create_stations(self, station_type: str, count: int) -> StationsCreated:
+        game = self.game
+        game.settle()
+        cost_info = game.station_costs.get(station_type)
+        if cost_info is None:
+            raise InvalidChoice("Invalid station type!")
+        if count < 1:
+            raise InvalidAmount()
+        cost = cost_info["cost"] * count
+        if game.balance < cost:
+            raise InsufficientFunds("Not enough money!")
+
+        game.balance -= cost
+        stations = game.stations.create_many(cost_info["type"], game.tools.generate_places(count))
+        if game.journal is not None:
+            for station in stations:
+                game.journal.station(cost_info["type"], station.name, cost_info["cost"])
+        return StationsCreated(cost_info["type"], [station.name for station in stations], cost)
+
+    @transactional
+    def place_orders(self, orders: Sequence[Order]) -> OrderBatch:
+        game = self.game
+        game.settle()
+        vehicles: Dict[str, int] = {}
+        bought: Dict[str, int] = {}
+        sold: Dict[str, int] = {}
+        cost = proceeds = 0
+
+        for order in orders:
+            if order.amount < 1:
+                raise InvalidAmount()
+            if order.kind == "vehicle":
+                vehicle_type = order.item.strip().lower()
+                key = VEHICLE_KEYS.get(vehicle_type)
+                if not key:
+                    raise InvalidChoice("Invalid vehicle type! Please choose from 'bus', 'taxi', or 'train'.")
+                cost_info = game.vehicle_costs[key]
+                if getattr(game, cost_info["station"]) <= 0:
+                    raise NoStationAvailable(f"No {cost_info['type']} station available.")
+                vehicles[vehicle_type] = vehicles.get(vehicle_type, 0) + order.amount
+                cost += cost_info["cost"] * order.amount
+            elif order.kind in ("buy_shares", "sell_shares"):
+                info = game.shares.get(order.item)
+                if info is None:
+                    raise InvalidChoice("Invalid share!")
+                if order.kind == "buy_shares":
+                    bought[order.item] = bought.get(order.item, 0) + order.amount
+                    cost += game.share_price(order.item) * order.amount
+                else:
+                    sold[order.item] = sold.get(order.item, 0) + order.amount
+                    if sold[order.item] > info["amount"]:
+                        raise InvalidAmount(f"You only own {info['amount']} shares in {info['name']}.")
+                    proceeds += game.share_value(order.item) * order.amount
+            else:
+                raise InvalidChoice(f"Invalid order type '{order.kind}'.")
+
+        if game.balance + proceeds < cost:
+            raise InsufficientFunds()
+
+        for vehicle_type, amount in vehicles.items():
+            vehicle_attr = VEHICLE_ATTRS[vehicle_type]
+            setattr(game, vehicle_attr, getattr(game, vehicle_attr) + amount)
+        for share, amount in bought.items():
+            game.shares[share]["amount"] += amount
+        for share, amount in sold.items():
+            game.shares[share]["amount"] -= amount
+        game.balance += proceeds - cost
+        if game.journal is not None:
+            for vehicle_type, amount in vehicles.items():
+                game.journal.purchase(VEHICLE_ATTRS[vehicle_type], amount,
+                                      game.vehicle_costs[VEHICLE_KEYS[vehicle_type]]["cost"] * amount)
+            for share, amount in bought.items():
+                game.journal.trade(share, amount, -game.share_price(share) * amount)
+            for share, amount in sold.items():
+                game.journal.trade(share, -amount, game.share_value(share) * amount)
+        return OrderBatch(list(orders), cost, proceeds)
+
+    @transactional
+    def rename_station(self, old_name: str, new_name: str) -> StationRenamed:
+        stations = self.game.stations
+        if old_name not in stations:
+            raise StationNotFound()
+        if not new_name:
+            raise InvalidChoice("New name cannot be empty.")
+        if new_name in stations and new_name != old_name:
+            raise InvalidChoice("A station with that name already exists.")
+        stations.rename(old_name, new_name)
+        if self.game.journal is not None:
+            self.game.journal.rename("station", new_name, old_name)
+        return StationRenamed(old_name, new_name)
+
+    def share_indicators(self, share: str) -> Optional[ShareIndicators]:
+        self._share(share)
+        return self.game.share_indicators(share)
+
+    def share_history(self, share: str, field: str = "price", count: Optional[int] = None) -> List[float]:
+        self._share(share)
+        if field not in ("price", "value", "dividend_yield"):
+            raise InvalidChoice(f"Invalid history field '{field}'.")
+        return self.game.price_history.series(share, field, count)
+
+    def leaderboard_rank(self) -> Optional[int]:
+        self.game.settle()
+        return self.game.leaderboard.rank(self.game.empire_id)
+
+    def top_empires(self, count: int = 10) -> List[Standing]:
+        if count < 1:
+            raise InvalidAmount()
+        return self.game.leaderboard.top(count)
+
+    def empires_around(self, radius: int = 2) -> List[Standing]:
+        self.game.settle()
+        return self.game.leaderboard.around(self.game.empire_id, radius)
+
+    def check_achievement(self) -> Optional[Achievement]:
+        game = self.game
+        game.settle()
+        pending = game.achievements.pending(game)
+        if not pending:
+            return None
+        return Achievement(pending[0].title, pending[0].passkey, pending[0].slot)
+
+    @transactional
+    def redeem_passkey(self, passkey: str) -> Reward:
+        rule = self.game.achievements.by_passkey.get(passkey)
+        if rule is None:
+            raise InvalidPasskey()
+        self.game.settle()
+        if not self.game.redeemable[rule.slot]:
+            raise InvalidPasskey("Passkey already redeemed.")
+
+        description, attr, amount = rule.reward
+        setattr(self.game, attr, getattr(self.game, attr) + amount)
+        self.game.redeemable[rule.slot] = False
+        if self.game.journal is not None:
+            self.game.journal.reward(rule.slot, attr, amount)
+        return Reward(passkey, description)
+
+    @transactional
+    def advance(self, ticks: int = 1) -> int:
+        game = self.game
+        for _ in range(ticks):
+            game.update_market()
+            game.update_balance()
+        if ticks > 0 and game.journal is not None:
+            game.journal.tick(game.add_dividend_interval, game.balance, game.quotes())
+        return game.balance
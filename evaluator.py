@@ -0,0 +1,241 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Tuple, Union
+import numpy as np
+from engine import EngineError, GameEngine
+from game import Game
+from leaderboard import Leaderboard
+from persistence import GameInfoStore
+
+Strategy = Callable[[GameEngine, int], None]
+PERCENTILES: Tuple[int, ...] = (5, 25, 50, 75, 95)
+RESULT_BYTES: int = 8 + 8 + 1
+BUY_PRICE: int = 50
+SELL_VALUE: int = 400
+MARKET_SHARE: float = 0.1
+MAX_ORDER: int = 10_000
+
+
+def _try(action: Callable[[], object]) -> bool:
+    try:
+        action()
+    except EngineError:
+        return False
+    return True
+
+
+def _expand_taxis(engine: GameEngine, budget: float, limit: int = 10) -> None:
+    game = engine.game
+    if game.taxi_stations < 4 * game.taxis + 4:
+        count = min(limit, int(budget // 10))
+        if count:
+            _try(lambda: engine.create_stations("a", count))
+    else:
+        count = min(limit, int(budget // 40))
+        if count:
+            _try(lambda: engine.buy_vehicle("taxi", count))
+
+
+def _trade_market(engine: GameEngine, budget: float) -> None:
+    game = engine.game
+    for share in game.shares:
+        held = game.shares[share]["amount"]
+        if held and game.share_value(share) >= SELL_VALUE:
+            _try(lambda: engine.sell_shares(share, held))
+    cheapest = min(game.shares, key=game.share_price)
+    price = game.share_price(cheapest)
+    if 0 < price <= BUY_PRICE and budget >= price:
+        _try(lambda: engine.purchase_shares(cheapest, min(MAX_ORDER, int(budget // price))))
+
+
+def idle(engine: GameEngine, tick: int) -> None:
+    pass
+
+
+def taxis_first(engine: GameEngine, tick: int) -> None:
+    _expand_taxis(engine, engine.game.balance)
+    _trade_market(engine, engine.game.balance * MARKET_SHARE)
+
+
+def grand_loan_first(engine: GameEngine, tick: int) -> None:
+    game = engine.game
+    if tick == 0:
+        _try(lambda: engine.take_loan("c"))
+    elif game.gl_loans and game.balance >= 10_000:
+        _try(lambda: engine.pay_loan("c"))
+    reserve = 2500 if game.gl_loans and tick > 200 else 0
+    _expand_taxis(engine, game.balance - reserve)
+    _trade_market(engine, (game.balance - reserve) * MARKET_SHARE)
+
+
+def shares_first(engine: GameEngine, tick: int) -> None:
+    game = engine.game
+    if game.add_dividend_interval < 99:
+        best = max(game.shares, key=lambda share: game.share_yield(share))
+        price = game.share_price(best)
+        if price > 0 and game.balance >= price:
+            _try(lambda: engine.purchase_shares(best, int(game.balance // price)))
+        return
+    for share in game.shares:
+        held = game.shares[share]["amount"]
+        if held and game.share_value(share) > 0:
+            _try(lambda: engine.sell_shares(share, held))
+    _expand_taxis(engine, game.balance)
+
+
+STRATEGIES: Dict[str, Strategy] = {
+    "idle": idle,
+    "taxis_first": taxis_first,
+    "grand_loan_first": grand_loan_first,
+    "shares_first": shares_first
+}
+
+
+@dataclass(frozen=True)
+class Distribution:
+    count: int
+    mean: float
+    percentiles: Dict[int, float]
+
+
+@dataclass(frozen=True)
+class StrategyReport:
+    strategy: str
+    seeds: int
+    ticks: int
+    target: int
+    final_balance: Distribution
+    time_to_target: Distribution
+    target_rate: float
+    bankruptcy_rate: float
+    elapsed: float
+
+
+def _result_arrays(buffer: memoryview, seeds: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    balances = np.ndarray((seeds,), dtype=np.float64, buffer=buffer)
+    reached = np.ndarray((seeds,), dtype=np.int64, buffer=buffer, offset=8 * seeds)
+    bankrupt = np.ndarray((seeds,), dtype=np.bool_, buffer=buffer, offset=16 * seeds)
+    return balances, reached, bankrupt
+
+
+def simulate(strategy: Strategy, seed: int, ticks: int, target: int) -> Tuple[float, int, bool]:
+    game = Game(seed=seed, info_store=GameInfoStore(None), leaderboard=Leaderboard(None))
+    engine = game.engine
+    reached = -1
+    for tick in range(ticks):
+        strategy(engine, tick)
+        balance = engine.advance(1)
+        if reached < 0 and balance >= target:
+            reached = tick + 1
+        if balance < 0:
+            return float(balance), reached, True
+    return float(game.balance), reached, False
+
+
+def seed_sensitive(strategy: Union[str, Strategy], seeds: int = 8, ticks: int = 200) -> bool:
+    strategy = STRATEGIES[strategy] if isinstance(strategy, str) else strategy
+    return len({simulate(strategy, seed, ticks, 0)[0] for seed in range(seeds)}) > 1
+
+
+def run_chunk(strategy: Union[str, Strategy], start: int, stop: int, seeds: int, base_seed: int,
+              ticks: int, target: int, memory_name: str) -> int:
+    strategy = STRATEGIES[strategy] if isinstance(strategy, str) else strategy
+    memory = shared_memory.SharedMemory(name=memory_name)
+    try:
+        balances, reached, bankrupt = _result_arrays(memory.buf, seeds)
+        for index in range(start, stop):
+            balances[index], reached[index], bankrupt[index] = simulate(strategy, base_seed + index, ticks, target)
+        del balances, reached, bankrupt
+    finally:
+        memory.close()
+    return stop - start
+
+
+def _distribution(values: np.ndarray) -> Distribution:
+    if not len(values):
+        return Distribution(0, 0.0, {percentile: 0.0 for percentile in PERCENTILES})
+    points = np.percentile(values, PERCENTILES)
+    return Distribution(len(values), float(values.mean()),
+                        {percentile: float(point) for percentile, point in zip(PERCENTILES, points)})
+
+
+def evaluate(strategy: Union[str, Strategy], seeds: int = 1000, ticks: int = 1000, target: int = 1_000_000,
+             workers: Optional[int] = None, chunk_size: Optional[int] = None, base_seed: int = 0,
+             executor: Optional[ProcessPoolExecutor] = None) -> StrategyReport:
+    if isinstance(strategy, str) and strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{strategy}'.")
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, seeds // (workers * 8))
+    start_time = time.perf_counter()
+    memory = shared_memory.SharedMemory(create=True, size=max(1, RESULT_BYTES * seeds))
+    try:
+        chunks = [(start, min(start + chunk_size, seeds)) for start in range(0, seeds, chunk_size)]
+        arguments = (seeds, base_seed, ticks, target, memory.name)
+        if workers == 1 and executor is None:
+            for start, stop in chunks:
+                run_chunk(strategy, start, stop, *arguments)
+        else:
+            pool = executor or ProcessPoolExecutor(workers)
+            try:
+                futures = [pool.submit(run_chunk, strategy, start, stop, *arguments) for start, stop in chunks]
+                wait(futures)
+                for future in futures:
+                    future.result()
+            finally:
+                if executor is None:
+                    pool.shutdown()
+
+        balances, reached, bankrupt = (array.copy() for array in _result_arrays(memory.buf, seeds))
+    finally:
+        memory.close()
+        memory.unlink()
+
+    name = strategy if isinstance(strategy, str) else strategy.__name__
+    return StrategyReport(name, seeds, ticks, target, _distribution(balances),
+                          _distribution(reached[reached >= 0].astype(np.float64)),
+                          float((reached >= 0).mean()) if seeds else 0.0,
+                          float(bankrupt.mean()) if seeds else 0.0, time.perf_counter() - start_time)
+
+
+def report_text(report: StrategyReport) -> str:
+    def percentiles(distribution: Distribution) -> str:
+        return ", ".join(f"p{percentile} {value:,.0f}" for percentile, value in distribution.percentiles.items())
+
+    lines: List[str] = [
+        f"[{report.strategy}] {report.seeds:,} seeds x {report.ticks:,} ticks in {report.elapsed:.1f}s "
+        f"({report.seeds * report.ticks / report.elapsed:,.0f} ticks/s)",
+        f"  final balance: mean {report.final_balance.mean:,.0f}; {percentiles(report.final_balance)}",
+        f"  reached ${report.target:,}: {report.target_rate:.1%}"
+    ]
+    if report.time_to_target.count:
+        lines.append(f"  ticks to target: mean {report.time_to_target.mean:,.0f}; "
+                     f"{percentiles(report.time_to_target)}")
+    lines.append(f"  bankrupt: {report.bankruptcy_rate:.1%}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare TextEmpire strategies over many simulated games")
+    parser.add_argument("strategies", nargs="*", default=list(STRATEGIES),
+                        help=f"strategies to compare (default: all of {', '.join(STRATEGIES)})")
+    parser.add_argument("--seeds", type=int, default=1000, help="games per strategy (default: 1000)")
+    parser.add_argument("--ticks", type=int, default=1000, help="ticks per game (default: 1000)")
+    parser.add_argument("--target", type=int, default=1_000_000,
+                        help="balance to measure time-to-target against (default: 1000000)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=0, help="first game seed (default: 0)")
+    args = parser.parse_args()
+
+    unknown = [strategy for strategy in args.strategies if strategy not in STRATEGIES]
+    if unknown:
+        parser.error(f"unknown strategies: {', '.join(unknown)}")
+    workers = args.workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as pool:
+        for strategy in args.strategies:
+            print(report_text(evaluate(strategy, args.seeds, args.ticks, args.target, workers,
+                                       base_seed=args.seed, executor=pool if workers > 1 else None)))
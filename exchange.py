@@ -0,0 +1,221 @@
+import heapq
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+from engine import InsufficientFunds, InvalidAmount, InvalidChoice, OrderNotFound
+
+if TYPE_CHECKING:
+    from game import Game
+
+SIDES: Tuple[str, ...] = ("buy", "sell")
+
+
+class LockOrderError(RuntimeError):
+    pass
+
+
+class BookOrder:
+    __slots__ = ("order_id", "game", "share", "side", "price", "amount", "remaining", "status")
+
+    def __init__(self, order_id: int, game: "Game", share: str, side: str, price: Optional[int],
+                 amount: int) -> None:
+        self.order_id: int = order_id
+        self.game: "Game" = game
+        self.share: str = share
+        self.side: str = side
+        self.price: Optional[int] = price
+        self.amount: int = amount
+        self.remaining: int = amount
+        self.status: str = "queued"
+
+    def __repr__(self) -> str:
+        return (f"BookOrder({self.order_id}, {self.side!r}, {self.share!r}, {self.remaining}/{self.amount} "
+                f"@ {self.price}, {self.status!r})")
+
+
+@dataclass(frozen=True)
+class Fill:
+    share: str
+    price: int
+    amount: int
+    buy_order_id: int
+    sell_order_id: int
+
+
+class OrderBook:
+    def __init__(self, share: str) -> None:
+        self.share: str = share
+        self.bids: List[Tuple[int, int, BookOrder]] = []
+        self.asks: List[Tuple[int, int, BookOrder]] = []
+        self.dead: int = 0
+
+    def add(self, order: BookOrder) -> None:
+        order.status = "open"
+        if order.side == "buy":
+            heapq.heappush(self.bids, (-order.price, order.order_id, order))
+        else:
+            heapq.heappush(self.asks, (order.price, order.order_id, order))
+
+    def best(self, side: str) -> Optional[BookOrder]:
+        heap = self.bids if side == "buy" else self.asks
+        while heap and heap[0][2].status != "open":
+            heapq.heappop(heap)
+            self.dead -= 1
+        return heap[0][2] if heap else None
+
+    def pop(self, side: str) -> None:
+        heapq.heappop(self.bids if side == "buy" else self.asks)
+
+    def discard(self) -> None:
+        self.dead += 1
+        if self.dead > 64 and self.dead * 2 > len(self.bids) + len(self.asks):
+            self.bids = [entry for entry in self.bids if entry[2].status == "open"]
+            self.asks = [entry for entry in self.asks if entry[2].status == "open"]
+            heapq.heapify(self.bids)
+            heapq.heapify(self.asks)
+            self.dead = 0
+
+    def depth(self) -> Tuple[int, int]:
+        return len(self.bids), len(self.asks)
+
+
+def _check_lock_order(game: "Game") -> None:
+    if game.in_transaction():
+        raise LockOrderError("The exchange lock must be taken before a game transaction, not inside one.")
+
+
+def _journal(game: "Game", share: str, amount: int, cash: int) -> None:
+    if game.journal is not None:
+        game.journal.trade(share, amount, cash)
+
+
+class Exchange:
+    def __init__(self, keys: Sequence[str]) -> None:
+        self.books: Dict[str, OrderBook] = {key: OrderBook(key) for key in keys}
+        self.orders: Dict[int, BookOrder] = {}
+        self.by_game: Dict[int, Dict[int, BookOrder]] = {}
+        self.incoming: List[BookOrder] = []
+        self.next_id: int = 1
+        self.lock: threading.RLock = threading.RLock()
+
+    def submit(self, game: "Game", share: str, side: str, amount: int, price: Optional[int] = None) -> BookOrder:
+        if share not in self.books:
+            raise InvalidChoice("Invalid share!")
+        if side not in SIDES:
+            raise InvalidChoice(f"Invalid order side '{side}'.")
+        if amount < 1 or (price is not None and price < 1):
+            raise InvalidAmount()
+
+        _check_lock_order(game)
+        with self.lock, game.transaction():
+            holding = game.shares[share]
+            if side == "buy" and price is not None:
+                if game.balance < price * amount:
+                    raise InsufficientFunds("Not enough money!")
+                game.balance -= price * amount
+                _journal(game, share, 0, -price * amount)
+            elif side == "sell":
+                if holding["amount"] < amount:
+                    raise InvalidAmount(f"You only own {holding['amount']} shares in {holding['name']}.")
+                holding["amount"] -= amount
+                _journal(game, share, -amount, 0)
+
+            order = BookOrder(self.next_id, game, share, side, price, amount)
+            self.next_id += 1
+            self.orders[order.order_id] = order
+            self.by_game.setdefault(id(game), {})[order.order_id] = order
+            self.incoming.append(order)
+            return order
+
+    def cancel(self, game: "Game", order_id: int) -> BookOrder:
+        _check_lock_order(game)
+        with self.lock:
+            order = self.by_game.get(id(game), {}).get(order_id)
+            if order is None:
+                raise OrderNotFound()
+            was_open = order.status == "open"
+            self._close(order, "cancelled")
+            if was_open:
+                self.books[order.share].discard()
+            return order
+
+    def cancel_all(self, game: "Game") -> int:
+        _check_lock_order(game)
+        with self.lock:
+            orders = list(self.by_game.get(id(game), {}).values())
+            for order in orders:
+                self.cancel(game, order.order_id)
+            return len(orders)
+
+    def open_orders(self, game: "Game") -> List[BookOrder]:
+        _check_lock_order(game)
+        with self.lock:
+            return list(self.by_game.get(id(game), {}).values())
+
+    def _close(self, order: BookOrder, status: str) -> None:
+        if status == "cancelled" and order.remaining:
+            with order.game.transaction():
+                if order.side == "buy" and order.price is not None:
+                    order.game.balance += order.price * order.remaining
+                    _journal(order.game, order.share, 0, order.price * order.remaining)
+                elif order.side == "sell":
+                    order.game.shares[order.share]["amount"] += order.remaining
+                    _journal(order.game, order.share, order.remaining, 0)
+        order.status = status
+        del self.orders[order.order_id]
+        owned = self.by_game[id(order.game)]
+        del owned[order.order_id]
+        if not owned:
+            del self.by_game[id(order.game)]
+
+    def match(self) -> List[Fill]:
+        fills: List[Fill] = []
+        with self.lock:
+            incoming, self.incoming = self.incoming, []
+            for order in incoming:
+                if order.status == "queued":
+                    self._cross(order, fills)
+        return fills
+
+    def _cross(self, order: BookOrder, fills: List[Fill]) -> None:
+        book = self.books[order.share]
+        resting_side = "sell" if order.side == "buy" else "buy"
+        while order.remaining:
+            resting = book.best(resting_side)
+            if resting is None:
+                break
+            if order.price is not None and (resting.price > order.price if order.side == "buy"
+                                            else resting.price < order.price):
+                break
+
+            quantity = min(order.remaining, resting.remaining)
+            buy, sell = (order, resting) if order.side == "buy" else (resting, order)
+            with buy.game.transaction(), sell.game.transaction():
+                cash = 0
+                if order.side == "buy" and order.price is None:
+                    quantity = min(quantity, int(buy.game.balance // resting.price))
+                    if quantity <= 0:
+                        break
+                    cash = -resting.price * quantity
+                elif buy.price != resting.price:
+                    cash = (buy.price - resting.price) * quantity
+
+                if cash:
+                    buy.game.balance += cash
+                buy.game.shares[order.share]["amount"] += quantity
+                sell.game.balance += resting.price * quantity
+                _journal(buy.game, order.share, quantity, cash)
+                _journal(sell.game, order.share, 0, resting.price * quantity)
+            order.remaining -= quantity
+            resting.remaining -= quantity
+            fills.append(Fill(order.share, resting.price, quantity, buy.order_id, sell.order_id))
+            if not resting.remaining:
+                book.pop(resting_side)
+                self._close(resting, "filled")
+
+        if not order.remaining:
+            self._close(order, "filled")
+        elif order.price is None:
+            self._close(order, "cancelled")
+        else:
+            book.add(order)
@@ -1,13 +1,53 @@
-import threading
+import sys
 import time
 import random
-from typing import Dict, List, Union
+import threading
+import uuid
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple, Union
+from engine import EmpireSnapshot, EngineError, GameEngine, LoanOutstanding
+from accrual import DIVIDEND_TICK, TICK_SECONDS, LazyAccrual
+from scheduler import Timer, get_scheduler
+from persistence import GameInfoStore, get_store
+from savestore import get_save_store
+from snapshot import SnapshotError
+from stations import StationRegistry
+from market import MarketStream, SharedMarket
+from history import PriceHistory, ShareIndicators
+from archive import PriceArchive
+from exchange import Exchange
+from leaderboard import Leaderboard, get_leaderboard
+from achievements import ACHIEVEMENTS, AchievementTracker, redeemable_slots
+from catalogs import LOAN_TYPES, SEPARATOR, SHARE_INDEX, STATION_COSTS, VEHICLE_COSTS, Catalog
+from portfolio import Portfolio
+from journal import Journal
+from metrics import Metrics, get_metrics
+from render import PAGE_SIZE, ViewCache, filter_stations, paginate, parse_station_filter, station_page, \
+    station_page_text, write_chunked
 
 class Game:
-    def __init__(self) -> None:
+    __slots__ = (
+        "balance", "taxis", "buses", "trains", "cf_loans", "cs_loans", "gl_loans",
+        "special_loan_amount", "add_dividend_interval", "seed", "rng", "tools", "saveload", "engine",
+        "accrual", "tick_seconds", "tick_timer", "info_store", "high_score", "leaderboard", "separator",
+        "stations", "redeemable", "empire_info", "loan_types", "vehicle_costs", "station_costs", "shares",
+        "market", "shared_market", "history", "archive", "exchange", "achievements", "journal",
+        "lock", "version", "depth", "views", "empire_id", "published_score", "owner"
+    )
+
+    def __init__(self, lazy_accrual: bool = False, tick_seconds: float = TICK_SECONDS,
+                 seed: Optional[int] = None, info_store: Optional[GameInfoStore] = None,
+                 leaderboard: Optional[Leaderboard] = None) -> None:
         from tools import Tools
         from saveload import SaveLoad
 
+        object.__setattr__(self, "achievements", None)
+        object.__setattr__(self, "leaderboard", None)
+        object.__setattr__(self, "published_score", None)
+        self.lock: threading.RLock = threading.RLock()
+        self.version: int = 0
+        self.depth: int = 0
+        self.owner: Optional[int] = None
+        self.views: ViewCache = ViewCache()
         self.balance: int = 250
         self.taxis: int = 0
         self.buses: int = 0
@@ -16,214 +56,141 @@ class Game:
         self.cs_loans: int = 0
         self.gl_loans: int = 0
         self.special_loan_amount: int = 0
-        self.taxi_stations: int = 0
-        self.bus_stations: int = 0
-        self.train_stations: int = 0
         self.add_dividend_interval: int = 0
-        self.tools: Tools = Tools()
+        self.seed: Optional[int] = seed
+        self.rng: random.Random = random.Random(seed)
+        self.tools: Tools = Tools(self.rng)
         self.saveload: SaveLoad = SaveLoad()
         self.saveload.game = self
-        self.separator: str = '-' * 30
-        self.stations: List[str] = []
-        self.redeemable: List[bool] = [True] * 5
-
+        self.engine: GameEngine = GameEngine(self)
+        self.accrual: Optional[LazyAccrual] = LazyAccrual(tick_seconds) if lazy_accrual else None
+        self.tick_seconds: float = tick_seconds
+        self.tick_timer: Optional[Timer] = None
+        self.info_store: GameInfoStore = get_store() if info_store is None else info_store
+        self.high_score: int = self.info_store.high_score
+        self.leaderboard: Leaderboard = get_leaderboard() if leaderboard is None else leaderboard
+        self.separator: str = SEPARATOR
+        self.stations: StationRegistry = StationRegistry()
+        self.redeemable: List[bool] = [True] * redeemable_slots(ACHIEVEMENTS)
+
+        self.empire_id: str = uuid.uuid4().hex
         self.empire_info: Dict[str, str] = {
             "name": self.tools.generate_empire(),
             "monarch": self.tools.generate_name()
         }
-        self.loan_types: Dict[str, Dict[str, Union[int, str]]] = {
-            "a": {
-                "amount": 500,
-                "flag": "cf_loans",
-                "message": "Community Fund"
-            },
-            "b": {
-                "amount": 1000,
-                "flag": "cs_loans",
-                "message": "City Support"
-            },
-            "c": {
-                "amount": 2500,
-                "flag": "gl_loans",
-                "message": "Grand Loan"
-            }
-        }
-
-        self.vehicle_costs: Dict[str, Dict[str, Union[int, str]]] = {
-            "a": {
-                "cost": 100,
-                "station": "bus_stations",
-                "type": "Bus"
-            },
-            "b": {
-                "cost": 40,
-                "station": "taxi_stations",
-                "type": "Taxi"
-            },
-            "c": {
-                "cost": 200,
-                "station": "train_stations",
-                "type": "Train"
-            }
-        }
-
-        self.station_costs: Dict[str, Dict[str, Union[int, str]]] = {
-            "a": {
-                "cost": 10,
-                "type": "Taxi"
-            },
-            "b": {
-                "cost": 25,
-                "type": "Bus"
-            },
-            "c": {
-                "cost": 50,
-                "type": "Train"
-            }
-        }
-
-        self.shares: Dict[str, Dict[str, int]] = {
-            "a": {
-                "name": "Horizon Industries",
-                "price": 0,
-                "value": 0,
-                "dividend_yield": 0,
-                "amount": 0
-            },
-            "b": {
-                "name": "Summit Securities",
-                "price": 0,
-                "value": 0,
-                "dividend_yield": 0,
-                "amount": 0
-            },
-            "c": {
-                "name": "Crestline Holdings",
-                "price": 0,
-                "value": 0,
-                "dividend_yield": 0,
-                "amount": 0
-            },
-            "d": {
-                "name": "Cascade Ventures",
-                "price": 0,
-                "value": 0,
-                "dividend_yield": 0,
-                "amount": 0
-            },
-            "e": {
-                "name": "Panorama Industries",
-                "price": 0,
-                "value": 0,
-                "dividend_yield": 0,
-                "amount": 0
-            },
-            "f": {
-                "name": "Vanguard Corporation",
-                "price": 0,
-                "value": 0,
-                "dividend_yield": 0,
-                "amount": 0
-            },
-            "g": {
-                "name": "Apex Dynamics",
-                "price": 0,
-                "value": 0,
-                "dividend_yield": 0,
-                "amount": 0
-            },
-            "h": {   
-                "name": "Zenith Ventures",
-                "price": 0,
-                "value": 0,
-                "dividend_yield": 0,
-                "amount": 0
-            },
-            "i": {   
-                "name": "Crestview Holdings",
-                "price": 0,
-                "value": 0,
-                "dividend_yield": 0,
-                "amount": 0
-            },
-            "j": {   
-                "name": "Brick Corporation",
-                "price": 0,
-                "value": 0,
-                "dividend_yield": 0,
-                "amount": 0
-            }
-        }
-
-    def make_payment(self, price: int, number_needed: int, vehicle_type: str) -> None:
-        if self.balance >= price:
-            self.balance -= price
-            setattr(self, vehicle_type + 's', getattr(self, vehicle_type + 's') + number_needed)
-        else:
-            print("You do not have enough money!")
+        self.loan_types: Catalog = LOAN_TYPES
+        self.vehicle_costs: Catalog = VEHICLE_COSTS
+        self.station_costs: Catalog = STATION_COSTS
+        self.shares: Portfolio = Portfolio()
+        self.market: MarketStream = MarketStream(self.rng.getrandbits(64), len(self.shares))
+        self.shared_market: Optional[SharedMarket] = None
+        self.history: Optional[PriceHistory] = None
+        self.archive: Optional[PriceArchive] = None
+        self.exchange: Optional[Exchange] = None
+        self.journal: Optional[Journal] = None
+        self.achievements: AchievementTracker = AchievementTracker()
+        self.achievements.evaluate(self)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        object.__setattr__(self, name, value)
+        if name == "balance" and not self.depth:
+            self.publish_score()
+        achievements = self.achievements
+        if achievements is not None and name in achievements.by_field:
+            achievements.field_changed(self, name)
+
+    def transaction(self) -> "Game":
+        return self
+
+    def __enter__(self) -> "Game":
+        self.lock.acquire()
+        depth = self.depth
+        if not depth:
+            object.__setattr__(self, "version", self.version + 1)
+            object.__setattr__(self, "owner", threading.get_ident())
+        object.__setattr__(self, "depth", depth + 1)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        depth = self.depth - 1
+        if not depth:
+            object.__setattr__(self, "version", self.version + 1)
+            self.publish_score()
+            object.__setattr__(self, "owner", None)
+        object.__setattr__(self, "depth", depth)
+        self.lock.release()
+
+    def in_transaction(self) -> bool:
+        return self.owner == threading.get_ident()
+
+    def snapshot(self) -> EmpireSnapshot:
+        if self.in_transaction():
+            return self.read_snapshot(self.version)
+        while True:
+            version = self.version
+            if not version & 1:
+                snapshot = self.read_snapshot(version)
+                if self.version == version:
+                    return snapshot
+            time.sleep(0)
+
+    def read_snapshot(self, version: int) -> EmpireSnapshot:
+        prices, values, yields = self.quotes()
+        return EmpireSnapshot(
+            version, self.empire_info["name"], self.empire_info["monarch"], self.balance,
+            self.taxis, self.buses, self.trains, self.cf_loans, self.cs_loans, self.gl_loans,
+            self.special_loan_amount, self.taxi_stations, self.bus_stations, self.train_stations,
+            tuple(self.shares.amount), tuple(prices), tuple(values), tuple(yields)
+        )
+
+    def view_key(self, *parts: Hashable) -> Optional[Tuple[Hashable, ...]]:
+        version = self.version
+        return None if version & 1 else (version, *parts)
+
+    @property
+    def taxi_stations(self) -> int:
+        return self.stations.count("Taxi")
+
+    @property
+    def bus_stations(self) -> int:
+        return self.stations.count("Bus")
+
+    @property
+    def train_stations(self) -> int:
+        return self.stations.count("Train")
+
+    def empire_info_text(self) -> str:
+        self.settle()
+        return self.views.render("empire_info", self.view_key(self.stations.version), self.render_empire_info)
+
+    def render_empire_info(self) -> str:
+        snapshot = self.snapshot()
+        return f"""Empire Name: {snapshot.name}
+Empire Monarch: {snapshot.monarch}
+Empire Treasury: {snapshot.balance}
+Taxis: {snapshot.taxis}
+Buses: {snapshot.buses}
+Trains: {snapshot.trains}
+Taxi Stations: {snapshot.taxi_stations}
+Bus Stations: {snapshot.bus_stations}
+Train Stations: {snapshot.train_stations}"""
 
     def show_empire_info(self) -> None:
-        print(f"""Empire Name: {self.empire_info['name']}
-Empire Monarch: {self.empire_info['monarch']}
-Empire Treasury: {self.balance}
-Taxis: {self.taxis}
-Buses: {self.buses}
-Trains: {self.trains}
-Taxi Stations: {self.taxi_stations}
-Bus Stations: {self.bus_stations}
-Train Stations: {self.train_stations}""")
+        print(self.empire_info_text())
 
     def edit_empire(self) -> None:
         new_empire_name: str = input("Enter your new empire name (leave blank to skip): ")
         new_empire_monarch: str = input("Enter your new monarch name (leave blank to skip): ")
-        if new_empire_name:
-            self.empire_info["name"] = new_empire_name
-        if new_empire_monarch:
-            self.empire_info["monarch"] = new_empire_monarch
+        self.engine.edit_empire(new_empire_name, new_empire_monarch)
 
     def buy_vehicle(self, vehicle_type: str, number_needed: int) -> None:
-        if number_needed < 1:
-            print("Negative numbers and zero are not allowed.")
-            return
-
-        vehicle_type = vehicle_type.strip().lower()
-
-        vehicle_mapping = {
-            "bus": "a",
-            "taxi": "b",
-            "train": "c"
-        }
-
-        key = vehicle_mapping.get(vehicle_type)
-
-        if not key:
-            print("Invalid vehicle type! Please choose from 'bus', 'taxi', or 'train'.")
-            return
-
-        cost_info = self.vehicle_costs.get(key)
-        if not cost_info:
-            print("Error retrieving vehicle cost information.")
-            return
-
-        station_name = cost_info["station"]
-        if getattr(self, station_name) <= 0:
-            print(f"No {cost_info['type']} station available.")
-            return
-
-        price = cost_info["cost"] * number_needed
-        if self.balance < price:
-            print("You do not have enough money!")
+        try:
+            purchase = self.engine.buy_vehicle(vehicle_type, number_needed)
+        except EngineError as e:
+            print(e)
             return
 
-        vehicle_attr = vehicle_type + "s"
-        if not hasattr(self, vehicle_attr):
-            vehicle_attr = vehicle_type + "es"
-
-        current_count = getattr(self, vehicle_attr)
-        setattr(self, vehicle_attr, current_count + number_needed)
-        self.balance -= price
-
-        print(f"Successfully bought {number_needed} {vehicle_type}(s).")
+        print(f"Successfully bought {purchase.amount} {purchase.vehicle_type}(s).")
 
     def handle_loan(self, loan_type: str, action: int) -> None:
         if loan_type == "d":
@@ -234,162 +201,195 @@ Train Stations: {self.train_stations}""")
             print("Invalid loan type!")
     
     def handle_special_loan(self, action: int) -> None:
-        if action != 0:
-            if self.balance >= self.special_loan_amount:
-                self.special_loan_amount = 0
-            else:
-                print("Not enough money!")
-        elif self.special_loan_amount == 0:
+        try:
+            if action != 0:
+                self.engine.pay_special_loan()
+                print("Loan paid off successfully.")
+                return
+            if self.special_loan_amount != 0:
+                raise LoanOutstanding()
+
             print("The bank has been making low profits these weeks. They are interested in your offer.")
             try:
-                self.special_loan_amount = int(input("Name a price: "))
-                if self.special_loan_amount < 1:
-                    print("Negative numbers and zero are not allowed.")
-                    return
-                if self.balance < self.special_loan_amount / 100:
-                    print("")
+                amount = int(input("Name a price: "))
             except ValueError:
                 print("Invalid number.")
                 return
-            
-            if random.randint(0, 1):
-                print(f"The bank is interested in your offer. It has been accepted. You have received a loan of ${self.special_loan_amount}.")
-            else:
-                print("The bank is not available. Your offer has been declined.")
+
+            result = self.engine.request_special_loan(amount)
+        except EngineError as e:
+            print(e)
+            return
+
+        if result.accepted:
+            print(f"The bank is interested in your offer. It has been accepted. You have received a loan of ${result.amount}.")
         else:
-            print("You already have a customized loan with the bank. You can request a new one once you pay the customized loan back.")
+            print("The bank is not available. Your offer has been declined.")
 
     def handle_standard_loan(self, loan_type: str, action: int) -> None:
-        loan_info = self.loan_types[loan_type]
-        if getattr(self, loan_info["flag"]) == action:
-            amount = loan_info["amount"]
+        try:
             if action == 0:
-                self.balance += amount
+                self.engine.take_loan(loan_type)
                 print("Loan received successfully.")
             else:
-                if self.balance >= amount:
-                    self.balance -= amount
-                    print("Loan paid off successfully.")
-                else:
-                    print("Not enough money!")
-            setattr(self, loan_info["flag"], action ^ 1)
-        else:
-            print("Loan already processed.")
+                self.engine.pay_loan(loan_type)
+                print("Loan paid off successfully.")
+        except EngineError as e:
+            print(e)
     
     def purchase_shares(self, alphic_shares_choice: str) -> None:
+        if alphic_shares_choice not in self.shares:
+            print("Invalid share!")
+            return
+
+        self.settle()
         share: str = self.shares[alphic_shares_choice]["name"]
-        price_per_share: int = self.shares[alphic_shares_choice]["price"]
+        price_per_share: int = self.share_price(alphic_shares_choice)
 
         print(f"""The price of one share in {share} is ${price_per_share}
 Enter the amount of shares you want to buy. To calculate the price, type in "calculator".""")
         
         shares_choice: str = input().strip().lower()
-        if shares_choice == "calculator":
-            try:
-                shares_to_calculate = int(input("Enter the amount of shares you want to calculate the price of: "))
-            except ValueError:
-                print("Invalid number.")
-                return
-
-            if shares_to_calculate < 1:
-                print("Negative numbers and zero are not allowed.")
-                return
-
-            cost_of_shares: int = shares_to_calculate * price_per_share
-            print(f"The price of {shares_to_calculate} shares in {share} is ${cost_of_shares}.")
+        calculator: bool = shares_choice == "calculator"
+        if calculator:
+            shares_choice = input("Enter the amount of shares you want to calculate the price of: ")
 
-        else:
-            try:
-                cost_of_shares: int = int(shares_choice) * price_per_share
-            except ValueError:
-                print("Invalid number.")
-                return
-            
-            if self.balance < cost_of_shares:
-                print("Not enough money!")
-                return
-            
-            self.balance -= cost_of_shares
-            self.shares[alphic_shares_choice]["amount"] += int(shares_choice)
+        try:
+            amount = int(shares_choice)
+        except ValueError:
+            print("Invalid number.")
+            return
 
-            print(f"Sucessfully bought {shares_choice} shares in {share}.")
+        try:
+            if calculator:
+                quote = self.engine.quote_shares(alphic_shares_choice, amount)
+                print(f"The price of {quote.amount} shares in {quote.name} is ${quote.total}.")
+            else:
+                trade = self.engine.purchase_shares(alphic_shares_choice, amount)
+                print(f"Sucessfully bought {trade.amount} shares in {trade.name}.")
+        except EngineError as e:
+            print(e)
     
     def sell_shares(self, alphic_shares_choice: str) -> None:
+        if alphic_shares_choice not in self.shares:
+            print("Invalid share!")
+            return
+
         share: str = self.shares[alphic_shares_choice]["name"]
-        if self.shares[alphic_shares_choice]["amount"] == "0":
+        if self.shares[alphic_shares_choice]["amount"] <= 0:
             print(f"You do not own any shares in {share}.")
             return
-        shares_to_sell = input("Enter the amount of shares you want to sell: ")
-        self.balance += self.shares[alphic_shares_choice]["value"] * shares_to_sell
+
+        try:
+            shares_to_sell = int(input("Enter the amount of shares you want to sell: "))
+            trade = self.engine.sell_shares(alphic_shares_choice, shares_to_sell)
+        except ValueError:
+            print("Invalid number.")
+            return
+        except EngineError as e:
+            print(e)
+            return
+
+        print(f"Sucessfully sold {trade.amount} shares in {trade.name} for ${trade.total}.")
     
-    def view_share_market(self) -> None:
-        print(f"""{self.separator}
+    def share_market_text(self) -> str:
+        self.settle()
+        market_tick = None if self.shared_market is None else self.shared_market.snapshot.tick
+        return self.views.render("share_market", self.view_key(market_tick), self.render_share_market)
+
+    def render_share_market(self) -> str:
+        snapshot = self.snapshot()
+        lines: List[str] = [f"""{self.separator}
 Share Market
-{self.separator}""")
-        for share in self.shares:
+{self.separator}"""]
+        for column, share in enumerate(self.shares):
             share_name: str = self.shares[share]["name"]
-            print(f"""Price of one share in {share_name}: ${self.shares[share]['price']}
-Value of one share in {share_name}: ${self.shares[share]['value']}
-Dividend yield of {share_name}: {self.shares[share]["dividend_yield"] * 100}%
-{self.separator}""")
+            lines.append(f"""Price of one share in {share_name}: ${snapshot.share_prices[column]}
+Value of one share in {share_name}: ${snapshot.share_values[column]}
+Dividend yield of {share_name}: {snapshot.share_yields[column] * 100}%""")
+            indicators = self.share_indicators(share)
+            if indicators is not None:
+                lines.append(f"""Last {indicators.samples} ticks: average ${indicators.average:.2f}, EMA ${indicators.ema:.2f}, \
+low ${indicators.low}, high ${indicators.high}, volatility {indicators.volatility:.2f}""")
+            lines.append(self.separator)
+        return "\n".join(lines)
+
+    def view_share_market(self) -> None:
+        print(self.share_market_text())
     
     def print_share_choices(self) -> None:
         for share in self.shares:
             print(f"{share}) {self.shares[share]['name']}")
         
     def create_station(self, station_type: str) -> None:
-        if station_type in self.station_costs:
-            cost_info = self.station_costs[station_type]
-            if self.balance > cost_info["cost"] - 1:
-                self.balance -= cost_info["cost"]
-                self.check_station_exists()
-                self.stations.append(self.station_name + f" {cost_info['type']} Station")
-                print(f"{cost_info['type']} station created successfully!")
-                setattr(self, cost_info["type"].lower() + "_stations", getattr(self, cost_info["type"].lower() + "_stations") + 1)
-            else:
-                print("Not enough money!")
-        else:
-            print("Invalid station type!")
+        try:
+            station = self.engine.create_station(station_type)
+        except EngineError as e:
+            print(e)
+            return
+
+        print(f"{station.station_type} station created successfully!")
 
-    def check_station_exists(self) -> None:
-        station_name: str = self.tools.generate_place()
-        extra_station_name: int = 1
-        while station_name in self.stations:
-            station_name = f"{station_name} {extra_station_name}"
-            extra_station_name += 1
-        self.station_name = station_name
+    def stations_text(self, page: int = 1, station_type: Optional[str] = None, prefix: str = "") -> str:
+        return self.views.render("stations", (self.stations.version, page, station_type, prefix),
+                                 lambda: station_page_text(station_page(self.stations, page, PAGE_SIZE,
+                                                                        station_type, prefix)))
 
-    def print_all_stations(self) -> None:
+    def print_all_stations(self, station_type: Optional[str] = None, prefix: str = "") -> None:
+        names = filter_stations(self.stations, station_type, prefix)
+        if not sys.stdout.isatty():
+            write_chunked(["Stations:", *names])
+            return
         print("Stations:")
-        for station in self.stations:
-            print(station)
+        for index, page in enumerate(paginate(names, PAGE_SIZE)):
+            if index and input("Press Enter for more, or type q to stop: ").strip().lower() == "q":
+                break
+            write_chunked(page)
 
     def rename_station(self) -> None:
         self.print_all_stations()
         old_name: str = input("Enter the name of the station you want to rename: ")
-        if old_name in self.stations:
-            new_name: str = input("Enter the new name for the station: ")
-            if new_name:
-                index: int = self.stations.index(old_name)
-                self.stations[index] = new_name
-                print(f"Station renamed from '{old_name}' to '{new_name}'.")
-            else:
-                print("New name cannot be empty.")
-        else:
+        if old_name not in self.stations:
             print("Station not found.")
+            return
+
+        new_name: str = input("Enter the new name for the station: ")
+        try:
+            renamed = self.engine.rename_station(old_name, new_name)
+        except EngineError as e:
+            print(e)
+            return
+
+        print(f"Station renamed from '{renamed.old_name}' to '{renamed.new_name}'.")
 
     def load_game_from_file(self) -> None:
-        if len(self.game_info) < 2:
+        if not self.info_store.has_saved_game():
             print("Error finding saved game.")
         else:
-            if self.saveload.load_variables(self.game_info[1]):
+            if self.saveload.load_variables(self.info_store.saved_key):
                 print("Game loaded successfully.")
                 self.start_game_loop()
-    
-    def get_game_info(self) -> None:
-        with open("game_info.txt", "r") as file:
-            self.game_info = file.readlines()
             
+    def load_game_from_store(self) -> None:
+        store = get_save_store()
+        saves = store.list_saves(limit=10)
+        if not saves:
+            print("Error finding saved game.")
+            return
+
+        for save in saves:
+            saved_at = time.strftime("%Y-%m-%d %H:%M", time.localtime(save.saved_at))
+            print(f"{save.save_id}) {save.empire_name} - {save.monarch} - ${save.balance:.0f} ({saved_at})")
+        try:
+            save_id = int(input("Enter the save number: "))
+        except ValueError:
+            print("Invalid number.")
+            return
+
+        if self.saveload.load_from_store(store, save_id):
+            print("Game loaded successfully.")
+            self.start_game_loop()
+
     def start_game(self) -> None:
         print("""Welcome to TextEmpire - A text-adventure transport tycoon game.
 Main Menu:
@@ -405,16 +405,12 @@ d) Exit""")
                 self.display_tutorial()
             elif choice == "b":
                 print("New game created.")
-                with open("game_info.txt", 'a+') as file:
-                    file.seek(0)
-                    self.game_info = file.read()
-                    if not self.game_info:
-                        file.write("\n")
                 self.start_game_loop()
             elif choice == "c":
                 print("""How do you want to load your game?
 a) Game key
-b) Saved key in file""")
+b) Saved key in file
+c) Saved games database""")
                 load_choice = input().strip().lower()
                 if load_choice == "a":
                     key: str = input("Enter your game key: ").strip()
@@ -424,11 +420,9 @@ b) Saved key in file""")
                     else:
                         print("Failed to load game. Please check your key and try again.")
                 elif load_choice == "b":
-                    try:
-                        self.load_game_from_file()
-                    except AttributeError:
-                        self.get_game_info()
-                        self.load_game_from_file()
+                    self.load_game_from_file()
+                elif load_choice == "c":
+                    self.load_game_from_store()
             elif choice == "d":
                 print("Exiting game...")
                 break
@@ -455,17 +449,44 @@ Get loans if needed.
 /sellshares - Sell your shares
 /sharemarket - View the share market
 /createstation - Create a new station
-/stations - View all stations
+/stations - View all stations, filtered by type or name and a page at a time
 /renamestation - Rename a station
 /achievements - View achievements and rewards
+/leaderboard - View the top empires and your rank
 /redeem - Redeem a passkey
+/stats - View tick and command timings
 /exit - Exit game or main menu
 [WARNINGS]
 Do not modify game_info.txt as it may corrupt game data.
 {self.separator}""")
         
+    def start_session(self) -> None:
+        self.end_session()
+        if self.accrual is None:
+            self.tick_timer = get_scheduler().schedule_every(self.tick_seconds, self.scheduled_tick)
+        else:
+            self.accrual.start(self)
+
+    def restart(self) -> None:
+        shared_market, exchange, archive, journal = self.shared_market, self.exchange, self.archive, self.journal
+        if exchange is not None:
+            exchange.cancel_all(self)
+        seed = None if self.seed is None else self.rng.getrandbits(64)
+        self.__init__(self.accrual is not None, self.tick_seconds, seed, self.info_store, self.leaderboard)
+        self.shared_market = shared_market
+        self.exchange = exchange
+        self.archive = archive
+        if journal is not None:
+            self.journal = journal
+            journal.checkpoint(self.saveload.state())
+
+    def end_session(self) -> None:
+        if self.tick_timer is not None:
+            get_scheduler().cancel(self.tick_timer)
+            self.tick_timer = None
+
     def start_game_loop(self) -> None:
-        threading.Thread(target=self.update_game, daemon=True).start()
+        self.start_session()
 
         while True:
             command: str = input("Command: ").strip().lower()
@@ -475,17 +496,12 @@ Do not modify game_info.txt as it may corrupt game data.
             elif command == "/editempire":
                 self.edit_empire()
             elif command == "/savegame":
-                try:
-                    with open("game_info.txt", "r") as file:
-                        self.game_info = file.readlines()
-                        if len(self.game_info) < 2:
-                            any_saved_game: bool = False
-                except FileNotFoundError:
-                    any_saved_game: bool = False
+                any_saved_game: bool = self.info_store.has_saved_game()
 
                 print("""How do you want to save your game?
 a) Get game key
-b) Save game in file""")
+b) Save game in file
+c) Save game in database""")
                 save_choice: str = input().strip().lower()
 
                 if save_choice == "a":
@@ -504,6 +520,13 @@ b) No""")
                             print("Not a valid option.")
                     else:
                         self.write_game_key()
+                elif save_choice == "c":
+                    try:
+                        save_id = self.saveload.save_to_store(get_save_store())
+                    except SnapshotError as e:
+                        print(f"Error saving game: {e}")
+                    else:
+                        print(f"Game saved in database (save #{save_id}).")
                 else:
                     print("Not a valid option.")
             elif command == "/buyvehicle":
@@ -549,7 +572,11 @@ c) Train""")
                 new_station: str = input().strip().lower()
                 self.create_station(new_station)
             elif command == "/stations":
-                self.print_all_stations()
+                station_type, prefix = None, ""
+                if len(self.stations) > PAGE_SIZE:
+                    words = input("Filter by station type or name (leave blank for all): ").split()
+                    station_type, prefix, _ = parse_station_filter(words)
+                self.print_all_stations(station_type, prefix)
             elif command == "/renamestation":
                 self.rename_station()
             elif command == "/exit":
@@ -564,68 +591,55 @@ b) Exit game""")
                         print(f"Game Key: {self.saveload.generate_key()}. Save it securely.")
                 if exit_action == "a":
                     print("Returning to main menu...")
-                    self.__init__()
+                    self.end_session()
+                    self.restart()
                     self.start_game()
                 elif exit_action == "b":
                     print("Exiting game...")
+                    self.end_session()
                     break
                 else:
                     print("Invalid option.")
             elif command == "/achievements":
                 self.check_achievements()
+            elif command == "/leaderboard":
+                self.view_leaderboard()
             elif command == "/redeem":
                 self.redeem_passkey()
+            elif command == "/stats":
+                print(self.stats_text())
             elif not command:
                 continue
             else:
                 print("Unknown command.")
 
+    def achievements_text(self) -> str:
+        achievement = self.engine.check_achievement()
+        if achievement is None:
+            return "No achievements found."
+
+        if achievement.index == 1:
+            self.info_store.record_score(self.balance)
+        return f"Achievement: {achievement.title} Passkey: {achievement.passkey}"
+
     def check_achievements(self) -> None:
-        if self.balance > self.high_score and self.redeemable[1]:
-            with open("game_info.txt", "w") as file:
-                file.write(str(self.balance))
-            print("Achievement: Beaten high score! Passkey: t5m7pk8")
-        elif self.balance % 2500 == 0 and self.redeemable[2]:
-            print("Achievement: $2500 earned! Passkey: ut6gp9s")
-        elif self.gl_loans == 1 and self.redeemable[3]:
-            print("Achievement: First grand loan! Passkey: po31u5b")
-        elif self.buses + self.trains + self.taxis == 20 and self.redeemable[4]:
-            print("Achievement: 20 vehicles! Passkey: 5rop05b")
-        else:
-            print("No achievements found.")
+        print(self.achievements_text())
 
     def redeem_passkey(self) -> None:
         passkey = input("Enter passkey: ").strip()
-        rewards = {
-            "t5m7pk8": ("2 trains", lambda: setattr(self, 'trains', self.trains + 2)),
-            "ut6gp9s": ("$500", lambda: setattr(self, 'balance', self.balance + 500)),
-            "po31u5b": ("$250", lambda: setattr(self, 'balance', self.balance + 250)),
-            "5rop05b": ("10 buses", lambda: setattr(self, 'buses', self.buses + 10))
-        }
-        reward = rewards.get(passkey)
-        if reward:
-            print(f"Redeemed prize of {reward[0]}.")
-            reward[1]()
-            self.redeemable[list(rewards.keys()).index(passkey) + 1] = False
-        else:
-            print("Invalid passkey.")
-
-    def write_game_key(self) -> None:
         try:
-            with open("game_info.txt", "r") as file:
-                pass
-        except FileNotFoundError:
-            self.game_info = [''] * 2
-
-        if len(self.game_info) < 2:
-            self.game_info.extend([''] * (2 - len(self.game_info)))
+            reward = self.engine.redeem_passkey(passkey)
+        except EngineError as e:
+            print(e)
+            return
 
-        self.game_info[1] = self.saveload.generate_key() + '\n'
+        print(f"Redeemed prize of {reward.description}.")
 
-        with open("game_info.txt", 'w') as file:
-            file.writelines(self.game_info)
+    def write_game_key(self) -> None:
+        self.info_store.set_saved_key(self.saveload.generate_key())
+        self.info_store.flush()
     
-    def update_balance(self) -> None:
+    def balance_rate(self) -> int:
         balance_delta: int = (int(self.buses) * 10 * int(self.bus_stations) +
                                 int(self.taxis) * 5 * int(self.taxi_stations) +
                                 int(self.trains) * 25 * int(self.train_stations))
@@ -635,55 +649,165 @@ b) Exit game""")
         
         if self.special_loan_amount != 0:
             balance_delta -= self.special_loan_amount * 100
+        return balance_delta
+
+    def add_dividends(self, balance_delta: Union[int, float]) -> Union[int, float]:
+        for share in self.shares:
+            total_investment_value = self.shares[share]["amount"] * self.share_price(share)
+            balance_delta += total_investment_value * self.share_yield(share)
+        return balance_delta
+
+    def update_balance(self) -> None:
+        balance_delta: Union[int, float] = self.balance_rate()
 
         self.add_dividend_interval += 1
-        if self.add_dividend_interval == 100:
-            for share in self.shares:
-                total_investment_value = self.shares[share]["amount"] * self.shares[share]["price"]
-                balance_delta += total_investment_value * self.shares[share]["dividend_yield"]
+        if self.add_dividend_interval == DIVIDEND_TICK:
+            balance_delta = self.add_dividends(balance_delta)
         
         self.balance = int(self.balance)
         self.balance += balance_delta
 
+    def settle(self) -> None:
+        if self.accrual is not None:
+            with self.transaction():
+                self.accrual.settle(self)
+
+    @property
+    def leaderboard_name(self) -> str:
+        return f"{self.empire_info['name']} ({self.empire_info['monarch']})"
+
     def update_high_scores(self) -> None:
-        try:
-            self.get_game_info()
-
-            high_scores_str: str = self.game_info[0]
-            self.high_score = high_scores_str if high_scores_str else 0
-        except FileNotFoundError:
-            self.high_score = 0
-            with open("game_info.txt", "w") as file:
-                file.write("0\n")
-
-        if str(self.balance) > self.high_score:
-            self.high_score = self.balance
-            with open("game_info.txt", "w") as file:
-                file.write(str(self.high_score) + "\n")
+        self.high_score = self.info_store.high_score
+        self.info_store.record_score(self.balance)
+        self.publish_score()
+
+    def publish_score(self) -> None:
+        score = int(self.balance)
+        if score != self.published_score and self.leaderboard is not None:
+            object.__setattr__(self, "published_score", score)
+            self.leaderboard.update(self.empire_id, score, self.leaderboard_name)
+
+    def change_empire_id(self, empire_id: str) -> None:
+        if empire_id != self.empire_id:
+            self.leaderboard.remove(self.empire_id)
+            self.empire_id = empire_id
+        object.__setattr__(self, "published_score", None)
+
+    def leaderboard_text(self, count: int = 10) -> str:
+        self.settle()
+        lines: List[str] = [f"""{self.separator}
+Leaderboard
+{self.separator}"""]
+        lines.extend(f"{standing.rank}. {standing.empire} - ${standing.score}"
+                     for standing in self.engine.top_empires(count))
+        rank = self.engine.leaderboard_rank()
+        if rank is not None and rank > count:
+            lines.append("...")
+            lines.extend(f"{standing.rank}. {standing.empire} - ${standing.score}"
+                         for standing in self.engine.empires_around())
+        lines.append(self.separator)
+        return "\n".join(lines)
+
+    def view_leaderboard(self) -> None:
+        print(self.leaderboard_text())
     
     def update_share_values(self) -> None:
-        for share in self.shares:
-            self.shares[share]["value"] = random.randint(-500, 500)
+        self.shares.value[:] = self.market.advance()
 
     def update_share_prices(self) -> None:
-        for share in self.shares:
-            self.shares[share]["price"] = self.shares[share]["value"] + random.randint(-250, 250)
-            if self.shares[share]["price"] < 1:
-                self.shares[share]["price"] = random.randint(0, abs(self.shares[share]["price"]))
+        self.shares.price[:] = self.market.current_prices()
 
     def update_share_dividend_yield(self) -> None:
-        for share in self.shares:
-            self.shares[share]["dividend_yield"] = round(random.uniform(0, 0.05), 3)
-
-    def update_game(self) -> None:
-        while True:
-            self.update_share_values()
-            self.update_share_prices()
-            self.update_share_dividend_yield()
+        self.shares.dividend_yield[:] = self.market.current_yields()
+
+    def join_market(self, market: Optional[SharedMarket]) -> None:
+        self.shared_market = market
+
+    def share_price(self, share: str) -> int:
+        if self.shared_market is None:
+            return self.shares.price[SHARE_INDEX[share]]
+        return self.shared_market.snapshot.prices[self.shared_market.index[share]]
+
+    def share_value(self, share: str) -> int:
+        if self.shared_market is None:
+            return self.shares.value[SHARE_INDEX[share]]
+        return self.shared_market.snapshot.values[self.shared_market.index[share]]
+
+    def share_yield(self, share: str) -> float:
+        if self.shared_market is None:
+            return self.shares.dividend_yield[SHARE_INDEX[share]]
+        return self.shared_market.snapshot.yields[self.shared_market.index[share]]
+
+    def quotes(self) -> Tuple[Sequence[int], Sequence[int], Sequence[float]]:
+        if self.shared_market is None:
+            return self.shares.price, self.shares.value, self.shares.dividend_yield
+        snapshot = self.shared_market.snapshot
+        return snapshot.prices, snapshot.values, snapshot.yields
+
+    @property
+    def price_history(self) -> PriceHistory:
+        if self.shared_market is not None:
+            return self.shared_market.history
+        if self.history is None:
+            self.history = PriceHistory(self.shares)
+        return self.history
+
+    def share_indicators(self, share: str) -> Optional[ShareIndicators]:
+        return self.price_history.indicators(share)
+
+    def update_market(self) -> None:
+        if self.shared_market is not None:
+            return
+        self.update_share_values()
+        self.update_share_prices()
+        self.update_share_dividend_yield()
+        values, prices = self.market.current_values(), self.market.current_prices()
+        yields = self.market.current_yields()
+        self.price_history.record(values, prices, yields)
+        if self.archive is not None:
+            self.archive.append(values, prices, yields)
+
+    def journal_tick(self) -> None:
+        if self.journal is not None:
+            self.journal.tick(self.add_dividend_interval, self.balance, self.quotes())
+
+    def tick(self) -> None:
+        metrics = get_metrics()
+        if metrics is not None and metrics.sample_tick():
+            self.timed_tick(metrics)
+            return
+        with self.transaction():
+            self.update_market()
             self.update_balance()
-            self.update_high_scores()
-            
-            time.sleep(3)
+            self.journal_tick()
+        self.update_high_scores()
+
+    def timed_tick(self, metrics: Metrics) -> None:
+        started = time.perf_counter_ns()
+        with self.transaction():
+            self.update_market()
+            market = time.perf_counter_ns()
+            self.update_balance()
+            self.journal_tick()
+            balance = time.perf_counter_ns()
+        self.update_high_scores()
+        metrics.record_tick(started, market, balance, time.perf_counter_ns())
+
+    def scheduled_tick(self) -> None:
+        metrics = get_metrics()
+        if metrics is not None and self.tick_timer is not None and self.tick_seconds > 0:
+            metrics.record_drift(get_scheduler().now() - self.tick_timer.deadline + self.tick_timer.interval)
+        self.tick()
+
+    def stats_text(self) -> str:
+        metrics = get_metrics()
+        if metrics is None:
+            return "Stats are disabled. Start the game with --metrics to collect them."
+        return f"""{self.separator}
+Stats
+{self.separator}
+{metrics.stats_text()}
+{self.separator}"""
 
 if __name__ == "__main__":
     game = Game()
@@ -0,0 +1,99 @@
+import math
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+HISTORY_TICKS: int = 120
+EMA_SPAN: int = 20
+
+
+@dataclass(frozen=True)
+class ShareIndicators:
+    share: str
+    samples: int
+    price: int
+    value: int
+    dividend_yield: float
+    average: float
+    ema: float
+    low: int
+    high: int
+    volatility: float
+
+
+class PriceHistory:
+    def __init__(self, keys: Sequence[str], capacity: int = HISTORY_TICKS, ema_span: int = EMA_SPAN) -> None:
+        self.keys: Tuple[str, ...] = tuple(keys)
+        self.index: Dict[str, int] = {key: index for index, key in enumerate(self.keys)}
+        self.width: int = len(self.keys)
+        self.capacity: int = capacity
+        self.alpha: float = 2 / (ema_span + 1)
+        self.prices: array = array("q", bytes(8 * capacity * self.width))
+        self.values: array = array("q", bytes(8 * capacity * self.width))
+        self.yields: array = array("d", bytes(8 * capacity * self.width))
+        self.ticks: int = 0
+        self.sums: List[int] = [0] * self.width
+        self.squares: List[int] = [0] * self.width
+        self.emas: List[float] = [0.0] * self.width
+        self.lows: List[Deque[Tuple[int, int]]] = [deque() for _ in self.keys]
+        self.highs: List[Deque[Tuple[int, int]]] = [deque() for _ in self.keys]
+
+    def __len__(self) -> int:
+        return min(self.ticks, self.capacity)
+
+    def record(self, values: Sequence[int], prices: Sequence[int], yields: Sequence[float]) -> None:
+        tick = self.ticks
+        base = (tick % self.capacity) * self.width
+        full = tick >= self.capacity
+        expired = tick - self.capacity
+        alpha = self.alpha
+        history, sums, squares, emas = self.prices, self.sums, self.squares, self.emas
+
+        self.values[base:base + self.width] = array("q", values)
+        self.yields[base:base + self.width] = array("d", yields)
+        for column, price in enumerate(prices):
+            if full:
+                old = history[base + column]
+                sums[column] += price - old
+                squares[column] += price * price - old * old
+            else:
+                sums[column] += price
+                squares[column] += price * price
+            history[base + column] = price
+            emas[column] = emas[column] + alpha * (price - emas[column]) if tick else price
+
+            lows = self.lows[column]
+            while lows and lows[-1][1] >= price:
+                lows.pop()
+            lows.append((tick, price))
+            if lows[0][0] <= expired:
+                lows.popleft()
+
+            highs = self.highs[column]
+            while highs and highs[-1][1] <= price:
+                highs.pop()
+            highs.append((tick, price))
+            if highs[0][0] <= expired:
+                highs.popleft()
+
+        self.ticks = tick + 1
+
+    def indicators(self, share: str) -> Optional[ShareIndicators]:
+        samples = len(self)
+        if not samples:
+            return None
+        column = self.index[share]
+        slot = ((self.ticks - 1) % self.capacity) * self.width + column
+        average = self.sums[column] / samples
+        variance = max(0.0, self.squares[column] / samples - average * average)
+        return ShareIndicators(share, samples, self.prices[slot], self.values[slot], self.yields[slot],
+                               average, self.emas[column], self.lows[column][0][1],
+                               self.highs[column][0][1], math.sqrt(variance))
+
+    def series(self, share: str, field: str = "price", count: Optional[int] = None) -> List[float]:
+        column = self.index[share]
+        source = {"price": self.prices, "value": self.values, "dividend_yield": self.yields}[field]
+        samples = len(self) if count is None else min(count, len(self))
+        first = self.ticks - samples
+        return [source[(tick % self.capacity) * self.width + column] for tick in range(first, self.ticks)]
@@ -0,0 +1,340 @@
+import atexit
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from catalogs import SHARE_INDEX, SHARE_KEYS
+from scheduler import Timer, get_scheduler
+from snapshot import SnapshotError, decode_snapshot, encode_snapshot, station_types
+from stations import STATION_TYPES
+
+if TYPE_CHECKING:
+    from game import Game
+
+JOURNAL_PATH: str = "journal"
+FLUSH_INTERVAL: float = 1.0
+BATCH_EVENTS: int = 4096
+COMPACT_EVENTS: int = 1_000_000
+
+TICK, PURCHASE, LOAN, TRADE, STATION, RENAME, REWARD, QUOTES = range(8)
+EVENT_NAMES: Tuple[str, ...] = ("tick", "purchase", "loan", "trade", "station", "rename", "reward", "quotes")
+
+FIELDS: Tuple[str, ...] = (
+    "balance", "taxis", "buses", "trains", "cf_loans", "cs_loans", "gl_loans",
+    "special_loan_amount", "add_dividend_interval"
+)
+FIELD_INDEX: Dict[str, int] = {field: index for index, field in enumerate(FIELDS)}
+RENAME_TARGETS: Tuple[str, ...] = ("name", "monarch", "station")
+STATION_RENAME: int = RENAME_TARGETS.index("station")
+STATION_FIELDS: Tuple[str, ...] = ("taxi_stations", "bus_stations", "train_stations")
+
+JOURNAL_MAGIC: bytes = b"TEJB"
+SNAPSHOT_MAGIC: bytes = b"TEJS"
+EVENT = struct.Struct("<BBHIqd")
+BLOCK = struct.Struct("<4sIIId")
+SNAPSHOT_HEADER = struct.Struct("<4sI")
+
+Balance = Union[int, float]
+Quotes = Tuple[Sequence[int], Sequence[int], Sequence[float]]
+
+
+class JournalError(ValueError):
+    pass
+
+
+def segment_path(path: str, segment: int) -> str:
+    return f"{path}.{segment:08d}"
+
+
+def snapshot_path(path: str) -> str:
+    return path + ".snap"
+
+
+def list_segments(path: str) -> List[int]:
+    directory, prefix = os.path.split(os.path.abspath(path))
+    segments = []
+    for name in os.listdir(directory):
+        suffix = name[len(prefix) + 1:]
+        if name.startswith(prefix + ".") and len(suffix) == 8 and suffix.isdigit():
+            segments.append(int(suffix))
+    return sorted(segments)
+
+
+def read_blocks(data: bytes) -> Iterator[Tuple[memoryview, memoryview, float]]:
+    view = memoryview(data)
+    offset = 0
+    while offset + BLOCK.size <= len(view):
+        magic, count, text_size, checksum, written_at = BLOCK.unpack_from(view, offset)
+        start = offset + BLOCK.size
+        end = start + count * EVENT.size + text_size
+        if magic != JOURNAL_MAGIC or end > len(view) or zlib.crc32(view[start:end]) != checksum:
+            return
+        yield view[start:start + count * EVENT.size], view[start + count * EVENT.size:end], written_at
+        offset = end
+
+
+def replay_events(state: Dict[str, Any], records: memoryview, text: memoryview) -> int:
+    values: List[Balance] = [state[field] for field in FIELDS]
+    amounts = [state["shares"][key]["amount"] for key in SHARE_KEYS]
+    stations: List[str] = state["stations"]
+    types: List[str] = state.setdefault("station_types", station_types(state))
+    station_counts = [state[field] for field in STATION_FIELDS]
+    empire_info: Dict[str, str] = state["empire_info"]
+    redeemable: List[bool] = state["redeemable"]
+    interval = FIELD_INDEX["add_dividend_interval"]
+    station_index: Optional[Dict[str, int]] = None
+    quotes: Optional[Quotes] = None
+    offset = events = 0
+
+    for kind, code, flag, length, amount, cash in EVENT.iter_unpack(records):
+        events += 1
+        if kind == TICK:
+            values[0] = cash if flag else int(cash)
+            values[interval] = amount
+        elif kind == TRADE:
+            amounts[code] += amount
+            values[0] += int(cash)
+        elif kind == PURCHASE:
+            values[code] += amount
+            values[0] += int(cash)
+        elif kind == LOAN:
+            values[code] = amount
+            values[0] += int(cash)
+        elif kind == STATION:
+            name = bytes(text[offset:offset + length]).decode("utf-8")
+            offset += length
+            stations.append(name)
+            types.append(STATION_TYPES[code])
+            station_counts[code] += 1
+            values[0] += int(cash)
+            if station_index is not None:
+                station_index[name] = len(stations) - 1
+        elif kind == RENAME:
+            raw = bytes(text[offset:offset + length])
+            offset += length
+            if code == STATION_RENAME:
+                if station_index is None:
+                    station_index = {name: position for position, name in enumerate(stations)}
+                old_name, new_name = raw[:amount].decode("utf-8"), raw[amount:].decode("utf-8")
+                position = station_index.pop(old_name, None)
+                if position is not None:
+                    stations[position] = new_name
+                    station_index[new_name] = position
+            else:
+                empire_info[RENAME_TARGETS[code]] = raw.decode("utf-8")
+        elif kind == REWARD:
+            values[code] += amount
+            if flag < len(redeemable):
+                redeemable[flag] = False
+        elif kind == QUOTES:
+            unpacked = struct.unpack(f"<{code}q{code}q{code}d", text[offset:offset + length])
+            offset += length
+            quotes = (unpacked[:code], unpacked[code:2 * code], unpacked[2 * code:])
+        else:
+            raise JournalError(f"Unknown journal event {kind}.")
+
+    state.update(zip(FIELDS, values))
+    state.update(zip(STATION_FIELDS, station_counts))
+    for key, held in zip(SHARE_KEYS, amounts):
+        state["shares"][key]["amount"] = held
+    if quotes is not None:
+        for key, price, value, dividend_yield in zip(SHARE_KEYS, *quotes):
+            state["shares"][key].update(price=price, value=value, dividend_yield=dividend_yield)
+    return events
+
+
+def read_snapshot(path: str) -> Tuple[Optional[Dict[str, Any]], int]:
+    try:
+        with open(snapshot_path(path), "rb") as file:
+            data = file.read()
+    except FileNotFoundError:
+        return None, 0
+    if len(data) < SNAPSHOT_HEADER.size:
+        raise JournalError("Journal snapshot is truncated.")
+    magic, segment = SNAPSHOT_HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise JournalError("Not a journal snapshot.")
+    try:
+        return decode_snapshot(data[SNAPSHOT_HEADER.size:]), segment
+    except SnapshotError as e:
+        raise JournalError(f"Journal snapshot is damaged: {e}") from e
+
+
+def write_snapshot(path: str, state: Dict[str, Any], segment: int) -> None:
+    target = snapshot_path(path)
+    directory = os.path.dirname(os.path.abspath(target))
+    handle, temp_path = tempfile.mkstemp(prefix=".journal.", dir=directory)
+    try:
+        with os.fdopen(handle, "wb") as file:
+            file.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, segment) + encode_snapshot(state))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, target)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def load_state(path: str = JOURNAL_PATH, upto: Optional[int] = None) -> Tuple[Optional[Dict[str, Any]], int]:
+    state, covered = read_snapshot(path)
+    segments = [segment for segment in list_segments(path)
+                if segment > covered and (upto is None or segment <= upto)]
+    if state is None:
+        if segments:
+            raise JournalError("Journal snapshot is missing.")
+        return None, covered
+
+    for segment in segments:
+        with open(segment_path(path, segment), "rb") as file:
+            data = file.read()
+        for records, text, written_at in read_blocks(data):
+            replay_events(state, records, text)
+            state["saved_at"] = written_at
+    return state, covered
+
+
+class Journal:
+    def __init__(self, path: str = JOURNAL_PATH, flush_interval: float = FLUSH_INTERVAL,
+                 batch_events: int = BATCH_EVENTS, compact_events: int = COMPACT_EVENTS) -> None:
+        self.path: str = path
+        self.flush_interval: float = flush_interval
+        self.batch_events: int = batch_events
+        self.compact_events: int = compact_events
+        self.lock: threading.RLock = threading.RLock()
+        self.snapshot_lock: threading.Lock = threading.Lock()
+        self.records: bytearray = bytearray()
+        self.text: bytearray = bytearray()
+        self.count: int = 0
+        self.quotes: Optional[Quotes] = None
+        self.segment: int = max(list_segments(path) + [read_snapshot(path)[1]]) + 1
+        self.segment_events: int = 0
+        self.file = None
+        self.compactor: Optional[threading.Thread] = None
+        self.flush_timer: Optional[Timer] = None
+        atexit.register(self.close)
+
+    def tick(self, interval: int, balance: Balance, quotes: Optional[Quotes] = None) -> None:
+        with self.lock:
+            if quotes is not None:
+                self.quotes = quotes
+            self._append(TICK, 0, isinstance(balance, float), interval, balance)
+
+    def purchase(self, field: str, amount: int, cost: int) -> None:
+        self._append(PURCHASE, FIELD_INDEX[field], 0, amount, -cost)
+
+    def loan(self, field: str, value: int, cash: int) -> None:
+        self._append(LOAN, FIELD_INDEX[field], 0, value, cash)
+
+    def trade(self, share: str, amount: int, cash: Balance) -> None:
+        self._append(TRADE, SHARE_INDEX[share], 0, amount, cash)
+
+    def station(self, station_type: str, name: str, cost: int) -> None:
+        self._append(STATION, STATION_TYPES.index(station_type), 0, 0, -cost, name.encode("utf-8"))
+
+    def rename(self, target: str, new_name: str, old_name: str = "") -> None:
+        old = old_name.encode("utf-8")
+        self._append(RENAME, RENAME_TARGETS.index(target), 0, len(old), 0, old + new_name.encode("utf-8"))
+
+    def reward(self, slot: int, field: str, amount: int) -> None:
+        self._append(REWARD, FIELD_INDEX[field], slot, amount, 0)
+
+    def _append(self, kind: int, code: int, flag: int, amount: int, cash: Balance, text: bytes = b"") -> None:
+        with self.lock:
+            self.records += EVENT.pack(kind, code, flag, len(text), amount, cash)
+            if text:
+                self.text += text
+            self.count += 1
+            if self.count >= self.batch_events:
+                self._write()
+            elif self.flush_timer is None and self.flush_interval > 0:
+                self.flush_timer = get_scheduler().schedule_every(self.flush_interval, self.flush)
+
+    def _write(self) -> None:
+        if self.quotes is not None:
+            prices, values, yields = self.quotes
+            width = len(prices)
+            quotes = struct.pack(f"<{width}q{width}q{width}d", *prices, *values, *yields)
+            self.records += EVENT.pack(QUOTES, width, 0, len(quotes), 0, 0)
+            self.text += quotes
+            self.count += 1
+            self.quotes = None
+        payload = bytes(self.records) + bytes(self.text)
+        if self.file is None:
+            self.file = open(segment_path(self.path, self.segment), "ab")
+        self.file.write(BLOCK.pack(JOURNAL_MAGIC, self.count, len(self.text), zlib.crc32(payload), time.time())
+                        + payload)
+        self.file.flush()
+        self.segment_events += self.count
+        self.records, self.text, self.count = bytearray(), bytearray(), 0
+        if self.segment_events >= self.compact_events and (self.compactor is None or
+                                                           not self.compactor.is_alive()):
+            self.compactor = threading.Thread(target=self.compact, args=(self._rotate(),),
+                                              name="journal-compactor", daemon=True)
+            self.compactor.start()
+
+    def _rotate(self) -> int:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        self.segment += 1
+        self.segment_events = 0
+        return self.segment - 1
+
+    def flush(self) -> bool:
+        with self.lock:
+            if not self.count:
+                return False
+            self._write()
+        return True
+
+    def compact(self, upto: int) -> None:
+        with self.snapshot_lock:
+            state, covered = load_state(self.path, upto)
+            if state is not None and covered < upto:
+                write_snapshot(self.path, state, upto)
+            for segment in list_segments(self.path):
+                if segment <= upto:
+                    os.remove(segment_path(self.path, segment))
+
+    def checkpoint(self, state: Dict[str, Any]) -> None:
+        with self.lock:
+            self.records, self.text, self.count = bytearray(), bytearray(), 0
+            self.quotes = None
+            upto = self._rotate()
+            with self.snapshot_lock:
+                write_snapshot(self.path, state, upto)
+                for segment in list_segments(self.path):
+                    if segment <= upto:
+                        os.remove(segment_path(self.path, segment))
+
+    def close(self) -> None:
+        if self.flush_timer is not None:
+            get_scheduler().cancel(self.flush_timer)
+            self.flush_timer = None
+        with self.lock:
+            if self.count:
+                self._write()
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+        if self.compactor is not None:
+            self.compactor.join()
+
+
+def recover(path: str = JOURNAL_PATH, game: Optional["Game"] = None) -> "Game":
+    from game import Game
+    from leaderboard import Leaderboard
+    from persistence import GameInfoStore
+
+    game = game if game is not None else Game(info_store=GameInfoStore(None), leaderboard=Leaderboard(None))
+    state, _ = load_state(path)
+    game.journal = Journal(path)
+    if state is None:
+        game.journal.checkpoint(game.saveload.state())
+    else:
+        game.saveload.apply_state(state)
+    return game
@@ -0,0 +1,330 @@
+import atexit
+import json
+import os
+import tempfile
+import threading
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+LEADERBOARD_PATH: str = "leaderboard.log"
+FLUSH_INTERVAL: float = 5.0
+BLOCK_LOAD: int = 512
+
+Score = Union[int, float]
+Key = Tuple[Score, str]
+
+
+@dataclass(frozen=True)
+class Standing:
+    rank: int
+    empire: str
+    score: Score
+    empire_id: str = ""
+
+
+class RankedScores:
+    def __init__(self) -> None:
+        self.blocks: List[List[Key]] = []
+        self.maxes: List[Key] = []
+        self.tree: List[int] = [0]
+        self.size: int = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _rebuild(self) -> None:
+        tree = [0] + [len(block) for block in self.blocks]
+        for index in range(1, len(tree)):
+            parent = index + (index & -index)
+            if parent < len(tree):
+                tree[parent] += tree[index]
+        self.tree = tree
+
+    def _grow(self, block: int, delta: int) -> None:
+        tree = self.tree
+        index = block + 1
+        while index < len(tree):
+            tree[index] += delta
+            index += index & -index
+
+    def _before(self, block: int) -> int:
+        tree = self.tree
+        total = 0
+        while block:
+            total += tree[block]
+            block -= block & -block
+        return total
+
+    def _locate(self, position: int) -> Tuple[int, int]:
+        tree = self.tree
+        block = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            candidate = block + step
+            if candidate < len(tree) and tree[candidate] <= position:
+                block = candidate
+                position -= tree[candidate]
+            step >>= 1
+        return block, position
+
+    @classmethod
+    def from_sorted(cls, keys: List[Key]) -> "RankedScores":
+        ranked = cls()
+        ranked.blocks = [keys[start:start + BLOCK_LOAD] for start in range(0, len(keys), BLOCK_LOAD)]
+        ranked.maxes = [block[-1] for block in ranked.blocks]
+        ranked.size = len(keys)
+        ranked._rebuild()
+        return ranked
+
+    def add(self, key: Key) -> None:
+        blocks, maxes = self.blocks, self.maxes
+        self.size += 1
+        if not blocks:
+            blocks.append([key])
+            maxes.append(key)
+            self._rebuild()
+            return
+
+        index = bisect_left(maxes, key)
+        if index == len(maxes):
+            index -= 1
+            blocks[index].append(key)
+            maxes[index] = key
+        else:
+            insort(blocks[index], key)
+
+        block = blocks[index]
+        if len(block) > 2 * BLOCK_LOAD:
+            blocks[index:index + 1] = [block[:BLOCK_LOAD], block[BLOCK_LOAD:]]
+            maxes[index:index + 1] = [block[BLOCK_LOAD - 1], block[-1]]
+            self._rebuild()
+        else:
+            self._grow(index, 1)
+
+    def remove(self, key: Key) -> None:
+        blocks, maxes = self.blocks, self.maxes
+        index = bisect_left(maxes, key)
+        block = blocks[index] if index < len(blocks) else []
+        position = bisect_left(block, key)
+        if position == len(block) or block[position] != key:
+            raise KeyError(key)
+
+        del block[position]
+        self.size -= 1
+        if not block:
+            del blocks[index]
+            del maxes[index]
+            self._rebuild()
+            return
+        maxes[index] = block[-1]
+        self._grow(index, -1)
+
+    def index(self, key: Key) -> int:
+        index = bisect_left(self.maxes, key)
+        if index == len(self.blocks):
+            raise KeyError(key)
+        block = self.blocks[index]
+        position = bisect_left(block, key)
+        if block[position] != key:
+            raise KeyError(key)
+        return self._before(index) + position
+
+    def iterate(self, start: int, stop: int) -> Iterator[Key]:
+        start, stop = max(0, start), min(stop, self.size)
+        if start >= stop:
+            return
+        block, position = self._locate(start)
+        remaining = stop - start
+        while remaining:
+            chunk = self.blocks[block][position:position + remaining]
+            yield from chunk
+            remaining -= len(chunk)
+            block, position = block + 1, 0
+
+
+class Leaderboard:
+    def __init__(self, path: Optional[str] = LEADERBOARD_PATH, flush_interval: float = FLUSH_INTERVAL) -> None:
+        self.path: Optional[str] = path
+        self.flush_interval: float = flush_interval
+        self.lock: threading.RLock = threading.RLock()
+        self.io_lock: threading.Lock = threading.Lock()
+        self.scores: Dict[str, Score] = {}
+        self.names: Dict[str, str] = {}
+        self.ranked: RankedScores = RankedScores()
+        self.pending: Dict[str, Tuple[Optional[Score], str]] = {}
+        self.log_entries: int = 0
+        self.writer: Optional[threading.Thread] = None
+        self.stopped: threading.Event = threading.Event()
+        if path is not None:
+            self.load()
+            atexit.register(self.close)
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "r") as file:
+                lines = file.read().splitlines()
+        except FileNotFoundError:
+            lines = []
+
+        scores: Dict[str, Score] = {}
+        names: Dict[str, str] = {}
+        for line in lines:
+            try:
+                entry = json.loads(line)
+                empire_id, score = entry[0], entry[1]
+            except (ValueError, TypeError, IndexError):
+                continue
+            if score is None:
+                scores.pop(empire_id, None)
+                names.pop(empire_id, None)
+            else:
+                scores[empire_id] = score
+                names[empire_id] = entry[2] if len(entry) > 2 else empire_id
+
+        with self.lock:
+            self.scores = scores
+            self.names = names
+            self.ranked = RankedScores.from_sorted(sorted((-score, empire_id) for empire_id, score in scores.items()))
+            self.log_entries = len(lines)
+        if self.log_entries > 2 * len(self.scores) + 1000:
+            self.compact()
+
+    def update(self, empire_id: str, score: Score, name: Optional[str] = None) -> bool:
+        with self.lock:
+            old = self.scores.get(empire_id)
+            name = name or self.names.get(empire_id, empire_id)
+            if old == score and self.names.get(empire_id) == name:
+                return False
+            if old != score:
+                if old is not None:
+                    self.ranked.remove((-old, empire_id))
+                self.scores[empire_id] = score
+                self.ranked.add((-score, empire_id))
+            self.names[empire_id] = name
+            self._log(empire_id, score, name)
+        return True
+
+    def remove(self, empire_id: str) -> bool:
+        with self.lock:
+            old = self.scores.pop(empire_id, None)
+            if old is None:
+                return False
+            self.ranked.remove((-old, empire_id))
+            self._log(empire_id, None, self.names.pop(empire_id, empire_id))
+        return True
+
+    def rename(self, empire_id: str, name: str) -> None:
+        with self.lock:
+            score = self.scores.get(empire_id)
+            if score is not None:
+                self.update(empire_id, score, name)
+
+    def name(self, empire_id: str) -> Optional[str]:
+        with self.lock:
+            return self.names.get(empire_id)
+
+    def rank(self, empire_id: str) -> Optional[int]:
+        with self.lock:
+            score = self.scores.get(empire_id)
+            return None if score is None else self.ranked.index((-score, empire_id)) + 1
+
+    def _standings(self, start: int, stop: int) -> List[Standing]:
+        return [Standing(rank, self.names.get(empire_id, empire_id), -score, empire_id)
+                for rank, (score, empire_id) in enumerate(self.ranked.iterate(start, stop), start + 1)]
+
+    def top(self, count: int = 10) -> List[Standing]:
+        with self.lock:
+            return self._standings(0, count)
+
+    def around(self, empire_id: str, radius: int = 2) -> List[Standing]:
+        with self.lock:
+            rank = self.rank(empire_id)
+            if rank is None:
+                return []
+            return self._standings(rank - 1 - radius, rank + radius)
+
+    def _log(self, empire_id: str, score: Optional[Score], name: str) -> None:
+        if self.path is None:
+            return
+        self.pending[empire_id] = (score, name)
+        if self.writer is None and self.flush_interval > 0:
+            self.stopped = threading.Event()
+            self.writer = threading.Thread(target=self._write_loop, args=(self.stopped,),
+                                           name="leaderboard-writer", daemon=True)
+            self.writer.start()
+
+    def _write_loop(self, stopped: threading.Event) -> None:
+        while not stopped.wait(self.flush_interval):
+            self.flush()
+
+    def _entries(self) -> List[Tuple[str, Optional[Score], str]]:
+        return [(empire_id, score, self.names.get(empire_id, empire_id)) for empire_id, score in self.scores.items()]
+
+    def flush(self) -> bool:
+        with self.io_lock:
+            with self.lock:
+                if not self.pending:
+                    return False
+                compact = self.log_entries + len(self.pending) > 2 * len(self.scores) + 1000
+                if compact:
+                    entries = self._entries()
+                    self.log_entries = len(entries)
+                else:
+                    entries = [(empire_id, score, name) for empire_id, (score, name) in self.pending.items()]
+                    self.log_entries += len(entries)
+                self.pending = {}
+            if compact:
+                self._replace(entries)
+            else:
+                with open(self.path, "a") as file:
+                    file.write(_lines(entries))
+        return True
+
+    def compact(self) -> None:
+        with self.io_lock:
+            with self.lock:
+                entries = self._entries()
+                self.pending = {}
+                self.log_entries = len(entries)
+            self._replace(entries)
+
+    def _replace(self, entries: List[Tuple[str, Optional[Score], str]]) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        handle, temp_path = tempfile.mkstemp(prefix=".leaderboard.", dir=directory)
+        try:
+            with os.fdopen(handle, "w") as file:
+                file.write(_lines(entries))
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def close(self) -> None:
+        with self.lock:
+            writer, stopped, self.writer = self.writer, self.stopped, None
+        if writer is not None:
+            stopped.set()
+            writer.join()
+        if self.path is not None:
+            self.flush()
+
+
+def _lines(entries: List[Tuple[str, Optional[Score], str]]) -> str:
+    return "".join(json.dumps([empire_id, score, name]) + "\n" for empire_id, score, name in entries)
+
+
+_leaderboards: Dict[str, Leaderboard] = {}
+_leaderboards_lock: threading.Lock = threading.Lock()
+
+
+def get_leaderboard(path: str = LEADERBOARD_PATH) -> Leaderboard:
+    key = os.path.abspath(path)
+    with _leaderboards_lock:
+        if key not in _leaderboards:
+            _leaderboards[key] = Leaderboard(key)
+        return _leaderboards[key]
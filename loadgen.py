@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import time
+from typing import List
+
+COMMANDS: List[str] = [
+    "/empireinfo",
+    "/quoteshares a 5",
+    "/sharemarket",
+    "/buyvehicle taxi 1",
+    "/stations",
+    "/achievements"
+]
+
+
+async def read_response(reader: asyncio.StreamReader) -> bool:
+    while True:
+        line = await reader.readline()
+        if not line:
+            return False
+        if line == b".\n":
+            return True
+
+
+async def run_client(host: str, port: int, duration: float, latencies: List[float]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    await read_response(reader)
+    deadline = time.perf_counter() + duration
+    index = 0
+    while time.perf_counter() < deadline:
+        command = COMMANDS[index % len(COMMANDS)]
+        index += 1
+        start = time.perf_counter()
+        writer.write(command.encode("utf-8") + b"\n")
+        await writer.drain()
+        if not await read_response(reader):
+            break
+        latencies.append(time.perf_counter() - start)
+    writer.write(b"/exit\n")
+    await writer.drain()
+    await read_response(reader)
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run_load(host: str, port: int, sessions: int, duration: float) -> List[float]:
+    latencies: List[float] = []
+    await asyncio.gather(*(run_client(host, port, duration, latencies) for _ in range(sessions)))
+    return latencies
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def wait_for_server(host: str, port: int, timeout: float = 10) -> None:
+    async def probe() -> None:
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.close()
+        await writer.wait_closed()
+
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            asyncio.run(probe())
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load generator for the TextEmpire game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--spawn", action="store_true",
+                        help="start server.py in a subprocess and report its CPU usage")
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        server = subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "server.py"),
+                                   "--host", args.host, "--port", str(args.port)])
+        wait_for_server(args.host, args.port)
+
+    try:
+        started = time.perf_counter()
+        latencies = asyncio.run(run_load(args.host, args.port, args.sessions, args.duration))
+        elapsed = time.perf_counter() - started
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print(f"Sessions: {args.sessions}")
+    print(f"Commands: {len(latencies)} in {elapsed:.2f}s ({len(latencies) / elapsed:.0f} commands/s)")
+    if latencies:
+        print(f"Latency p50: {percentile(latencies, 0.5) * 1000:.2f}ms, "
+              f"p99: {percentile(latencies, 0.99) * 1000:.2f}ms")
+    if server is not None:
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu = usage.ru_utime + usage.ru_stime
+        print(f"Server CPU: {cpu:.2f}s ({len(latencies) / cpu:.0f} commands per CPU-second)")
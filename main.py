@@ -1,5 +1,61 @@
+import argparse
+import sys
 from game import Game
+from persistence import GameInfoStore, get_store
+from leaderboard import Leaderboard, get_leaderboard
+from archive import PriceArchive
+from journal import recover
+from metrics import enable_metrics
+from batch import run_batch
 
 if __name__ == "__main__":
-    game = Game()
+    parser = argparse.ArgumentParser(description="TextEmpire: Society")
+    parser.add_argument("--lazy", action="store_true",
+                        help="accrue income on read instead of ticking every 3 seconds")
+    parser.add_argument("--tick-seconds", type=float, default=3,
+                        help="seconds between game ticks (default: 3)")
+    parser.add_argument("--turbo", action="store_true",
+                        help="tick as fast as possible")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed the game's random numbers for a reproducible run")
+    parser.add_argument("--archive", default=None,
+                        help="append every market tick to this price archive file")
+    parser.add_argument("--journal", default=None,
+                        help="journal every change to this path and recover the game from it on start")
+    parser.add_argument("--metrics", action="store_true",
+                        help="time ticks and commands; view them with /stats")
+    parser.add_argument("--metrics-file", default=None,
+                        help="also write the timings to this file every 10 seconds (implies --metrics)")
+    parser.add_argument("--batch", default=None,
+                        help="run slash commands and tick/wait/at directives (or JSON actions, one per line) "
+                             "from this file, or - for stdin, and print the results as JSON lines")
+    parser.add_argument("--command-seconds", type=float, default=0.0,
+                        help="virtual seconds each batch command takes (default: 0)")
+    parser.add_argument("--game-info", default=None,
+                        help="high score and saved game file (default: game_info.txt; "
+                             "a fresh in-memory one with --batch)")
+    parser.add_argument("--leaderboard", default=None,
+                        help="leaderboard log (default: leaderboard.log; a fresh in-memory one with --batch)")
+    args = parser.parse_args()
+    if args.batch and args.lazy:
+        parser.error("--lazy cannot be used with --batch; batch ticks follow virtual time")
+
+    if args.metrics or args.metrics_file:
+        enable_metrics(args.metrics_file)
+
+    if args.batch:
+        info_store = GameInfoStore(args.game_info)
+        leaderboard = Leaderboard(args.leaderboard)
+    else:
+        info_store = get_store() if args.game_info is None else get_store(args.game_info)
+        leaderboard = get_leaderboard() if args.leaderboard is None else get_leaderboard(args.leaderboard)
+    game = Game(lazy_accrual=args.lazy, tick_seconds=0 if args.turbo else args.tick_seconds,
+                seed=args.seed, info_store=info_store, leaderboard=leaderboard)
+    if args.archive:
+        game.archive = PriceArchive(args.archive, game.shares)
+    if args.journal:
+        recover(args.journal, game)
+    if args.batch:
+        with (sys.stdin if args.batch == "-" else open(args.batch, "r")) as source:
+            sys.exit(0 if run_batch(game, source, sys.stdout, args.command_seconds) else 1)
     game.start_game()
@@ -0,0 +1,130 @@
+import random
+import threading
+from array import array
+from dataclasses import dataclass
+from math import floor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from accrual import TICK_SECONDS
+from scheduler import Timer, get_scheduler
+from history import PriceHistory
+from archive import PriceArchive
+
+BLOCK_TICKS: int = 16
+VALUE_RANGE: range = range(-500, 501)
+SPREAD_RANGE: range = range(-250, 251)
+MAX_YIELD: float = 0.05
+
+
+class MarketStream:
+    __slots__ = ("seed", "rng", "width", "block_ticks", "values", "prices", "yields", "row", "next_row")
+
+    def __init__(self, seed: Optional[int], width: int, block_ticks: int = BLOCK_TICKS) -> None:
+        self.seed: Optional[int] = seed
+        self.rng: Optional[random.Random] = None
+        self.width: int = width
+        self.block_ticks: int = block_ticks
+        self.values: array = array("q", bytes(8 * width))
+        self.prices: array = array("q", bytes(8 * width))
+        self.yields: array = array("d", bytes(8 * width))
+        self.row: int = 0
+        self.next_row: int = width
+
+    def refill(self) -> None:
+        if self.rng is None:
+            self.rng = random.Random(self.seed)
+        rng = self.rng
+        uniform = rng.random
+        count = self.width * self.block_ticks
+
+        values = rng.choices(VALUE_RANGE, k=count)
+        prices = [value + spread for value, spread in zip(values, rng.choices(SPREAD_RANGE, k=count))]
+        for index, price in enumerate(prices):
+            if price < 1:
+                prices[index] = floor(uniform() * (1 - price))
+
+        self.values = array("q", values)
+        self.prices = array("q", prices)
+        self.yields = array("d", [round(uniform() * MAX_YIELD, 3) for _ in range(count)])
+        self.next_row = 0
+
+    def advance(self) -> array:
+        if self.next_row >= len(self.values):
+            self.refill()
+        self.row = self.next_row
+        self.next_row += self.width
+        return self.values[self.row:self.next_row]
+
+    def current_values(self) -> array:
+        return self.values[self.row:self.row + self.width]
+
+    def current_prices(self) -> array:
+        return self.prices[self.row:self.row + self.width]
+
+    def current_yields(self) -> array:
+        return self.yields[self.row:self.row + self.width]
+
+
+@dataclass(frozen=True)
+class MarketSnapshot:
+    tick: int
+    values: Tuple[int, ...]
+    prices: Tuple[int, ...]
+    yields: Tuple[float, ...]
+
+
+class SharedMarket:
+    def __init__(self, keys: Sequence[str], seed: Optional[int] = None) -> None:
+        self.keys: Tuple[str, ...] = tuple(keys)
+        self.index: Dict[str, int] = {key: index for index, key in enumerate(self.keys)}
+        self.stream: MarketStream = MarketStream(seed, len(self.keys))
+        self.snapshot: MarketSnapshot = MarketSnapshot(0, (0,) * len(self.keys), (0,) * len(self.keys),
+                                                       (0.0,) * len(self.keys))
+        self.history: PriceHistory = PriceHistory(self.keys)
+        self.archive: Optional[PriceArchive] = None
+        self.listeners: List[Callable[[MarketSnapshot], None]] = []
+        self.lock: threading.Lock = threading.Lock()
+        self.timer: Optional[Timer] = None
+
+    def subscribe(self, listener: Callable[[MarketSnapshot], None]) -> MarketSnapshot:
+        with self.lock:
+            self.listeners.append(listener)
+            return self.snapshot
+
+    def unsubscribe(self, listener: Callable[[MarketSnapshot], None]) -> None:
+        with self.lock:
+            if listener in self.listeners:
+                self.listeners.remove(listener)
+
+    def publish(self) -> MarketSnapshot:
+        with self.lock:
+            values = tuple(self.stream.advance())
+            snapshot = MarketSnapshot(self.snapshot.tick + 1, values, tuple(self.stream.current_prices()),
+                                      tuple(self.stream.current_yields()))
+            self.snapshot = snapshot
+            self.history.record(snapshot.values, snapshot.prices, snapshot.yields)
+            if self.archive is not None:
+                self.archive.append(snapshot.values, snapshot.prices, snapshot.yields)
+            listeners = list(self.listeners)
+        for listener in listeners:
+            listener(snapshot)
+        return snapshot
+
+    def start(self, tick_seconds: float = TICK_SECONDS) -> None:
+        if self.timer is None:
+            self.timer = get_scheduler().schedule_every(tick_seconds, self.publish)
+
+    def stop(self) -> None:
+        if self.timer is not None:
+            get_scheduler().cancel(self.timer)
+            self.timer = None
+
+
+_shared_markets: Dict[Optional[int], SharedMarket] = {}
+_shared_markets_lock: threading.Lock = threading.Lock()
+
+
+def get_shared_market(keys: Sequence[str], seed: Optional[int] = None) -> SharedMarket:
+    with _shared_markets_lock:
+        if seed not in _shared_markets:
+            _shared_markets[seed] = SharedMarket(keys, seed)
+        return _shared_markets[seed]
@@ -0,0 +1,222 @@
+import atexit
+import os
+import tempfile
+import threading
+from array import array
+from typing import Dict, List, Optional, Tuple
+from scheduler import Timer, get_scheduler
+
+SUB_BITS: int = 5
+SUB_BUCKETS: int = 1 << SUB_BITS
+HALF_BUCKETS: int = SUB_BUCKETS >> 1
+BUCKETS: int = (64 - SUB_BITS + 2) * HALF_BUCKETS
+QUANTILES: Tuple[float, ...] = (0.5, 0.9, 0.99, 0.999)
+TICK_SAMPLE: int = 32
+EXPORT_INTERVAL: float = 10.0
+PREFIX: str = "textempire_"
+
+
+def bucket_ceiling(index: int) -> int:
+    if index < SUB_BUCKETS:
+        return index
+    shift = index // HALF_BUCKETS - 1
+    return ((index - shift * HALF_BUCKETS + 1) << shift) - 1
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total", "maximum")
+
+    def __init__(self) -> None:
+        self.counts: array = array("q", bytes(8 * BUCKETS))
+        self.count: int = 0
+        self.total: int = 0
+        self.maximum: int = 0
+
+    def record(self, value: int) -> None:
+        if value < SUB_BUCKETS:
+            self.counts[value if value > 0 else 0] += 1
+        else:
+            shift = value.bit_length() - SUB_BITS
+            self.counts[shift * HALF_BUCKETS + (value >> shift)] += 1
+        if value > self.maximum:
+            self.maximum = value
+        self.count += 1
+        self.total += value
+
+    def percentile(self, quantile: float) -> int:
+        if not self.count:
+            return 0
+        rank = max(1, int(quantile * self.count + 0.5))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bucket_ceiling(index), self.maximum)
+        return self.maximum
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+def _seconds(nanoseconds: float) -> str:
+    return f"{nanoseconds / 1e9:.9g}"
+
+
+def _duration(nanoseconds: float) -> str:
+    if nanoseconds >= 1e9:
+        return f"{nanoseconds / 1e9:.2f}s"
+    if nanoseconds >= 1e6:
+        return f"{nanoseconds / 1e6:.2f}ms"
+    return f"{nanoseconds / 1e3:.1f}us"
+
+
+class Metrics:
+    def __init__(self, tick_sample: int = TICK_SAMPLE) -> None:
+        self.tick_sample: int = max(1, tick_sample)
+        self.lock: threading.Lock = threading.Lock()
+        self.ticks: int = 0
+        self.counters: Dict[str, int] = {}
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}
+        self.commands: Dict[str, Histogram] = {}
+        self.tick: Histogram = self.histogram("tick_seconds")
+        self.market: Histogram = self.histogram("tick_phase_seconds", 'phase="market"')
+        self.balance: Histogram = self.histogram("tick_phase_seconds", 'phase="balance"')
+        self.high_scores: Histogram = self.histogram("tick_phase_seconds", 'phase="high_scores"')
+        self.export_path: Optional[str] = None
+        self.export_timer: Optional[Timer] = None
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def histogram(self, name: str, label: str = "") -> Histogram:
+        key = (name, label)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        return histogram
+
+    def record(self, name: str, nanoseconds: int, label: str = "") -> None:
+        with self.lock:
+            self.histogram(name, label).record(nanoseconds)
+
+    def sample_tick(self) -> bool:
+        self.ticks += 1
+        return self.ticks % self.tick_sample == 0
+
+    def record_tick(self, started: int, market: int, balance: int, finished: int) -> None:
+        with self.lock:
+            self.tick.record(finished - started)
+            self.market.record(market - started)
+            self.balance.record(balance - market)
+            self.high_scores.record(finished - balance)
+
+    def record_drift(self, seconds: float) -> None:
+        self.record("tick_drift_seconds", max(0, int(seconds * 1e9)))
+
+    def record_command(self, command: str, nanoseconds: int, failed: bool) -> None:
+        with self.lock:
+            histogram = self.commands.get(command)
+            if histogram is None:
+                histogram = self.commands[command] = self.histogram("command_seconds", f'command="{command}"')
+            histogram.record(nanoseconds)
+            if failed:
+                self.counters["command_errors_total"] = self.counters.get("command_errors_total", 0) + 1
+
+    def _totals(self) -> Dict[str, int]:
+        commands = sum(histogram.count for histogram in self.commands.values())
+        return {"ticks_total": self.ticks, "commands_total": commands, **self.counters}
+
+    def stats_text(self) -> str:
+        with self.lock:
+            totals = self._totals()
+            rows = [(name, label, histogram.count, histogram.mean(), histogram.percentile(0.5),
+                     histogram.percentile(0.99), histogram.maximum)
+                    for (name, label), histogram in sorted(self.histograms.items()) if histogram.count]
+        lines: List[str] = [f"Ticks: {totals.pop('ticks_total'):,} (1 in {self.tick_sample} timed)"]
+        lines.extend(f"{name.replace('_total', '').replace('_', ' ').capitalize()}: {value:,}"
+                     for name, value in sorted(totals.items()))
+        if rows:
+            lines.append(f"{'':32} {'count':>8} {'mean':>9} {'p50':>9} {'p99':>9} {'max':>9}")
+        for name, label, count, mean, p50, p99, maximum in rows:
+            title = name.replace("_seconds", "").replace("_", " ")
+            if label:
+                title += " " + label.split("=", 1)[1].strip('"')
+            lines.append(f"{title:32} {count:>8,} {_duration(mean):>9} {_duration(p50):>9} "
+                         f"{_duration(p99):>9} {_duration(maximum):>9}")
+        return "\n".join(lines)
+
+    def exposition(self) -> str:
+        with self.lock:
+            totals = self._totals()
+            histograms = sorted(self.histograms.items())
+            lines: List[str] = []
+            for name, value in sorted(totals.items()):
+                lines.append(f"# TYPE {PREFIX}{name} counter")
+                lines.append(f"{PREFIX}{name} {value}")
+            previous = ""
+            for (name, label), histogram in histograms:
+                if name != previous:
+                    lines.append(f"# TYPE {PREFIX}{name} summary")
+                    previous = name
+                prefix = label + "," if label else ""
+                for quantile in QUANTILES:
+                    lines.append(f'{PREFIX}{name}{{{prefix}quantile="{quantile}"}} '
+                                 f"{_seconds(histogram.percentile(quantile))}")
+                suffix = f"{{{label}}}" if label else ""
+                lines.append(f"{PREFIX}{name}_sum{suffix} {_seconds(histogram.total)}")
+                lines.append(f"{PREFIX}{name}_count{suffix} {histogram.count}")
+                lines.append(f"{PREFIX}{name}_max{suffix} {_seconds(histogram.maximum)}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str, interval: float = EXPORT_INTERVAL) -> None:
+        self.close()
+        self.export_path = path
+        self.export_timer = get_scheduler().schedule_every(interval, self.write)
+        atexit.register(self.close)
+
+    def write(self) -> bool:
+        if self.export_path is None:
+            return False
+        contents = self.exposition()
+        directory = os.path.dirname(os.path.abspath(self.export_path))
+        handle, temp_path = tempfile.mkstemp(prefix=".metrics.", dir=directory)
+        try:
+            with os.fdopen(handle, "w") as file:
+                file.write(contents)
+            os.replace(temp_path, self.export_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return True
+
+    def close(self) -> None:
+        if self.export_timer is not None:
+            get_scheduler().cancel(self.export_timer)
+            self.export_timer = None
+            self.write()
+
+
+_metrics: Optional[Metrics] = None
+
+
+def get_metrics() -> Optional[Metrics]:
+    return _metrics
+
+
+def enable_metrics(path: Optional[str] = None, interval: float = EXPORT_INTERVAL,
+                   tick_sample: int = TICK_SAMPLE) -> Metrics:
+    global _metrics
+    if _metrics is None:
+        _metrics = Metrics(tick_sample)
+    if path:
+        _metrics.export(path, interval)
+    return _metrics
+
+
+def disable_metrics() -> None:
+    global _metrics
+    if _metrics is not None:
+        _metrics.close()
+        _metrics = None
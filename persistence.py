@@ -0,0 +1,113 @@
+import atexit
+import os
+import tempfile
+import threading
+from typing import Dict, Optional
+
+GAME_INFO_PATH: str = "game_info.txt"
+FLUSH_INTERVAL: float = 5.0
+
+
+class GameInfoStore:
+    def __init__(self, path: Optional[str] = GAME_INFO_PATH, flush_interval: float = FLUSH_INTERVAL,
+                 fsync: bool = True) -> None:
+        self.path: Optional[str] = path
+        self.flush_interval: float = flush_interval
+        self.fsync: bool = fsync
+        self.lock: threading.Lock = threading.Lock()
+        self.high_score: int = 0
+        self.saved_key: str = ""
+        self.dirty: bool = False
+        self.writer: Optional[threading.Thread] = None
+        self.stopped: threading.Event = threading.Event()
+        if path is not None:
+            self.load()
+            atexit.register(self.close)
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "r") as file:
+                lines = file.read().splitlines()
+        except FileNotFoundError:
+            lines = []
+
+        with self.lock:
+            try:
+                self.high_score = int(lines[0].strip() or 0) if lines else 0
+            except ValueError:
+                self.high_score = 0
+            self.saved_key = lines[1].strip() if len(lines) > 1 else ""
+            self.dirty = False
+
+    def has_saved_game(self) -> bool:
+        return bool(self.saved_key)
+
+    def record_score(self, balance: float) -> bool:
+        score = int(balance)
+        with self.lock:
+            if score <= self.high_score:
+                return False
+            self.high_score = score
+            self._mark_dirty()
+        return True
+
+    def set_saved_key(self, key: str) -> None:
+        with self.lock:
+            self.saved_key = key.strip()
+            self._mark_dirty()
+
+    def _mark_dirty(self) -> None:
+        self.dirty = True
+        if self.writer is None and self.flush_interval > 0 and self.path is not None:
+            self.stopped = threading.Event()
+            self.writer = threading.Thread(target=self._write_loop, args=(self.stopped,),
+                                           name="game-info-writer", daemon=True)
+            self.writer.start()
+
+    def _write_loop(self, stopped: threading.Event) -> None:
+        while not stopped.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self) -> bool:
+        with self.lock:
+            if not self.dirty or self.path is None:
+                return False
+            contents = f"{self.high_score}\n{self.saved_key}\n"
+            self.dirty = False
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        handle, temp_path = tempfile.mkstemp(prefix=".game_info.", dir=directory)
+        try:
+            with os.fdopen(handle, "w") as file:
+                file.write(contents)
+                if self.fsync:
+                    file.flush()
+                    os.fsync(file.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            with self.lock:
+                self.dirty = True
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return True
+
+    def close(self) -> None:
+        with self.lock:
+            writer, stopped, self.writer = self.writer, self.stopped, None
+        if writer is not None:
+            stopped.set()
+            writer.join()
+        self.flush()
+
+
+_stores: Dict[str, GameInfoStore] = {}
+_stores_lock: threading.Lock = threading.Lock()
+
+
+def get_store(path: str = GAME_INFO_PATH, flush_interval: float = FLUSH_INTERVAL) -> GameInfoStore:
+    key = os.path.abspath(path)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = GameInfoStore(key, flush_interval)
+        return _stores[key]
@@ -0,0 +1,67 @@
+from array import array
+from typing import Iterator, Mapping, Union
+from catalogs import SHARE_FIELDS, SHARE_INDEX, SHARE_KEYS, SHARE_NAMES
+
+ShareField = Union[int, float, str]
+
+
+class ShareHolding(Mapping):
+    __slots__ = ("portfolio", "column")
+
+    def __init__(self, portfolio: "Portfolio", column: int) -> None:
+        self.portfolio: Portfolio = portfolio
+        self.column: int = column
+
+    def __getitem__(self, field: str) -> ShareField:
+        if field == "name":
+            return SHARE_NAMES[SHARE_KEYS[self.column]]
+        if field not in SHARE_FIELDS:
+            raise KeyError(field)
+        return getattr(self.portfolio, field)[self.column]
+
+    def __setitem__(self, field: str, value: ShareField) -> None:
+        if field == "name" or field not in SHARE_FIELDS:
+            raise KeyError(field)
+        getattr(self.portfolio, field)[self.column] = value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(SHARE_FIELDS)
+
+    def __len__(self) -> int:
+        return len(SHARE_FIELDS)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class Portfolio(Mapping):
+    __slots__ = ("price", "value", "dividend_yield", "amount")
+
+    def __init__(self) -> None:
+        self.price: array = array("q", bytes(8 * len(SHARE_KEYS)))
+        self.value: array = array("q", bytes(8 * len(SHARE_KEYS)))
+        self.dividend_yield: array = array("d", bytes(8 * len(SHARE_KEYS)))
+        self.amount: array = array("q", bytes(8 * len(SHARE_KEYS)))
+
+    def __getitem__(self, share: str) -> ShareHolding:
+        return ShareHolding(self, SHARE_INDEX[share])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(SHARE_KEYS)
+
+    def __len__(self) -> int:
+        return len(SHARE_KEYS)
+
+    def __contains__(self, share: object) -> bool:
+        return share in SHARE_INDEX
+
+    def __repr__(self) -> str:
+        return repr({share: dict(holding) for share, holding in self.items()})
+
+    def restore(self, shares: Mapping[str, Mapping[str, ShareField]]) -> None:
+        for share, info in shares.items():
+            column = SHARE_INDEX[share]
+            self.price[column] = int(info.get("price", 0))
+            self.value[column] = int(info.get("value", 0))
+            self.dividend_yield[column] = float(info.get("dividend_yield", 0))
+            self.amount[column] = int(info.get("amount", 0))
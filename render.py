@@ -0,0 +1,118 @@
+import sys
+from dataclasses import dataclass
+from typing import IO, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+from stations import STATION_TYPES, StationRegistry
+
+PAGE_SIZE: int = 50
+CHUNK_BYTES: int = 64 * 1024
+
+
+@dataclass(frozen=True)
+class StationPage:
+    page: int
+    pages: int
+    matching: int
+    names: Tuple[str, ...]
+
+
+class ViewCache:
+    def __init__(self) -> None:
+        self.entries: Dict[str, Tuple[Hashable, str]] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def render(self, view: str, key: Optional[Hashable], build: Callable[[], str]) -> str:
+        if key is None:
+            self.misses += 1
+            return build()
+        entry = self.entries.get(view)
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        text = build()
+        self.entries[view] = (key, text)
+        return text
+
+    def invalidate(self, view: Optional[str] = None) -> None:
+        if view is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(view, None)
+
+
+def parse_station_filter(words: Iterable[str]) -> Tuple[Optional[str], str, int]:
+    station_type: Optional[str] = None
+    prefix: List[str] = []
+    page = 1
+    for word in words:
+        if word.isdigit():
+            page = int(word)
+        elif word.capitalize() in STATION_TYPES and not prefix:
+            station_type = word.capitalize()
+        elif word.lower() != "all" or prefix:
+            prefix.append(word)
+    return station_type, " ".join(prefix), page
+
+
+def filter_stations(registry: StationRegistry, station_type: Optional[str] = None,
+                    prefix: str = "") -> Iterator[str]:
+    if station_type is None and not prefix:
+        return iter(registry)
+    prefix = prefix.lower()
+    return (record.name for record in registry.records
+            if (station_type is None or record.station_type == station_type)
+            and record.name.lower().startswith(prefix))
+
+
+def station_page(registry: StationRegistry, page: int = 1, per_page: int = PAGE_SIZE,
+                 station_type: Optional[str] = None, prefix: str = "") -> StationPage:
+    if station_type is None and not prefix:
+        matching = len(registry)
+        pages = max(1, -(-matching // per_page))
+        page = min(max(1, page), pages)
+        records = registry.records[(page - 1) * per_page:page * per_page]
+        return StationPage(page, pages, matching, tuple(record.name for record in records))
+
+    names = list(filter_stations(registry, station_type, prefix))
+    pages = max(1, -(-len(names) // per_page))
+    page = min(max(1, page), pages)
+    return StationPage(page, pages, len(names), tuple(names[(page - 1) * per_page:page * per_page]))
+
+
+def station_page_text(page: StationPage) -> str:
+    lines: List[str] = ["Stations:", *page.names]
+    if page.pages > 1:
+        lines.append(f"Page {page.page} of {page.pages} ({page.matching:,} stations). "
+                     f"Use /stations [taxi|bus|train] [prefix] <page> for more.")
+    return "\n".join(lines)
+
+
+def paginate(lines: Iterable[str], per_page: int = PAGE_SIZE) -> Iterator[List[str]]:
+    page: List[str] = []
+    for line in lines:
+        page.append(line)
+        if len(page) == per_page:
+            yield page
+            page = []
+    if page:
+        yield page
+
+
+def write_chunked(lines: Iterable[str], output: Optional[IO[str]] = None, chunk_bytes: int = CHUNK_BYTES) -> int:
+    output = output or sys.stdout
+    written = 0
+    chunk: List[str] = []
+    size = 0
+    for line in lines:
+        chunk.append(line)
+        size += len(line) + 1
+        if size >= chunk_bytes:
+            output.write("\n".join(chunk) + "\n")
+            written += size
+            chunk, size = [], 0
+    if chunk:
+        output.write("\n".join(chunk) + "\n")
+        written += size
+    output.flush()
+    return written
@@ -1,33 +1,121 @@
 import json
-from typing import Optional
+import time
+from typing import Any, Dict, Optional
 from game import Game
+from savestore import SaveRecord, SaveStore
+from stations import StationRegistry
+from achievements import ACHIEVEMENTS, redeemable_slots
+from snapshot import (SnapshotError, StationTable, apply_delta, decode_snapshot, encode_delta,
+                      encode_snapshot, from_key, is_delta, is_snapshot_key, snapshot_checksum, station_types, to_key)
 
 class SaveLoad:
     def __init__(self) -> None:
         self.game: Optional[Game] = None
+        self.base_state: Optional[Dict[str, Any]] = None
+        self.base_id: int = 0
+        self.station_table: StationTable = StationTable()
 
-    def generate_key(self) -> str:
-        data = {
-            "balance": self.game.balance,
-            "taxis": self.game.taxis,
-            "buses": self.game.buses,
-            "trains": self.game.trains,
-            "cf_loans": self.game.cf_loans,
-            "cs_loans": self.game.cs_loans,
-            "gl_loans": self.game.gl_loans,
-            "taxi_stations": self.game.taxi_stations,
-            "bus_stations": self.game.bus_stations,
-            "train_stations": self.game.train_stations,
-            "stations": self.game.stations,
-            "redeemable": self.game.redeemable,
-            "empire_info": self.game.empire_info,
-            "shares": self.game.shares
-        }
-        return json.dumps(data)
+    def state(self) -> Dict[str, Any]:
+        with self.game.transaction():
+            self.game.settle()
+            return {
+                "balance": self.game.balance,
+                "taxis": self.game.taxis,
+                "buses": self.game.buses,
+                "trains": self.game.trains,
+                "cf_loans": self.game.cf_loans,
+                "cs_loans": self.game.cs_loans,
+                "gl_loans": self.game.gl_loans,
+                "taxi_stations": self.game.taxi_stations,
+                "bus_stations": self.game.bus_stations,
+                "train_stations": self.game.train_stations,
+                "stations": self.game.stations.names(),
+                "station_types": self.game.stations.types(),
+                "redeemable": list(self.game.redeemable),
+                "empire_info": dict(self.game.empire_info),
+                "empire_id": self.game.empire_id,
+                "shares": {share: dict(info, price=self.game.share_price(share), value=self.game.share_value(share),
+                                       dividend_yield=self.game.share_yield(share))
+                           for share, info in self.game.shares.items()},
+                "special_loan_amount": self.game.special_loan_amount,
+                "add_dividend_interval": self.game.add_dividend_interval,
+                "saved_at": time.time()
+            }
+
+    def generate_key(self, binary: bool = True) -> str:
+        data = self.state()
+        if not binary:
+            return json.dumps(data)
+
+        try:
+            snapshot = encode_snapshot(data, table=self.station_table)
+        except SnapshotError:
+            self.base_state = None
+            return json.dumps(data)
+        self.base_state, self.base_id = data, snapshot_checksum(snapshot)
+        return to_key(snapshot)
+
+    def generate_delta_key(self) -> str:
+        if self.base_state is None:
+            return self.generate_key()
+
+        data = self.state()
+        try:
+            delta = encode_delta(self.base_state, data, self.base_id)
+        except SnapshotError:
+            self.base_state = None
+            return json.dumps(data)
+        self.base_state, self.base_id = data, snapshot_checksum(delta)
+        return to_key(delta)
+
+    def decode_key(self, key: str) -> Dict[str, Any]:
+        if not is_snapshot_key(key):
+            return json.loads(key)
+        return self.decode_snapshot(from_key(key))
+
+    def decode_snapshot(self, snapshot: bytes) -> Dict[str, Any]:
+        if is_delta(snapshot):
+            if self.base_state is None:
+                raise SnapshotError("Load the full game key before its delta keys.")
+            data = apply_delta(self.base_state, snapshot, self.base_id)
+        else:
+            data = decode_snapshot(snapshot)
+        self.base_state, self.base_id = data, snapshot_checksum(snapshot)
+        return data
+
+    def record(self) -> SaveRecord:
+        data = self.state()
+        snapshot = encode_snapshot(data, table=self.station_table)
+        self.base_state, self.base_id = data, snapshot_checksum(snapshot)
+        return SaveRecord(data["empire_info"]["name"], data["empire_info"]["monarch"],
+                          data["saved_at"], data["balance"], snapshot)
+
+    def save_to_store(self, store: SaveStore) -> int:
+        return store.save(self.record())
+
+    def load_from_store(self, store: SaveStore, save_id: int) -> bool:
+        snapshot = store.load(save_id)
+        if snapshot is None:
+            print("Saved game not found.")
+            return False
+        return self.load_snapshot(snapshot)
+
+    def load_snapshot(self, snapshot: bytes) -> bool:
+        try:
+            return self.apply_state(self.decode_snapshot(snapshot))
+        except (KeyError, SnapshotError) as e:
+            print(f"Error loading variables: {e}")
+            return False
 
     def load_variables(self, key: str) -> bool:
         try:
-            data = json.loads(key)
+            return self.apply_state(self.decode_key(key))
+        except (json.JSONDecodeError, KeyError, SnapshotError) as e:
+            print(f"Error loading variables: {e}")
+            return False
+
+    def apply_state(self, data: Dict[str, Any]) -> bool:
+        with self.game.transaction():
             self.game.balance = data["balance"]
             self.game.taxis = data["taxis"]
             self.game.buses = data["buses"]
@@ -35,14 +123,17 @@ class SaveLoad:
             self.game.cf_loans = data["cf_loans"]
             self.game.cs_loans = data["cs_loans"]
             self.game.gl_loans = data["gl_loans"]
-            self.game.taxi_stations = data["taxi_stations"]
-            self.game.bus_stations = data["bus_stations"]
-            self.game.train_stations = data["train_stations"]
-            self.game.stations = data["stations"]
-            self.game.redeemable = data["redeemable"]
-            self.game.empire_info = data["empire_info"]
-            self.game.shares = data["shares"]
-            return True
-        except (json.JSONDecodeError, KeyError) as e:
-            print(f"Error loading variables: {e}")
-            return False
\ No newline at end of file
+            self.game.stations = StationRegistry.from_records(data["stations"], station_types(data))
+            redeemable = list(data["redeemable"])
+            self.game.redeemable = redeemable + [True] * (redeemable_slots(ACHIEVEMENTS) - len(redeemable))
+            self.game.empire_info = dict(data["empire_info"])
+            self.game.change_empire_id(data.get("empire_id") or self.game.empire_id)
+            self.game.shares.restore(data["shares"])
+            self.game.special_loan_amount = data.get("special_loan_amount", 0)
+            self.game.add_dividend_interval = data.get("add_dividend_interval", 0)
+            if self.game.accrual is not None and data.get("saved_at"):
+                self.game.accrual.credit_offline(self.game, time.time() - data["saved_at"])
+            self.game.achievements.evaluate(self.game)
+            if self.game.journal is not None:
+                self.game.journal.checkpoint(self.state())
+        return True
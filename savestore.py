@@ -0,0 +1,140 @@
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SAVES_PATH: str = "saves.db"
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS saves (
+    id INTEGER PRIMARY KEY,
+    empire_name TEXT NOT NULL,
+    monarch TEXT NOT NULL,
+    saved_at REAL NOT NULL,
+    balance REAL NOT NULL,
+    size INTEGER NOT NULL,
+    body BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS saves_by_empire ON saves (empire_name, saved_at);
+CREATE INDEX IF NOT EXISTS saves_by_monarch ON saves (monarch, saved_at);
+CREATE INDEX IF NOT EXISTS saves_by_time ON saves (saved_at);
+"""
+
+LISTING: str = "SELECT id, empire_name, monarch, saved_at, balance, size FROM saves"
+
+
+@dataclass(frozen=True)
+class SaveInfo:
+    save_id: int
+    empire_name: str
+    monarch: str
+    saved_at: float
+    balance: float
+    size: int
+
+
+@dataclass(frozen=True)
+class SaveRecord:
+    empire_name: str
+    monarch: str
+    saved_at: float
+    balance: float
+    body: bytes
+
+
+class SaveStore:
+    def __init__(self, path: str = SAVES_PATH) -> None:
+        self.path: str = path
+        self.lock: threading.Lock = threading.Lock()
+        self.connection: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False,
+                                                              isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def save(self, record: SaveRecord) -> int:
+        return self.save_many([record])[0]
+
+    def save_many(self, records: Iterable[SaveRecord]) -> List[int]:
+        ids: List[int] = []
+        with self.lock:
+            cursor = self.connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                for record in records:
+                    cursor.execute(
+                        "INSERT INTO saves (empire_name, monarch, saved_at, balance, size, body) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (record.empire_name, record.monarch, record.saved_at, float(record.balance),
+                         len(record.body), record.body))
+                    ids.append(cursor.lastrowid)
+                cursor.execute("COMMIT")
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+        return ids
+
+    def load(self, save_id: int) -> Optional[bytes]:
+        row = self._fetch_one("SELECT body FROM saves WHERE id = ?", (save_id,))
+        return row[0] if row else None
+
+    def latest(self, empire_name: str, monarch: Optional[str] = None) -> Optional[Tuple[int, bytes]]:
+        if monarch is None:
+            row = self._fetch_one("SELECT id, body FROM saves WHERE empire_name = ? "
+                                  "ORDER BY saved_at DESC LIMIT 1", (empire_name,))
+        else:
+            row = self._fetch_one("SELECT id, body FROM saves WHERE empire_name = ? AND monarch = ? "
+                                  "ORDER BY saved_at DESC LIMIT 1", (empire_name, monarch))
+        return (row[0], row[1]) if row else None
+
+    def list_saves(self, empire_name: Optional[str] = None, monarch: Optional[str] = None,
+                   limit: int = 50, before: Optional[float] = None) -> List[SaveInfo]:
+        clauses: List[str] = []
+        params: List[object] = []
+        if empire_name is not None:
+            clauses.append("empire_name = ?")
+            params.append(empire_name)
+        if monarch is not None:
+            clauses.append("monarch = ?")
+            params.append(monarch)
+        if before is not None:
+            clauses.append("saved_at < ?")
+            params.append(before)
+
+        query = LISTING
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY saved_at DESC LIMIT ?"
+        params.append(limit)
+
+        with self.lock:
+            rows = self.connection.execute(query, params).fetchall()
+        return [SaveInfo(*row) for row in rows]
+
+    def delete(self, save_id: int) -> bool:
+        with self.lock:
+            return self.connection.execute("DELETE FROM saves WHERE id = ?", (save_id,)).rowcount > 0
+
+    def count(self) -> int:
+        return self._fetch_one("SELECT COUNT(*) FROM saves", ())[0]
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+    def _fetch_one(self, query: str, params: Tuple[object, ...]) -> Optional[Tuple]:
+        with self.lock:
+            return self.connection.execute(query, params).fetchone()
+
+
+_stores: Dict[str, SaveStore] = {}
+_stores_lock: threading.Lock = threading.Lock()
+
+
+def get_save_store(path: str = SAVES_PATH) -> SaveStore:
+    key = os.path.abspath(path)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = SaveStore(key)
+        return _stores[key]
@@ -0,0 +1,180 @@
+import math
+import threading
+import time
+import traceback
+from typing import Callable, List, Optional
+
+SLOT_BITS: int = 8
+SLOTS: int = 1 << SLOT_BITS
+SLOT_MASK: int = SLOTS - 1
+LEVELS: int = 4
+
+
+class Timer:
+    __slots__ = ("callback", "interval", "deadline", "expires", "cancelled")
+
+    def __init__(self, callback: Callable[[], object], interval: float, deadline: float) -> None:
+        self.callback: Callable[[], object] = callback
+        self.interval: float = interval
+        self.deadline: float = deadline
+        self.expires: int = 0
+        self.cancelled: bool = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class TimingWheel:
+    def __init__(self) -> None:
+        self.now_tick: int = 0
+        self.levels: List[List[List[Timer]]] = [[[] for _ in range(SLOTS)] for _ in range(LEVELS)]
+        self.overflow: List[Timer] = []
+        self.due: List[Timer] = []
+
+    def add(self, timer: Timer, expires: int) -> None:
+        timer.expires = expires
+        delta = expires - self.now_tick
+        if delta <= 0:
+            self.due.append(timer)
+            return
+        for level in range(LEVELS):
+            if delta < 1 << (SLOT_BITS * (level + 1)):
+                self.levels[level][(expires >> (SLOT_BITS * level)) & SLOT_MASK].append(timer)
+                return
+        self.overflow.append(timer)
+
+    def _cascade(self, level: int) -> None:
+        if level == LEVELS:
+            timers, self.overflow = self.overflow, []
+        else:
+            slot = (self.now_tick >> (SLOT_BITS * level)) & SLOT_MASK
+            timers, self.levels[level][slot] = self.levels[level][slot], []
+        for timer in timers:
+            if not timer.cancelled:
+                self.add(timer, timer.expires)
+
+    def advance(self) -> List[Timer]:
+        self.now_tick += 1
+        cascade = 0
+        while cascade < LEVELS and not self.now_tick & ((1 << (SLOT_BITS * (cascade + 1))) - 1):
+            cascade += 1
+        for level in range(cascade, 0, -1):
+            self._cascade(level)
+
+        slot = self.now_tick & SLOT_MASK
+        fired, self.levels[0][slot] = self.levels[0][slot], []
+        if self.due:
+            fired, self.due = self.due + fired, []
+        return fired
+
+    def next_expiry(self) -> int:
+        if self.due:
+            return self.now_tick + 1
+        block_end = (self.now_tick | SLOT_MASK) + 1
+        for tick in range(self.now_tick + 1, block_end):
+            if self.levels[0][tick & SLOT_MASK]:
+                return tick
+        return block_end
+
+
+class TickScheduler:
+    def __init__(self, resolution: float = 0.01, clock: Callable[[], float] = time.monotonic) -> None:
+        self.resolution: float = resolution
+        self.clock: Callable[[], float] = clock
+        self.start_time: float = clock()
+        self.wheel: TimingWheel = TimingWheel()
+        self.turbo: List[Timer] = []
+        self.active: int = 0
+        self.condition: threading.Condition = threading.Condition()
+        self.thread: Optional[threading.Thread] = None
+        self.stopped: bool = False
+
+    def now(self) -> float:
+        return self.clock() - self.start_time
+
+    def schedule_every(self, interval: float, callback: Callable[[], object]) -> Timer:
+        with self.condition:
+            timer = Timer(callback, interval, self.now() + interval)
+            if interval <= 0:
+                self.turbo.append(timer)
+            else:
+                self.wheel.add(timer, math.ceil(timer.deadline / self.resolution))
+            self.active += 1
+            self._ensure_thread()
+            self.condition.notify()
+        return timer
+
+    def cancel(self, timer: Timer) -> None:
+        with self.condition:
+            if not timer.cancelled:
+                timer.cancel()
+                self.active -= 1
+                if timer in self.turbo:
+                    self.turbo.remove(timer)
+
+    def stop(self) -> None:
+        with self.condition:
+            self.stopped = True
+            self.condition.notify()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    def _ensure_thread(self) -> None:
+        if self.thread is None or not self.thread.is_alive():
+            self.stopped = False
+            self.thread = threading.Thread(target=self._run, name="tick-scheduler", daemon=True)
+            self.thread.start()
+
+    def _fire(self, timer: Timer) -> None:
+        try:
+            timer.callback()
+        except Exception:
+            traceback.print_exc()
+
+    def run_pending(self) -> int:
+        fired = 0
+        with self.condition:
+            target = int(self.now() / self.resolution)
+            due: List[Timer] = []
+            if not self.active and self.wheel.now_tick < target:
+                self.wheel = TimingWheel()
+                self.wheel.now_tick = target
+            while self.wheel.now_tick < target:
+                due.extend(self.wheel.advance())
+            for timer in due:
+                if not timer.cancelled:
+                    timer.deadline += timer.interval
+                    self.wheel.add(timer, math.ceil(timer.deadline / self.resolution))
+            turbo = list(self.turbo)
+
+        for timer in due + turbo:
+            if not timer.cancelled:
+                self._fire(timer)
+                fired += 1
+        return fired
+
+    def _run(self) -> None:
+        while True:
+            self.run_pending()
+            with self.condition:
+                if self.stopped:
+                    return
+                if self.turbo:
+                    continue
+                if not self.active:
+                    self.condition.wait()
+                    continue
+                wake = self.wheel.next_expiry() * self.resolution
+                self.condition.wait(max(0.0, wake - self.now()))
+
+
+_scheduler: Optional[TickScheduler] = None
+_scheduler_lock: threading.Lock = threading.Lock()
+
+
+def get_scheduler() -> TickScheduler:
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = TickScheduler()
+        return _scheduler
@@ -0,0 +1,151 @@
+import argparse
+import asyncio
+import contextlib
+import traceback
+from typing import Optional, Set
+from catalogs import SHARE_KEYS
+from commands import CommandProcessor
+from game import Game
+from market import SharedMarket
+from archive import PriceArchive
+from exchange import Exchange
+from metrics import enable_metrics, get_metrics
+
+TERMINATOR: bytes = b".\n"
+WELCOME: str = "Welcome to TextEmpire - A text-adventure transport tycoon game.\nType /help for commands."
+TICK_BATCH: int = 1000
+
+
+def frame(text: str) -> bytes:
+    lines = ["." + line if line.startswith(".") else line for line in text.split("\n")] if text else []
+    body = "".join(line + "\n" for line in lines)
+    return body.encode("utf-8") + TERMINATOR
+
+
+class Session:
+    def __init__(self, tick_seconds: float, shared_market: Optional[SharedMarket] = None,
+                 exchange: Optional[Exchange] = None) -> None:
+        self.game: Game = Game(tick_seconds=tick_seconds)
+        self.game.join_market(shared_market)
+        self.game.exchange = exchange
+        self.processor: CommandProcessor = CommandProcessor(self.game)
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+
+class GameServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 7777, tick_seconds: float = 3,
+                 write_buffer: int = 64 * 1024, max_line: int = 4096,
+                 shared_market: Optional[SharedMarket] = None, exchange: Optional[Exchange] = None) -> None:
+        self.host: str = host
+        self.port: int = port
+        self.tick_seconds: float = tick_seconds
+        self.write_buffer: int = write_buffer
+        self.max_line: int = max_line
+        self.shared_market: Optional[SharedMarket] = shared_market
+        self.exchange: Optional[Exchange] = exchange
+        self.sessions: Set[Session] = set()
+        self.ticks: int = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writer.transport.set_write_buffer_limits(high=self.write_buffer)
+        session = Session(self.tick_seconds, self.shared_market, self.exchange)
+        session.writer = writer
+        self.sessions.add(session)
+        try:
+            writer.write(frame(WELCOME))
+            while not session.processor.closed:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write(frame(f"Command too long (limit {self.max_line} bytes)."))
+                    break
+                if not line:
+                    break
+                writer.write(frame(session.processor.execute(line.decode("utf-8", "replace").strip())))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions.discard(session)
+            if self.exchange is not None:
+                self.exchange.cancel_all(session.game)
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def tick_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time() + self.tick_seconds
+        while True:
+            if self.tick_seconds > 0:
+                await asyncio.sleep(max(0.0, next_tick - loop.time()))
+                metrics = get_metrics()
+                if metrics is not None:
+                    metrics.record_drift(loop.time() - next_tick)
+                next_tick += self.tick_seconds
+            else:
+                await asyncio.sleep(0)
+
+            try:
+                if self.shared_market is not None:
+                    self.shared_market.publish()
+                if self.exchange is not None:
+                    self.exchange.match()
+            except Exception:
+                traceback.print_exc()
+            for index, session in enumerate(list(self.sessions)):
+                try:
+                    session.game.tick()
+                except Exception:
+                    traceback.print_exc()
+                    self.drop(session)
+                if index % TICK_BATCH == TICK_BATCH - 1:
+                    await asyncio.sleep(0)
+            self.ticks += 1
+
+    def drop(self, session: Session) -> None:
+        self.sessions.discard(session)
+        session.processor.closed = True
+        if session.writer is not None:
+            session.writer.close()
+
+    async def serve(self) -> None:
+        server = await asyncio.start_server(self.handle, self.host, self.port, limit=self.max_line)
+        ticker = asyncio.create_task(self.tick_loop())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            ticker.cancel()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TextEmpire multi-session game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--tick-seconds", type=float, default=3,
+                        help="seconds between game ticks, 0 for as fast as possible (default: 3)")
+    parser.add_argument("--shared-market", action="store_true",
+                        help="give every session the same share market")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed the shared market")
+    parser.add_argument("--archive", default=None,
+                        help="append every shared market tick to this price archive file")
+    parser.add_argument("--exchange", action="store_true",
+                        help="let sessions trade shares with each other through an order book")
+    parser.add_argument("--metrics", action="store_true",
+                        help="time ticks and commands; view them with /stats")
+    parser.add_argument("--metrics-file", default=None,
+                        help="also write the timings to this file every 10 seconds (implies --metrics)")
+    args = parser.parse_args()
+
+    if args.metrics or args.metrics_file:
+        enable_metrics(args.metrics_file)
+
+    market = SharedMarket(SHARE_KEYS, args.seed) if args.shared_market or args.archive else None
+    if args.archive:
+        market.archive = PriceArchive(args.archive, market.keys)
+    exchange = Exchange(SHARE_KEYS) if args.exchange else None
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(GameServer(args.host, args.port, args.tick_seconds, shared_market=market,
+                               exchange=exchange).serve())
@@ -0,0 +1,89 @@
+from array import array
+from typing import List, Optional
+import numpy as np
+from catalogs import SHARE_KEYS
+from game import Game
+
+STATION_FIELDS: List[str] = ["taxi_stations", "bus_stations", "train_stations"]
+
+MUTABLE_FIELDS: List[str] = [
+    "taxis", "buses", "trains",
+    "cf_loans", "cs_loans", "gl_loans",
+    "special_loan_amount", "add_dividend_interval"
+]
+
+COUNT_FIELDS: List[str] = MUTABLE_FIELDS + STATION_FIELDS
+
+
+class EmpireArrays:
+    def __init__(self, size: int, seed: Optional[int] = None) -> None:
+        self.size: int = size
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+        self.balance: np.ndarray = np.full(size, 250, dtype=np.float64)
+        for field in COUNT_FIELDS:
+            setattr(self, field, np.zeros(size, dtype=np.int64))
+        self.share_amounts: np.ndarray = np.zeros((size, len(SHARE_KEYS)), dtype=np.int64)
+        self.share_values: np.ndarray = np.zeros((size, len(SHARE_KEYS)), dtype=np.int64)
+        self.share_prices: np.ndarray = np.zeros((size, len(SHARE_KEYS)), dtype=np.int64)
+        self.share_yields: np.ndarray = np.zeros((size, len(SHARE_KEYS)), dtype=np.float64)
+
+    @classmethod
+    def from_games(cls, games: List[Game], seed: Optional[int] = None) -> "EmpireArrays":
+        empires = cls(len(games), seed)
+        empires.balance[:] = [game.balance for game in games]
+        for field in COUNT_FIELDS:
+            getattr(empires, field)[:] = [int(getattr(game, field)) for game in games]
+        for row, game in enumerate(games):
+            empires.share_amounts[row] = game.shares.amount
+            empires.share_values[row] = game.shares.value
+            empires.share_prices[row] = game.shares.price
+            empires.share_yields[row] = game.shares.dividend_yield
+        return empires
+
+    def to_game(self, index: int, game: Game) -> Game:
+        balance = float(self.balance[index])
+        game.balance = int(balance) if balance.is_integer() else balance
+        for field in MUTABLE_FIELDS:
+            setattr(game, field, int(getattr(self, field)[index]))
+        game.shares.amount[:] = array("q", self.share_amounts[index].tolist())
+        game.shares.value[:] = array("q", self.share_values[index].tolist())
+        game.shares.price[:] = array("q", self.share_prices[index].tolist())
+        game.shares.dividend_yield[:] = array("d", self.share_yields[index].tolist())
+        return game
+
+    def update_market(self) -> None:
+        shape = self.share_prices.shape
+        self.share_values = self.rng.integers(-500, 501, size=shape)
+        prices = self.share_values + self.rng.integers(-250, 251, size=shape)
+        low = prices < 1
+        if low.any():
+            prices[low] = self.rng.integers(0, np.abs(prices[low]) + 1)
+        self.share_prices = prices
+        self.share_yields = np.round(self.rng.uniform(0, 0.05, size=shape), 3)
+
+    def update_balance(self) -> None:
+        delta = (self.buses * 10 * self.bus_stations +
+                 self.taxis * 5 * self.taxi_stations +
+                 self.trains * 25 * self.train_stations)
+        delta -= self.cf_loans * 20 + self.cs_loans * 35 + self.gl_loans * 50
+        delta -= self.special_loan_amount * 100
+
+        self.add_dividend_interval += 1
+        np.trunc(self.balance, out=self.balance)
+
+        paying = self.add_dividend_interval == 100
+        if not paying.any():
+            self.balance += delta
+            return
+
+        dividend_delta = delta.astype(np.float64)
+        rows = np.flatnonzero(paying)
+        investment = self.share_amounts[rows] * self.share_prices[rows]
+        for column in range(len(SHARE_KEYS)):
+            dividend_delta[rows] += investment[:, column] * self.share_yields[rows, column]
+        self.balance += dividend_delta
+
+    def tick(self, ticks: int = 1) -> None:
+        for _ in range(ticks):
+            self.update_market()
+            self.update_balance()
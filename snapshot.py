@@ -0,0 +1,417 @@
+import base64
+import struct
+import sys
+import zlib
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+from stations import STATION_TYPES as TYPE_NAMES, infer_types
+
+MAGIC: bytes = b"TES"
+VERSION: int = 4
+TYPED_STATIONS: int = 2
+EMPIRE_IDS: int = 3
+INT_BALANCE: int = 4
+KEY_PREFIX: str = "TE1:"
+FLAG_COMPRESSED: int = 1
+FLAG_DELTA: int = 2
+COMPRESS_THRESHOLD: int = 256
+
+SCALAR_FIELDS: List[str] = [
+    "taxis", "buses", "trains",
+    "cf_loans", "cs_loans", "gl_loans",
+    "taxi_stations", "bus_stations", "train_stations",
+    "special_loan_amount", "add_dividend_interval"
+]
+STATION_SUFFIXES: List[str] = [" Taxi Station", " Bus Station", " Train Station", ""]
+RAW_STATION: int = 3
+
+PREAMBLE = struct.Struct("<3sBB")
+HEADER = struct.Struct(f"<Bqdd{len(SCALAR_FIELDS)}q")
+LEGACY_HEADER = struct.Struct(f"<ddB{len(SCALAR_FIELDS)}q")
+CHECKSUM = struct.Struct("<I")
+STATION_TYPES: Dict[str, int] = {"Taxi": 0, "Bus": 1, "Train": 2}
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def _pack_array(typecode: str, values: List[Any]) -> bytes:
+    packed = array(typecode, values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack_array(typecode: str, data: memoryview, offset: int, count: int) -> Tuple[List[Any], int]:
+    unpacked = array(typecode)
+    end = offset + unpacked.itemsize * count
+    unpacked.frombytes(data[offset:end])
+    if sys.byteorder == "big":
+        unpacked.byteswap()
+    return unpacked.tolist(), end
+
+
+def _pack_str(text: str) -> bytes:
+    encoded = text.encode("utf-8")
+    return struct.pack("<I", len(encoded)) + encoded
+
+
+def _unpack_str(data: memoryview, offset: int) -> Tuple[str, int]:
+    (length,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    return bytes(data[offset:offset + length]).decode("utf-8"), offset + length
+
+
+def _split_station(name: str) -> Tuple[str, int, int]:
+    if not name.endswith(" Station"):
+        return name, 0, RAW_STATION
+    base, _, type_word = name[:-8].rpartition(" ")
+    station_type = STATION_TYPES.get(type_word)
+    if station_type is None or not base:
+        return name, 0, RAW_STATION
+    stem, _, digits = base.rpartition(" ")
+    if stem and digits.isdigit() and digits[0] != "0" and len(digits) < 10 and digits.isascii():
+        return stem, int(digits), station_type
+    return base, 0, station_type
+
+
+def station_types(state: Dict[str, Any]) -> List[str]:
+    types = state.get("station_types")
+    if types is None:
+        types = infer_types(state["stations"], {
+            "Taxi": state.get("taxi_stations", 0),
+            "Bus": state.get("bus_stations", 0),
+            "Train": state.get("train_stations", 0)
+        })
+    return types
+
+
+class StationTable:
+    def __init__(self) -> None:
+        self.names: List[str] = []
+        self.type_names: List[str] = []
+        self.stems: Dict[str, int] = {}
+        self.stem_ids: array = array("I")
+        self.numbers: array = array("I")
+        self.suffixes: bytearray = bytearray()
+        self.types: bytearray = bytearray()
+
+    def update(self, stations: List[str], types: List[str]) -> "StationTable":
+        known = len(self.names)
+        if len(stations) < known or stations[:known] != self.names or types[:known] != self.type_names:
+            self.__init__()
+            known = 0
+
+        stems = self.stems
+        for name, type_name in zip(stations[known:], types[known:]):
+            stem, number, suffix = _split_station(name)
+            self.stem_ids.append(stems.setdefault(stem, len(stems)))
+            self.numbers.append(number)
+            self.suffixes.append(suffix)
+            self.types.append(STATION_TYPES[type_name])
+        self.names = list(stations)
+        self.type_names = list(types)
+        return self
+
+    def pack(self) -> bytes:
+        parts = [struct.pack("<II", len(self.names), len(self.stems))]
+        parts.extend(_pack_str(stem) for stem in self.stems)
+        for packed in (self.stem_ids, self.numbers):
+            if sys.byteorder == "big":
+                packed = array("I", packed)
+                packed.byteswap()
+            parts.append(packed.tobytes())
+        parts.append(bytes(self.suffixes))
+        parts.append(bytes(self.types))
+        return b"".join(parts)
+
+
+def _pack_stations(stations: List[str], types: List[str], table: Optional[StationTable] = None) -> bytes:
+    return (table or StationTable()).update(stations, types).pack()
+
+
+def _unpack_stations(data: memoryview, offset: int,
+                     version: int) -> Tuple[List[str], Optional[List[str]], int]:
+    count, stem_count = struct.unpack_from("<II", data, offset)
+    offset += 8
+    stems: List[str] = []
+    for _ in range(stem_count):
+        stem, offset = _unpack_str(data, offset)
+        stems.append(stem)
+    stem_ids, offset = _unpack_array("I", data, offset, count)
+    numbers, offset = _unpack_array("I", data, offset, count)
+    suffixes = bytes(data[offset:offset + count])
+    offset += count
+    types: Optional[List[str]] = None
+    if version >= TYPED_STATIONS:
+        types = [TYPE_NAMES[code] for code in data[offset:offset + count]]
+        offset += count
+
+    stations = [
+        f"{stems[stem_id]} {number}{STATION_SUFFIXES[suffix]}" if number
+        else stems[stem_id] + STATION_SUFFIXES[suffix]
+        for stem_id, number, suffix in zip(stem_ids, numbers, suffixes)
+    ]
+    return stations, types, offset
+
+
+def _pack_shares(shares: Dict[str, Dict[str, Any]], keys: Optional[List[str]] = None) -> bytes:
+    keys = list(shares) if keys is None else keys
+    parts = [struct.pack("<I", len(keys))]
+    for key in keys:
+        parts.append(_pack_str(key))
+        parts.append(_pack_str(shares[key]["name"]))
+    parts.append(_pack_array("q", [shares[key]["amount"] for key in keys]))
+    parts.append(_pack_array("q", [shares[key]["price"] for key in keys]))
+    parts.append(_pack_array("q", [shares[key]["value"] for key in keys]))
+    parts.append(_pack_array("d", [shares[key]["dividend_yield"] for key in keys]))
+    return b"".join(parts)
+
+
+def _unpack_shares(data: memoryview, offset: int) -> Tuple[Dict[str, Dict[str, Any]], int]:
+    (count,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    keys: List[str] = []
+    names: List[str] = []
+    for _ in range(count):
+        key, offset = _unpack_str(data, offset)
+        name, offset = _unpack_str(data, offset)
+        keys.append(key)
+        names.append(name)
+    amounts, offset = _unpack_array("q", data, offset, count)
+    prices, offset = _unpack_array("q", data, offset, count)
+    values, offset = _unpack_array("q", data, offset, count)
+    yields, offset = _unpack_array("d", data, offset, count)
+
+    shares = {
+        key: {"name": name, "price": price, "value": value, "dividend_yield": dividend_yield, "amount": amount}
+        for key, name, amount, price, value, dividend_yield in zip(keys, names, amounts, prices, values, yields)
+    }
+    return shares, offset
+
+
+def _pack_flags(flags: List[bool]) -> bytes:
+    return struct.pack("<I", len(flags)) + bytes(int(flag) for flag in flags)
+
+
+def _unpack_flags(data: memoryview, offset: int) -> Tuple[List[bool], int]:
+    (count,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    return [bool(flag) for flag in data[offset:offset + count]], offset + count
+
+
+def _pack_header(state: Dict[str, Any]) -> bytes:
+    balance = state["balance"]
+    is_float = isinstance(balance, float)
+    try:
+        return HEADER.pack(is_float, 0 if is_float else balance, balance if is_float else 0.0,
+                           float(state.get("saved_at", 0.0)),
+                           *(int(state.get(field, 0)) for field in SCALAR_FIELDS))
+    except (struct.error, OverflowError) as e:
+        raise SnapshotError(f"Game is too large for a binary snapshot: {e}") from e
+
+
+def _unpack_header(data: memoryview, offset: int, state: Dict[str, Any], version: int) -> int:
+    if version < INT_BALANCE:
+        balance, saved_at, is_float, *scalars = LEGACY_HEADER.unpack_from(data, offset)
+        state["balance"] = balance if is_float else int(balance)
+        offset += LEGACY_HEADER.size
+    else:
+        is_float, int_balance, float_balance, saved_at, *scalars = HEADER.unpack_from(data, offset)
+        state["balance"] = float_balance if is_float else int_balance
+        offset += HEADER.size
+    state["saved_at"] = saved_at
+    state.update(zip(SCALAR_FIELDS, scalars))
+    return offset
+
+
+def _frame(payload: bytes, flags: int, compress: bool) -> bytes:
+    body = payload + CHECKSUM.pack(zlib.crc32(payload))
+    if compress and len(body) >= COMPRESS_THRESHOLD:
+        body = zlib.compress(body, 1)
+        flags |= FLAG_COMPRESSED
+    return PREAMBLE.pack(MAGIC, VERSION, flags) + body
+
+
+def _unframe(data: bytes) -> Tuple[int, memoryview, int, int]:
+    if len(data) < PREAMBLE.size + CHECKSUM.size:
+        raise SnapshotError("Snapshot is truncated.")
+    magic, version, flags = PREAMBLE.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError("Not a TextEmpire snapshot.")
+    if not 1 <= version <= VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {version}.")
+
+    body = data[PREAMBLE.size:]
+    if flags & FLAG_COMPRESSED:
+        try:
+            body = zlib.decompress(body)
+        except zlib.error as e:
+            raise SnapshotError(f"Corrupt snapshot: {e}") from e
+    payload = body[:-CHECKSUM.size]
+    (checksum,) = CHECKSUM.unpack_from(body, len(body) - CHECKSUM.size)
+    if zlib.crc32(payload) != checksum:
+        raise SnapshotError("Snapshot checksum mismatch.")
+    return flags, memoryview(payload), checksum, version
+
+
+def is_delta(data: bytes) -> bool:
+    return len(data) >= PREAMBLE.size and bool(PREAMBLE.unpack_from(data)[2] & FLAG_DELTA)
+
+
+def snapshot_checksum(data: bytes) -> int:
+    return _unframe(data)[2]
+
+
+def _unpack_empire_id(data: memoryview, offset: int, version: int, state: Dict[str, Any]) -> int:
+    if version < EMPIRE_IDS:
+        return offset
+    empire_id, offset = _unpack_str(data, offset)
+    if empire_id:
+        state["empire_id"] = empire_id
+    else:
+        state.pop("empire_id", None)
+    return offset
+
+
+def encode_snapshot(state: Dict[str, Any], compress: bool = True,
+                    table: Optional[StationTable] = None) -> bytes:
+    payload = b"".join([
+        _pack_header(state),
+        _pack_str(state["empire_info"]["name"]),
+        _pack_str(state["empire_info"]["monarch"]),
+        _pack_str(state.get("empire_id", "")),
+        _pack_flags(state["redeemable"]),
+        _pack_stations(state["stations"], station_types(state), table),
+        _pack_shares(state["shares"])
+    ])
+    return _frame(payload, 0, compress)
+
+
+def decode_snapshot(data: bytes) -> Dict[str, Any]:
+    flags, payload, _, version = _unframe(data)
+    if flags & FLAG_DELTA:
+        raise SnapshotError("Delta snapshots need a base snapshot.")
+
+    state: Dict[str, Any] = {}
+    try:
+        offset = _unpack_header(payload, 0, state, version)
+        name, offset = _unpack_str(payload, offset)
+        monarch, offset = _unpack_str(payload, offset)
+        state["empire_info"] = {"name": name, "monarch": monarch}
+        offset = _unpack_empire_id(payload, offset, version, state)
+        state["redeemable"], offset = _unpack_flags(payload, offset)
+        state["stations"], types, offset = _unpack_stations(payload, offset, version)
+        if types is not None:
+            state["station_types"] = types
+        state["shares"], offset = _unpack_shares(payload, offset)
+    except (struct.error, UnicodeDecodeError, IndexError) as e:
+        raise SnapshotError(f"Corrupt snapshot: {e}") from e
+    return state
+
+
+DELTA_HEADER: int = 1
+DELTA_EMPIRE: int = 2
+DELTA_REDEEMABLE: int = 4
+DELTA_STATIONS_APPEND: int = 8
+DELTA_STATIONS_FULL: int = 16
+DELTA_SHARES: int = 32
+DELTA = struct.Struct("<IB")
+
+
+def encode_delta(base: Dict[str, Any], state: Dict[str, Any], base_id: int, compress: bool = True) -> bytes:
+    fields = 0
+    parts: List[bytes] = []
+
+    if (state["balance"] != base["balance"] or state.get("saved_at") != base.get("saved_at") or
+            any(state.get(field, 0) != base.get(field, 0) for field in SCALAR_FIELDS)):
+        fields |= DELTA_HEADER
+        parts.append(_pack_header(state))
+    if state["empire_info"] != base["empire_info"] or state.get("empire_id") != base.get("empire_id"):
+        fields |= DELTA_EMPIRE
+        parts.append(_pack_str(state["empire_info"]["name"]))
+        parts.append(_pack_str(state["empire_info"]["monarch"]))
+        parts.append(_pack_str(state.get("empire_id", "")))
+    if state["redeemable"] != base["redeemable"]:
+        fields |= DELTA_REDEEMABLE
+        parts.append(_pack_flags(state["redeemable"]))
+
+    old_stations, new_stations = base["stations"], state["stations"]
+    old_types, new_types = station_types(base), station_types(state)
+    known = len(old_stations)
+    if (len(new_stations) >= known and new_stations[:known] == old_stations and
+            new_types[:known] == old_types):
+        if len(new_stations) > known:
+            fields |= DELTA_STATIONS_APPEND
+            parts.append(_pack_stations(new_stations[known:], new_types[known:]))
+    else:
+        fields |= DELTA_STATIONS_FULL
+        parts.append(_pack_stations(new_stations, new_types))
+
+    old_shares, new_shares = base["shares"], state["shares"]
+    if list(old_shares) == list(new_shares):
+        changed = [key for key in new_shares if new_shares[key] != old_shares[key]]
+    else:
+        changed = list(new_shares)
+    if changed:
+        fields |= DELTA_SHARES
+        parts.append(_pack_shares(new_shares, changed))
+
+    return _frame(DELTA.pack(base_id, fields) + b"".join(parts), FLAG_DELTA, compress)
+
+
+def apply_delta(base: Dict[str, Any], data: bytes, base_id: int) -> Dict[str, Any]:
+    flags, payload, _, version = _unframe(data)
+    if not flags & FLAG_DELTA:
+        raise SnapshotError("Not a delta snapshot.")
+    expected_id, fields = DELTA.unpack_from(payload)
+    if expected_id != base_id:
+        raise SnapshotError("Delta snapshot does not match the last saved game.")
+
+    state = dict(base)
+    offset = DELTA.size
+    try:
+        if fields & DELTA_HEADER:
+            offset = _unpack_header(payload, offset, state, version)
+        if fields & DELTA_EMPIRE:
+            name, offset = _unpack_str(payload, offset)
+            monarch, offset = _unpack_str(payload, offset)
+            state["empire_info"] = {"name": name, "monarch": monarch}
+            offset = _unpack_empire_id(payload, offset, version, state)
+        if fields & DELTA_REDEEMABLE:
+            state["redeemable"], offset = _unpack_flags(payload, offset)
+        if fields & (DELTA_STATIONS_APPEND | DELTA_STATIONS_FULL):
+            stations, types, offset = _unpack_stations(payload, offset, version)
+            if fields & DELTA_STATIONS_APPEND:
+                state["stations"] = base["stations"] + stations
+                types = None if types is None else station_types(base) + types
+            else:
+                state["stations"] = stations
+            if types is None:
+                state.pop("station_types", None)
+            else:
+                state["station_types"] = types
+        if fields & DELTA_SHARES:
+            changed, offset = _unpack_shares(payload, offset)
+            shares = {key: dict(info) for key, info in base["shares"].items()}
+            shares.update(changed)
+            state["shares"] = shares
+    except (struct.error, UnicodeDecodeError, IndexError) as e:
+        raise SnapshotError(f"Corrupt snapshot: {e}") from e
+    return state
+
+
+def to_key(data: bytes) -> str:
+    return KEY_PREFIX + base64.b64encode(data).decode("ascii")
+
+
+def from_key(key: str) -> bytes:
+    try:
+        return base64.b64decode(key[len(KEY_PREFIX):], validate=True)
+    except ValueError as e:
+        raise SnapshotError(f"Corrupt snapshot key: {e}") from e
+
+
+def is_snapshot_key(key: str) -> bool:
+    return key.startswith(KEY_PREFIX)
@@ -0,0 +1,146 @@
+import itertools
+from typing import Dict, Iterator, List, Optional
+
+STATION_TYPES: List[str] = ["Taxi", "Bus", "Train"]
+_versions: Iterator[int] = itertools.count(1)
+
+
+class Station:
+    __slots__ = ("station_id", "station_type", "name")
+
+    def __init__(self, station_id: int, station_type: str, name: str) -> None:
+        self.station_id: int = station_id
+        self.station_type: str = station_type
+        self.name: str = name
+
+    def __repr__(self) -> str:
+        return f"Station({self.station_id}, {self.station_type!r}, {self.name!r})"
+
+
+def station_name(place: str, station_type: str) -> str:
+    return f"{place} {station_type} Station"
+
+
+def _station_type(name: str) -> Optional[str]:
+    if not name.endswith(" Station"):
+        return None
+    station_type = name[:-8].rpartition(" ")[2]
+    return station_type if station_type in STATION_TYPES else None
+
+
+def infer_types(names: List[str], counts: Optional[Dict[str, int]] = None) -> List[str]:
+    inferred = [_station_type(name) for name in names]
+    remaining = dict(counts or {})
+    for station_type in inferred:
+        if station_type is not None and remaining.get(station_type, 0) > 0:
+            remaining[station_type] -= 1
+
+    types: List[str] = []
+    for station_type in inferred:
+        if station_type is None:
+            station_type = next((candidate for candidate in STATION_TYPES
+                                 if remaining.get(candidate, 0) > 0), STATION_TYPES[0])
+            remaining[station_type] = remaining.get(station_type, 0) - 1
+        types.append(station_type)
+    return types
+
+
+class StationRegistry:
+    def __init__(self) -> None:
+        self.records: List[Station] = []
+        self.by_name: Dict[str, int] = {}
+        self.suffix_counters: Dict[str, int] = {}
+        self.counts: Dict[str, int] = {station_type: 0 for station_type in STATION_TYPES}
+        self.version: int = next(_versions)
+
+    @classmethod
+    def from_records(cls, names: List[str], types: List[str]) -> "StationRegistry":
+        registry = cls()
+        records, by_name, totals = registry.records, registry.by_name, registry.counts
+        for station_id, (name, station_type) in enumerate(zip(names, types)):
+            if name in by_name:
+                duplicate = 2
+                while f"{name} ({duplicate})" in by_name:
+                    duplicate += 1
+                name = f"{name} ({duplicate})"
+            records.append(Station(station_id, station_type, name))
+            by_name[name] = station_id
+            totals[station_type] += 1
+        registry.version = next(_versions)
+        return registry
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[str]:
+        return (record.name for record in self.records)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.by_name
+
+    def get(self, name: str) -> Optional[Station]:
+        station_id = self.by_name.get(name)
+        return None if station_id is None else self.records[station_id]
+
+    def count(self, station_type: str) -> int:
+        return self.counts[station_type]
+
+    def names(self) -> List[str]:
+        return [record.name for record in self.records]
+
+    def types(self) -> List[str]:
+        return [record.station_type for record in self.records]
+
+    def unique_place(self, place: str, station_type: str) -> str:
+        suffix = self.suffix_counters.get(place, 0)
+        candidate = place if not suffix else f"{place} {suffix}"
+        while station_name(candidate, station_type) in self.by_name:
+            suffix += 1
+            candidate = f"{place} {suffix}"
+        self.suffix_counters[place] = suffix + 1
+        return candidate
+
+    def add(self, station_type: str, name: str) -> Station:
+        if name in self.by_name:
+            raise ValueError(f"Station '{name}' already exists.")
+        station = Station(len(self.records), station_type, name)
+        self.records.append(station)
+        self.by_name[name] = station.station_id
+        self.counts[station_type] += 1
+        self.version = next(_versions)
+        return station
+
+    def create(self, station_type: str, place: str) -> Station:
+        return self.add(station_type, station_name(self.unique_place(place, station_type), station_type))
+
+    def create_many(self, station_type: str, places: List[str]) -> List[Station]:
+        records, by_name, counters = self.records, self.by_name, self.suffix_counters
+        suffix_text = f" {station_type} Station"
+        created: List[Station] = []
+        for place in places:
+            suffix = counters.get(place, 0)
+            name = place + suffix_text if not suffix else f"{place} {suffix}{suffix_text}"
+            while name in by_name:
+                suffix += 1
+                name = f"{place} {suffix}{suffix_text}"
+            counters[place] = suffix + 1
+            station = Station(len(records), station_type, name)
+            records.append(station)
+            by_name[name] = station.station_id
+            created.append(station)
+        self.counts[station_type] += len(created)
+        self.version = next(_versions)
+        return created
+
+    def rename(self, old_name: str, new_name: str) -> Station:
+        station_id = self.by_name.get(old_name)
+        if station_id is None:
+            raise KeyError(old_name)
+        if new_name in self.by_name and new_name != old_name:
+            raise ValueError(f"Station '{new_name}' already exists.")
+        station = self.records[station_id]
+        del self.by_name[old_name]
+        self.by_name[new_name] = station_id
+        station.name = new_name
+        self.version = next(_versions)
+        return station
@@ -0,0 +1,17 @@
+import os
+import sys
+from typing import Callable, Optional
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import Game
+from leaderboard import Leaderboard
+from persistence import GameInfoStore
+
+
+@pytest.fixture
+def make_game() -> Callable[..., Game]:
+    def make(seed: Optional[int] = 1, **kwargs: object) -> Game:
+        return Game(seed=seed, info_store=GameInfoStore(None), leaderboard=Leaderboard(None), **kwargs)
+    return make
@@ -0,0 +1,27 @@
+from accrual import catch_up
+
+TICKS: int = 250
+
+
+def setup(game):
+    game.taxis, game.buses = 7, 2
+    game.add_dividend_interval = 40
+    game.stations.create_many("Taxi", [game.tools.generate_place() for _ in range(5)])
+    game.stations.create_many("Bus", [game.tools.generate_place() for _ in range(2)])
+    for column in range(len(game.shares.amount)):
+        game.shares.amount[column] = 10 + column
+    return game
+
+
+def test_lazy_catch_up_matches_eager_ticks(make_game):
+    eager, lazy = setup(make_game(seed=4)), setup(make_game(seed=4))
+    for _ in range(TICKS):
+        eager.tick()
+    catch_up(lazy, TICKS)
+
+    assert lazy.balance == eager.balance
+    assert lazy.add_dividend_interval == eager.add_dividend_interval
+    assert list(lazy.shares.price) == list(eager.shares.price)
+    assert list(lazy.shares.value) == list(eager.shares.value)
+    assert list(lazy.shares.dividend_yield) == list(eager.shares.dividend_yield)
+    assert lazy.price_history.ticks == eager.price_history.ticks
@@ -0,0 +1,51 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from simulator import EmpireArrays
+
+EMPIRES: int = 12
+TICKS: int = 250
+
+
+def build_games(make_game):
+    games = []
+    for index in range(EMPIRES):
+        game = make_game(seed=index)
+        game.taxis, game.buses, game.trains = index * 3, index % 4, index % 3
+        game.cf_loans, game.cs_loans, game.gl_loans = index % 2, index % 3 // 2, index % 5 // 4
+        game.special_loan_amount = index % 4 // 3
+        game.add_dividend_interval = index * 7 % 100
+        for station_type, count in (("Taxi", index), ("Bus", index % 3), ("Train", index % 2)):
+            game.stations.create_many(station_type, [game.tools.generate_place() for _ in range(count)])
+        for column in range(len(game.shares.amount)):
+            game.shares.amount[column] = (index * 37 + column * 11) % 200
+        games.append(game)
+    return games
+
+
+def test_vectorized_balance_update_matches_game(make_game):
+    games = build_games(make_game)
+    empires = EmpireArrays.from_games(games)
+    for tick in range(TICKS):
+        for row, game in enumerate(games):
+            game.update_market()
+            empires.share_values[row] = game.shares.value
+            empires.share_prices[row] = game.shares.price
+            empires.share_yields[row] = game.shares.dividend_yield
+            game.update_balance()
+        empires.update_balance()
+        for row, game in enumerate(games):
+            assert empires.balance[row] == game.balance, f"empire {row} drifted at tick {tick}"
+            assert empires.add_dividend_interval[row] == game.add_dividend_interval
+
+
+def test_round_trip_through_arrays_keeps_the_game_state(make_game):
+    games = build_games(make_game)
+    empires = EmpireArrays.from_games(games)
+    for row, game in enumerate(games):
+        copy = empires.to_game(row, make_game(seed=row))
+        assert copy.balance == game.balance
+        assert list(copy.shares.amount) == list(game.shares.amount)
+        for field in ("taxis", "buses", "trains", "cf_loans", "gl_loans", "add_dividend_interval"):
+            assert getattr(copy, field) == getattr(game, field)
@@ -0,0 +1,125 @@
+import threading
+from typing import List
+import pytest
+from catalogs import SHARE_KEYS
+from exchange import Exchange, LockOrderError
+
+THREADS: int = 4
+UPDATES: int = 20_000
+
+
+def run(targets: List, timeout: float = 30.0) -> None:
+    threads = [threading.Thread(target=target) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout)
+    assert not any(thread.is_alive() for thread in threads), "threads deadlocked"
+
+
+def test_concurrent_transactions_lose_no_updates(make_game):
+    game = make_game()
+    start = game.balance
+
+    def deposit() -> None:
+        for _ in range(UPDATES):
+            with game.transaction():
+                balance = game.balance
+                game.balance = balance + 1
+
+    run([deposit] * THREADS + [lambda: [game.tick() for _ in range(UPDATES)]])
+    assert game.balance == start + THREADS * UPDATES
+
+
+def test_nested_transactions_bump_the_version_once(make_game):
+    game = make_game()
+    version = game.version
+    with game.transaction():
+        with game.transaction():
+            assert game.version == version + 1
+        assert game.version & 1
+    assert game.version == version + 2
+
+
+def test_snapshot_inside_own_transaction_sees_pending_changes(make_game):
+    game = make_game()
+    with game.transaction():
+        game.balance += 5
+        assert game.snapshot().balance == 255
+        assert "Empire Treasury: 255" in game.empire_info_text()
+        game.balance += 7
+        assert "Empire Treasury: 262" in game.empire_info_text()
+    assert game.snapshot().balance == 262
+
+
+def test_snapshots_are_consistent_under_contention(make_game):
+    game = make_game()
+    game.shares["a"]["amount"] = 1_000
+    stop = threading.Event()
+    torn: List[object] = []
+
+    def writer() -> None:
+        for index in range(UPDATES):
+            source, target = ("a", "b") if index % 2 else ("b", "a")
+            with game.transaction():
+                moved = game.shares[source]["amount"]
+                game.shares[source]["amount"] = 0
+                game.balance += 1
+                game.shares[target]["amount"] += moved
+                game.taxis += 1
+        stop.set()
+
+    def reader() -> None:
+        while not stop.is_set():
+            snapshot = game.snapshot()
+            if sum(snapshot.share_amounts[:2]) != 1_000 or snapshot.balance - 250 != snapshot.taxis:
+                torn.append(snapshot)
+
+    run([writer, reader, reader])
+    assert not torn
+
+
+def test_exchange_calls_inside_a_game_transaction_are_rejected(make_game):
+    game = make_game()
+    game.exchange = Exchange(SHARE_KEYS)
+    with pytest.raises(LockOrderError):
+        with game.transaction():
+            game.engine.submit_order("buy", "a", 1, 10)
+    with pytest.raises(LockOrderError):
+        with game.transaction():
+            game.engine.open_orders()
+    assert game.balance == 250
+    assert game.engine.submit_order("buy", "a", 1, 10).status == "queued"
+    assert game.balance == 240
+
+
+def test_orders_and_matching_do_not_deadlock(make_game):
+    exchange = Exchange(SHARE_KEYS)
+    buyer, seller = make_game(1), make_game(2)
+    for game in (buyer, seller):
+        game.exchange = exchange
+    buyer.balance = 10 ** 9
+    seller.shares["a"]["amount"] = 10 ** 6
+    stop = threading.Event()
+
+    def buy() -> None:
+        for _ in range(UPDATES):
+            buyer.engine.submit_order("buy", "a", 1, 10)
+            with buyer.transaction():
+                buyer.tick()
+
+    def sell() -> None:
+        for _ in range(UPDATES):
+            seller.engine.submit_order("sell", "a", 1, 10)
+            with seller.transaction():
+                seller.tick()
+        stop.set()
+
+    def match() -> None:
+        while not stop.is_set():
+            exchange.match()
+        exchange.match()
+
+    run([buy, sell, match])
+    assert seller.shares["a"]["amount"] + buyer.shares["a"]["amount"] + sum(
+        order.remaining for order in exchange.orders.values() if order.side == "sell") == 10 ** 6
@@ -1,42 +1,23 @@
 import random
-from typing import List
+from typing import List, Optional
+from catalogs import EMPIRE_PREFIXES, EMPIRE_SUFFIXES, FIRST_NAMES, LAST_NAMES, PLACE_ADJECTIVES, PLACE_NOUNS
 
 class Tools:
-    def __init__(self) -> None:
-        self.first_names: List[str] = [
-            "Emma", "Olivia", "Ava", "Isabella", "Sophia",
-            "Liam", "Noah", "William", "James", "Logan"
-        ]
-        self.last_names: List[str] = [
-            "Smith", "Johnson", "Williams", "Brown", "Jones",
-            "Garcia", "Miller", "Davis", "Rodriguez", "Martinez"
-        ]
-        self.place_adjectives: List[str] = [
-            'Mystic', 'Forgotten', 'Enchanted', 'Lost', 'Ancient',
-            'Whispering', 'Ethereal', 'Silent', 'Celestial', 'Hidden',
-            'Glowing', 'Secret', 'Twilight', 'Emerald', 'Frozen',
-            'Divine', 'Moonlit', 'Golden', 'Sapphire', 'Starlit'
-        ]
-        self.place_nouns: List[str] = [
-            'Valley', 'Forest', 'Island', 'Mountains', 'Canyon',
-            'Labyrinth', 'Cave', 'Grove', 'Lake', 'Ruins',
-            'Waterfall', 'Citadel', 'Garden', 'Desert', 'Oasis',
-            'Temple', 'Castle', 'Peak', 'Spires', 'Meadow'
-        ]
-        self.empire_prefixes: List[str] = [
-            "Galactic", "Celestial", "Stellar", "Cosmic",
-            "Universal", "Interstellar"
-        ]
-        self.empire_suffixes: List[str] = [
-            "Empire", "Dominion", "Federation", "Union",
-            "Consortium", "Alliance"
-        ]
+    __slots__ = ("rng",)
+
+    def __init__(self, rng: Optional[random.Random] = None) -> None:
+        self.rng: random.Random = rng if rng is not None else random.Random()
 
     def generate_name(self) -> str:
-        return f"{random.choice(self.first_names)} {random.choice(self.last_names)}"
+        return f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
 
     def generate_place(self) -> str:
-        return f"{random.choice(self.place_adjectives)} {random.choice(self.place_nouns)}"
+        return f"{self.rng.choice(PLACE_ADJECTIVES)} {self.rng.choice(PLACE_NOUNS)}"
+
+    def generate_places(self, count: int) -> List[str]:
+        adjectives = self.rng.choices(PLACE_ADJECTIVES, k=count)
+        nouns = self.rng.choices(PLACE_NOUNS, k=count)
+        return [f"{adjective} {noun}" for adjective, noun in zip(adjectives, nouns)]
 
     def generate_empire(self) -> str:
-        return f"{random.choice(self.empire_prefixes)} {random.choice(self.empire_suffixes)}"
\ No newline at end of file
+        return f"{self.rng.choice(EMPIRE_PREFIXES)} {self.rng.choice(EMPIRE_SUFFIXES)}"
\ No newline at end of file